@@ -0,0 +1,80 @@
+"""设备信息JSON序列化吞吐量对比
+
+对比原有的 to_dict() + json.dump(indent=2) 整体序列化与基于预编码模板的写入器，
+并校验各方式的输出逐字节一致。
+
+用法: python -m benchmarks.bench_json_output [-n 200000]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from src.generator.sharded_generator import generate_device_range
+from src.output.stream_writers import open_device_writer
+
+
+def _timed(label: str, count: int, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {count / elapsed:>12,.0f} 条/秒  ({elapsed:.2f} 秒)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="设备信息JSON序列化吞吐量基准测试")
+    parser.add_argument("-n", "--count", type=int, default=200_000, help="序列化的设备数量")
+    args = parser.parse_args()
+
+    batch = generate_device_range(0, 0, args.count)
+    device_info_list = batch.to_device_info_list()
+
+    with tempfile.TemporaryDirectory() as directory:
+        def path(name: str) -> str:
+            return os.path.join(directory, name)
+
+        def json_dump():
+            with open(path("baseline.json"), "w", encoding="utf-8") as f:
+                json.dump([device_info.to_dict() for device_info in device_info_list], f, indent=2, ensure_ascii=False)
+
+        def json_lines_dumps():
+            with open(path("baseline.jsonl"), "w", encoding="utf-8") as f:
+                for device_info in device_info_list:
+                    f.write(json.dumps(device_info.to_dict(), ensure_ascii=False) + "\n")
+
+        def write_objects(output_format: str):
+            with open_device_writer(path(f"objects.{output_format}"), output_format) as writer:
+                for device_info in device_info_list:
+                    writer.write(device_info)
+
+        def write_batch(output_format: str):
+            with open_device_writer(path(f"batch.{output_format}"), output_format) as writer:
+                writer.write_batch(batch)
+
+        baseline = _timed("json.dump(indent=2) 整体序列化", args.count, json_dump)
+        _timed("模板写入器 json（DeviceInfo）", args.count, lambda: write_objects("json"))
+        elapsed = _timed("模板写入器 json（列式批次）", args.count, lambda: write_batch("json"))
+        print(f"{'':<36} 相对 json.dump 加速 {baseline / elapsed:.1f}x")
+        print()
+        baseline = _timed("json.dumps 逐行 JSON Lines", args.count, json_lines_dumps)
+        _timed("模板写入器 jsonl（DeviceInfo）", args.count, lambda: write_objects("jsonl"))
+        elapsed = _timed("模板写入器 jsonl（列式批次）", args.count, lambda: write_batch("jsonl"))
+        print(f"{'':<36} 相对 json.dumps 加速 {baseline / elapsed:.1f}x")
+        _timed("模板写入器 json-compact（列式批次）", args.count, lambda: write_batch("json-compact"))
+
+        def read(name: str) -> bytes:
+            with open(path(name), "rb") as f:
+                return f.read()
+
+        identical = (
+            read("baseline.json") == read("objects.json") == read("batch.json")
+            and read("baseline.jsonl") == read("objects.jsonl") == read("batch.jsonl")
+        )
+        print(f"\n输出逐字节一致: {'是' if identical else '否'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""命令行冷启动耗时基准测试
+
+用法: python -m benchmarks.bench_startup [--runs 10] [--save-baseline FILE] [--baseline FILE]
+
+每次都启动新的解释器进程，测量 `import src.main`、`python -m src.main --help` 和
+`python -m src.main -n 1` 的耗时，并与以下基准比较：
+
+- 延迟导入之前的导入集合：在导入 src.main 之前先导入 EAGER_IMPORTS 中的包，
+  即这些包仍在启动时导入时的耗时；
+- 记录的基准（--baseline）：之前用 --save-baseline 保存的各项中位数。
+
+最后检查 `import src.main` 之后 EAGER_IMPORTS 中的包是否仍未加载，并列出导入耗时最长的顶层包。
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 命令行改为延迟导入的包（改动前在导入 src.main 时就会加载）
+EAGER_IMPORTS = ("numpy", "paramiko")
+
+
+def time_command(command, runs):
+    """多次运行命令，返回每次的耗时（秒）"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=PROJECT_ROOT, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def slowest_packages(module, top):
+    """通过 -X importtime 按顶层包汇总自身导入耗时（微秒），返回耗时最长的若干个"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PROJECT_ROOT, check=True, capture_output=True, text=True)
+    totals = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(self_us)
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def loaded_after_import(module, packages):
+    """返回导入 module 之后已加载的包"""
+    code = f"import sys, {module}; print(' '.join(p for p in {list(packages)!r} if p in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True,
+                            capture_output=True, text=True)
+    return result.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="命令行冷启动耗时基准测试")
+    parser.add_argument("--runs", type=int, default=10, help="每项测量的运行次数")
+    parser.add_argument("--top", type=int, default=10, help="列出导入耗时最长的顶层包数量")
+    parser.add_argument("--baseline", type=str, help="与之比较的基准文件（--save-baseline 的输出）")
+    parser.add_argument("--save-baseline", type=str, help="将各项中位数保存为基准文件")
+    args = parser.parse_args()
+
+    eager = [package for package in EAGER_IMPORTS if importlib.util.find_spec(package)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cli = [sys.executable, "-m", "src.main", "-n", "1",
+               "-o", os.path.join(temp_dir, "device_info.json"),
+               "--commands-file", os.path.join(temp_dir, "dg_commands.txt")]
+        measurements = {
+            "解释器启动": time_command([sys.executable, "-c", "pass"], args.runs),
+            "import src.main": time_command([sys.executable, "-c", "import src.main"], args.runs),
+            "延迟导入之前的导入集合": time_command(
+                [sys.executable, "-c", f"import {', '.join(eager + ['src.main'])}"], args.runs),
+            "python -m src.main --help": time_command([sys.executable, "-m", "src.main", "--help"], args.runs),
+            "python -m src.main -n 1": time_command(cli, args.runs),
+        }
+    medians = {name: statistics.median(timings) for name, timings in measurements.items()}
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    for name, timings in measurements.items():
+        line = f"{name:<26} 中位数 {medians[name] * 1000:>7.1f} ms  最快 {min(timings) * 1000:>7.1f} ms"
+        if name in baseline:
+            delta = medians[name] - baseline[name]
+            line += f"  基准 {baseline[name] * 1000:>7.1f} ms（{delta * 1000:+.1f} ms，{delta / baseline[name]:+.0%}）"
+        print(line)
+
+    saved = medians["延迟导入之前的导入集合"] - medians["import src.main"]
+    print(f"\n与延迟导入之前（启动时导入 {', '.join(eager)}）相比，import src.main 少用 {saved * 1000:.1f} ms")
+    still_loaded = loaded_after_import("src.main", eager)
+    if still_loaded:
+        print(f"警告: import src.main 之后仍加载了 {', '.join(still_loaded)}")
+
+    print(f"\n导入 src.main 时耗时最长的 {args.top} 个顶层包:")
+    for package, self_us in slowest_packages("src.main", args.top):
+        print(f"  {self_us / 1000:>7.1f} ms  {package}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(medians, f, indent=2, ensure_ascii=False)
+        print(f"\n基准已保存到 {args.save_baseline}")
+
+
+if __name__ == "__main__":
+    main()
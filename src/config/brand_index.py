@@ -0,0 +1,83 @@
+"""型号 -> 品牌索引
+
+由 DEVICE_MODELS、MODEL_SERIES_BRANDS 和 MODEL_CODE_PREFIXES 预先构建，
+DG命令生成和界面注释共用同一份查询，配置变更（mark_config_changed）后自动重建。
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional
+
+from src.config.config_version import get_config_version
+from src.config.device_models import DEVICE_MODELS, MODEL_CODE_PREFIXES, MODEL_SERIES_BRANDS
+
+
+# 无法识别品牌时使用的制造商名称
+UNKNOWN_MANUFACTURER = "Unknown"
+
+
+class BrandIndex:
+    """
+    型号 -> 品牌的查询索引
+
+    依次查找：
+    1. 完整型号（"品牌 型号名称"，与生成的设备型号相同），O(1)
+    2. 型号中的每个词：品牌名或系列名（不区分大小写），再按前缀长度查找型号代码前缀
+    """
+
+    def __init__(self, device_models: Dict[str, dict], series_brands: Dict[str, str], code_prefixes: Dict[str, str]):
+        self.models: Dict[str, str] = {
+            f"{brand} {model_name}": brand for brand, models in device_models.items() for model_name in models
+        }
+        self.words: Dict[str, str] = {brand.lower(): brand for brand in device_models}
+        for series, brand in series_brands.items():
+            self.words.setdefault(series.lower(), brand)
+        self.prefixes = dict(code_prefixes)
+        # 较长的前缀优先，避免被较短的前缀遮蔽
+        self.prefix_lengths = sorted({len(prefix) for prefix in code_prefixes}, reverse=True)
+
+    def brand_of(self, model: str) -> Optional[str]:
+        """
+        推断型号所属的品牌
+
+        Args:
+            model: 设备型号，如 "Samsung Galaxy S25"、"iPhone 13"、"SM-S9180"
+
+        Returns:
+            Optional[str]: DEVICE_MODELS 中的品牌名，无法识别时为None
+        """
+        brand = self.models.get(model)
+        if brand is not None:
+            return brand
+        for word in model.split():
+            brand = self.words.get(word.lower())
+            if brand is not None:
+                return brand
+            for length in self.prefix_lengths:
+                brand = self.prefixes.get(word[:length])
+                if brand is not None:
+                    return brand
+        return None
+
+
+@lru_cache(maxsize=1)
+def _build_brand_index(config_version: int) -> BrandIndex:
+    return BrandIndex(DEVICE_MODELS, MODEL_SERIES_BRANDS, MODEL_CODE_PREFIXES)
+
+
+def get_brand_index() -> BrandIndex:
+    """获取当前配置下的品牌索引（配置未变化时复用）"""
+    return _build_brand_index(get_config_version())
+
+
+def infer_manufacturer(model: str) -> str:
+    """
+    根据设备型号推断DG命令中使用的制造商名称
+
+    Args:
+        model: 设备型号
+
+    Returns:
+        str: 小写的品牌名（如 "samsung"），无法识别时为 "Unknown"
+    """
+    brand = get_brand_index().brand_of(model)
+    return brand.lower() if brand else UNKNOWN_MANUFACTURER
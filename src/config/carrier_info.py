@@ -1,6 +1,7 @@
 """运营商信息配置文件"""
 
 # 不同国家/地区的运营商信息
+# 运行时修改后需调用 src.config.config_version.mark_config_changed()，使生成计划缓存失效
 CARRIER_INFO = {
     "China": {
         "MCC": "460",
@@ -55,6 +56,11 @@ CARRIER_INFO = {
     }
 }
 
+# 可选的运营商权重（如市场份额），随机选择运营商时按权重抽样，未配置的运营商权重为1
+# 格式: 国家/地区: {运营商: 权重}，例如 {"China": {"China Mobile": 60, "China Telecom": 22, "China Unicom": 18}}
+# 与 CARRIER_INFO 一样，运行时修改后需调用 mark_config_changed()
+CARRIER_WEIGHTS = {}
+
 # 获取指定国家/地区的运营商列表
 def get_carriers_by_region(region):
     if region in CARRIER_INFO:
@@ -77,4 +83,8 @@ def get_mnc_by_carrier(region, carrier):
 def get_phone_prefix_by_region(region):
     if region in CARRIER_INFO:
         return CARRIER_INFO[region]["PhonePrefix"]
-    return []
\ No newline at end of file
+    return []
+
+# 获取运营商权重
+def get_carrier_weight(region, carrier):
+    return CARRIER_WEIGHTS.get(region, {}).get(carrier, 1)
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 import streamlit as st
 from src.config.carrier_info import CARRIER_INFO
+from src.config.config_version import mark_config_changed
 
 
 def display_carrier_info_config():
@@ -37,6 +38,7 @@ def display_carrier_info_config():
                         "MNC": {},
                         "PhonePrefix": []
                     }
+                    mark_config_changed()
                     st.success(f"成功添加国家/地区 {new_region}，MCC: {new_mcc}")
                     st.experimental_rerun()
                 else:
@@ -53,6 +55,7 @@ def display_carrier_info_config():
         if new_mcc != mcc:
             if len(new_mcc) == 3 and new_mcc.isdigit():
                 CARRIER_INFO[selected_region]["MCC"] = new_mcc
+                mark_config_changed()
                 st.success(f"MCC码已更新为 {new_mcc}")
             else:
                 st.error("MCC码必须是3位数字")
@@ -78,6 +81,7 @@ def display_carrier_info_config():
                     
                     if len(valid_mncs) == len(mnc_list):
                         CARRIER_INFO[selected_region]["MNC"][new_carrier] = valid_mncs
+                        mark_config_changed()
                         st.success(f"成功添加运营商 {new_carrier} 和MNC码 {valid_mncs}")
                         st.experimental_rerun()
                     else:
@@ -103,6 +107,7 @@ def display_carrier_info_config():
                     
                     if len(valid_mncs) == len(mnc_list):
                         CARRIER_INFO[selected_region]["MNC"][selected_carrier] = valid_mncs
+                        mark_config_changed()
                         st.success(f"MNC码已更新为 {valid_mncs}")
                         st.experimental_rerun()
                     else:
@@ -112,6 +117,7 @@ def display_carrier_info_config():
             
             if st.button("删除运营商"):
                 del CARRIER_INFO[selected_region]["MNC"][selected_carrier]
+                mark_config_changed()
                 st.success(f"已删除运营商 {selected_carrier}")
                 st.experimental_rerun()
         
@@ -126,10 +132,12 @@ def display_carrier_info_config():
                 # 解析前缀
                 prefix_list = [prefix.strip() for prefix in new_prefixes.split(",") if prefix.strip()]
                 CARRIER_INFO[selected_region]["PhonePrefix"] = prefix_list
+                mark_config_changed()
                 st.success(f"手机号前缀已更新为 {prefix_list}")
                 st.experimental_rerun()
             else:
                 CARRIER_INFO[selected_region]["PhonePrefix"] = []
+                mark_config_changed()
                 st.success("手机号前缀已清空")
 
 
@@ -0,0 +1,18 @@
+"""配置版本号
+
+DEVICE_MODELS / CARRIER_INFO 是可以在运行时直接修改的字典。修改后需调用
+mark_config_changed() 递增版本号，依赖配置的缓存（如生成计划）据此失效。
+"""
+
+_config_version = 0
+
+
+def get_config_version() -> int:
+    """获取当前配置版本号"""
+    return _config_version
+
+
+def mark_config_changed():
+    """标记配置已修改，使依赖配置的缓存失效"""
+    global _config_version
+    _config_version += 1
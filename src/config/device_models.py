@@ -2,6 +2,7 @@
 
 # 不同品牌和型号的设备列表
 # 格式: 品牌: {型号名称: TAC码}
+# 运行时修改后需调用 src.config.config_version.mark_config_changed()，使生成计划缓存失效
 DEVICE_MODELS = {
     "Samsung": {
         "Galaxy S25": "35050556",
@@ -23,6 +24,32 @@ DEVICE_MODELS = {
     }
 }
 
+# 可选的品牌权重（如市场份额），随机选择品牌时按权重抽样，未配置的品牌权重为1
+# 格式: 品牌: 权重，例如 {"Apple": 28, "Samsung": 22}
+# 与 DEVICE_MODELS 一样，运行时修改后需调用 mark_config_changed()
+BRAND_WEIGHTS = {}
+
+# 可选的型号权重，在品牌内随机选择型号时按权重抽样，未配置的型号权重为1
+# 格式: 品牌: {型号名称: 权重}
+MODEL_WEIGHTS = {}
+
+# 型号中除品牌名之外能确定品牌的系列名，用于识别不以品牌名开头的型号（如 "iPhone 13"）
+# 格式: 系列名: 品牌（与 DEVICE_MODELS 的键一致），不区分大小写
+MODEL_SERIES_BRANDS = {
+    "iPhone": "Apple",
+    "POCO": "Xiaomi",
+    "Redmi": "Xiaomi",
+}
+
+# 海外型号代码的前缀（如 "SM-S9180"、"CPH2451"），格式: 前缀: 品牌，区分大小写
+MODEL_CODE_PREFIXES = {
+    "SM-": "Samsung",
+    "ELE-": "Huawei",
+    "VOG-": "Huawei",
+    "CPH": "OPPO",
+    "V20": "Vivo",
+}
+
 # 根据品牌获取型号列表
 def get_models_by_brand(brand):
     return DEVICE_MODELS.get(brand, {})
@@ -54,6 +81,14 @@ def get_tac_by_full_model(full_model):
     brand, model = parts
     return get_tac_by_brand_and_model(brand, model)
 
+# 获取品牌权重
+def get_brand_weight(brand):
+    return BRAND_WEIGHTS.get(brand, 1)
+
+# 获取型号权重
+def get_model_weight(brand, model):
+    return MODEL_WEIGHTS.get(brand, {}).get(model, 1)
+
 # 获取所有TAC码
 def get_all_tacs():
     all_tacs = []
@@ -2,6 +2,7 @@
 
 import streamlit as st
 from src.config.device_models import DEVICE_MODELS
+from src.config.config_version import mark_config_changed
 
 
 def display_device_models_config():
@@ -29,6 +30,7 @@ def display_device_models_config():
             if new_brand:
                 if new_brand not in DEVICE_MODELS:
                     DEVICE_MODELS[new_brand] = {}
+                    mark_config_changed()
                     st.success(f"成功添加品牌 {new_brand}")
                     st.experimental_rerun()
                 else:
@@ -56,6 +58,7 @@ def display_device_models_config():
                         # 删除操作
                         del models[model_name]
                         DEVICE_MODELS[selected_brand] = models
+                        mark_config_changed()
                         st.success(f"已删除型号 {model_name} 及其TAC码")
                         st.experimental_rerun()
         else:
@@ -71,6 +74,7 @@ def display_device_models_config():
                     if new_model_name not in models:
                         models[new_model_name] = new_tac
                         DEVICE_MODELS[selected_brand] = models
+                        mark_config_changed()
                         st.success(f"成功添加型号 {new_model_name} 和TAC码 {new_tac}")
                         st.experimental_rerun()
                     else:
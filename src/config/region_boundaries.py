@@ -0,0 +1,103 @@
+"""区域边界配置文件"""
+
+# 各国家/地区的边界多边形，用于在区域内生成经纬度
+# 格式: 国家/地区: [多边形, ...]，多边形为 (经度, 纬度) 顶点列表，首尾不必重复
+# 这里是略向陆地内收缩的简化轮廓，只保证生成的坐标落在对应区域的陆地上，并不精确描述边界；
+# 需要更高精度时可替换为更详细的多边形。没有配置边界的国家/地区在全球范围内随机生成坐标。
+# 与 CARRIER_INFO 一样，运行时修改后需调用 mark_config_changed()
+REGION_BOUNDARIES = {
+    "China": [
+        # 大陆
+        [
+            (122.3, 53.0), (125.5, 52.6), (127.3, 49.9), (130.4, 48.7), (134.2, 48.1),
+            (133.0, 45.3), (131.1, 44.8), (130.9, 42.9), (129.6, 42.6), (128.1, 41.7),
+            (126.6, 41.5), (124.5, 40.2), (122.6, 39.8), (121.6, 39.4), (121.9, 40.5),
+            (121.1, 40.9), (119.6, 40.1), (118.2, 39.4), (117.9, 38.7), (118.4, 37.8),
+            (119.1, 37.3), (120.6, 37.3), (122.2, 37.2), (120.7, 36.6), (120.0, 35.9),
+            (119.3, 34.9), (120.3, 33.6), (120.8, 32.4), (121.3, 31.8), (121.6, 31.0),
+            (120.9, 30.6), (121.5, 29.9), (121.3, 28.9), (120.5, 27.8), (119.6, 26.5),
+            (119.2, 25.6), (118.1, 24.8), (116.6, 23.6), (115.2, 22.9), (114.3, 22.7),
+            (113.8, 22.8), (113.3, 22.4), (112.4, 22.0), (110.8, 21.6), (110.1, 21.2),
+            (109.3, 21.7), (108.2, 21.8), (107.2, 22.0), (106.8, 22.6), (105.7, 23.1),
+            (104.5, 23.0), (103.4, 22.9), (102.3, 22.6), (101.6, 22.0), (101.0, 21.9),
+            (100.3, 22.0), (99.4, 22.4), (99.4, 23.3), (98.8, 24.2), (98.0, 24.4),
+            (98.6, 25.6), (98.8, 27.2), (98.4, 28.3), (97.1, 28.6), (95.3, 29.2),
+            (93.6, 28.8), (91.6, 28.2), (89.9, 28.3), (88.4, 28.2), (86.3, 28.3),
+            (84.7, 28.8), (83.1, 29.5), (81.6, 30.4), (79.9, 31.5), (79.3, 32.6),
+            (79.0, 34.2), (78.0, 35.5), (76.3, 36.0), (75.0, 37.0), (74.5, 38.5),
+            (74.2, 39.6), (75.6, 40.5), (77.6, 41.0), (79.2, 41.9), (80.2, 42.3),
+            (80.4, 44.7), (82.4, 45.3), (82.6, 46.9), (85.5, 47.2), (87.0, 48.9),
+            (88.2, 48.3), (90.2, 47.4), (91.0, 45.9), (93.5, 44.9), (95.4, 44.1),
+            (96.5, 42.8), (100.0, 42.5), (104.0, 41.6), (105.1, 41.4), (107.0, 42.1),
+            (110.1, 42.5), (111.7, 43.5), (111.7, 44.3), (113.6, 44.7), (116.0, 45.5),
+            (117.4, 46.4), (119.6, 46.8), (119.5, 47.6), (117.4, 47.7), (116.0, 47.8),
+            (117.6, 49.3), (119.0, 50.0), (119.4, 51.0), (120.9, 52.4),
+        ],
+        # 海南岛
+        [
+            (108.8, 19.3), (109.5, 18.4), (110.2, 18.5), (110.8, 19.5), (110.5, 19.9),
+            (109.7, 19.9), (108.9, 19.7),
+        ],
+    ],
+    "Hong Kong": [
+        # 新界及九龙
+        [
+            (113.99, 22.41), (114.04, 22.49), (114.10, 22.52), (114.16, 22.52),
+            (114.21, 22.48), (114.19, 22.43), (114.25, 22.40), (114.24, 22.35),
+            (114.22, 22.32), (114.18, 22.30), (114.16, 22.30), (114.15, 22.33),
+            (114.12, 22.34), (114.06, 22.37),
+        ],
+        # 香港岛
+        [
+            (114.14, 22.275), (114.18, 22.282), (114.22, 22.28), (114.24, 22.24),
+            (114.20, 22.22), (114.16, 22.24),
+        ],
+        # 大屿山
+        [
+            (113.88, 22.23), (113.93, 22.22), (113.99, 22.25), (114.03, 22.28),
+            (113.99, 22.29), (113.93, 22.28),
+        ],
+    ],
+    "Macao": [
+        # 澳门半岛
+        [
+            (113.538, 22.192), (113.551, 22.189), (113.556, 22.198), (113.552, 22.210),
+            (113.544, 22.210), (113.539, 22.201),
+        ],
+        # 氹仔、路氹及路环
+        [
+            (113.556, 22.130), (113.567, 22.121), (113.578, 22.127), (113.576, 22.150),
+            (113.585, 22.157), (113.578, 22.161), (113.560, 22.158), (113.555, 22.145),
+        ],
+    ],
+    "Taiwan": [
+        # 台湾本岛
+        [
+            (121.45, 25.15), (121.75, 25.10), (121.80, 24.70), (121.58, 24.05),
+            (121.35, 23.50), (121.10, 22.85), (120.85, 22.05), (120.65, 22.45),
+            (120.35, 22.70), (120.22, 23.05), (120.25, 23.50), (120.45, 24.15),
+            (120.75, 24.65), (121.05, 25.00),
+        ],
+    ],
+    "USA": [
+        # 本土48州
+        [
+            (-123.9, 48.1), (-122.8, 48.9), (-95.2, 48.9), (-92.2, 46.6), (-88.3, 44.0),
+            (-88.0, 41.8), (-84.0, 41.6), (-81.8, 41.4), (-79.2, 42.6), (-76.7, 43.2),
+            (-75.3, 44.7), (-71.6, 44.9), (-69.3, 47.3), (-67.9, 46.9), (-67.3, 44.8),
+            (-70.4, 43.7), (-71.0, 42.3), (-72.2, 41.5), (-74.3, 40.8), (-74.7, 39.6),
+            (-75.8, 38.2), (-76.6, 37.0), (-76.2, 35.7), (-78.1, 34.2), (-80.1, 32.9),
+            (-81.6, 30.5), (-80.4, 27.3), (-80.6, 25.9), (-81.3, 25.9), (-82.4, 27.9),
+            (-83.5, 29.6), (-84.4, 30.2), (-87.2, 30.6), (-89.2, 30.6), (-90.5, 29.9),
+            (-93.8, 29.9), (-95.1, 29.6), (-97.4, 27.9), (-97.5, 26.1), (-99.4, 27.6),
+            (-101.3, 29.7), (-103.1, 29.1), (-104.8, 30.2), (-106.5, 31.9), (-108.3, 31.9),
+            (-111.1, 31.5), (-114.6, 32.8), (-117.0, 32.8), (-118.2, 34.1), (-120.5, 34.7),
+            (-121.7, 36.6), (-122.3, 37.8), (-123.6, 39.6), (-124.0, 41.8), (-123.8, 46.2),
+        ],
+    ],
+}
+
+
+# 获取指定国家/地区的边界多边形列表
+def get_region_boundary(region):
+    return REGION_BOUNDARIES.get(region, [])
@@ -2,10 +2,15 @@
 设备信息数据模型定义
 """
 
-from dataclasses import dataclass
-from typing import Dict, Optional
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import json
 
+import numpy as np
+
+# 传感器数据的坐标轴
+SENSOR_AXES = ("x", "y", "z")
+
 
 @dataclass
 class DeviceInfo:
@@ -54,4 +59,295 @@ class DeviceInfo:
     
     def to_json(self):
         """将设备信息转换为JSON字符串"""
-        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
\ No newline at end of file
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+
+# DeviceInfo的字段名，顺序与 to_dict() 的键顺序一致
+DEVICE_FIELDS = tuple(f.name for f in fields(DeviceInfo))
+
+# 传感器字段 -> 列名前缀
+SENSOR_FIELDS = {"accelerometer_data": "accelerometer", "gyroscope_data": "gyroscope"}
+
+
+def _sensor_dict(values: Optional[Tuple[float, float, float]]) -> Optional[Dict[str, float]]:
+    return None if values is None else dict(zip(SENSOR_AXES, values))
+
+
+def _sensor_tuple(data: Optional[Dict[str, float]]) -> Optional[Tuple[float, float, float]]:
+    return None if data is None else tuple(data[axis] for axis in SENSOR_AXES)
+
+
+@dataclass(slots=True)
+class CompactDeviceInfo:
+    """
+    使用 __slots__ 的紧凑设备信息
+
+    字段与DeviceInfo相同，但没有实例字典，传感器数据以 (x, y, z) 元组保存，
+    适合在内存中保留大量设备对象。accelerometer_data / gyroscope_data 属性、
+    to_dict() 和 to_json() 的结果与DeviceInfo一致。
+    """
+    model: str = ""
+    imei: str = ""
+    imsi: str = ""
+    mac_address: str = ""
+    android_id: str = ""
+    app_version: str = ""
+    system_version: str = ""
+    ssid: str = ""
+    ip_address: str = ""
+    network_type: str = ""
+    accelerometer: Optional[Tuple[float, float, float]] = None
+    gyroscope: Optional[Tuple[float, float, float]] = None
+    latitude: float = 0.0
+    longitude: float = 0.0
+    country: str = ""
+    region: str = ""
+    carrier: str = ""
+    phone_number: str = ""
+
+    @property
+    def accelerometer_data(self) -> Optional[Dict[str, float]]:
+        return _sensor_dict(self.accelerometer)
+
+    @accelerometer_data.setter
+    def accelerometer_data(self, data: Optional[Dict[str, float]]):
+        self.accelerometer = _sensor_tuple(data)
+
+    @property
+    def gyroscope_data(self) -> Optional[Dict[str, float]]:
+        return _sensor_dict(self.gyroscope)
+
+    @gyroscope_data.setter
+    def gyroscope_data(self, data: Optional[Dict[str, float]]):
+        self.gyroscope = _sensor_tuple(data)
+
+    @classmethod
+    def from_device_info(cls, device_info: DeviceInfo) -> "CompactDeviceInfo":
+        """由DeviceInfo转换"""
+        values = device_info.to_dict()
+        values["accelerometer"] = _sensor_tuple(values.pop("accelerometer_data"))
+        values["gyroscope"] = _sensor_tuple(values.pop("gyroscope_data"))
+        return cls(**values)
+
+    def to_device_info(self) -> DeviceInfo:
+        """转换为DeviceInfo"""
+        return DeviceInfo(**self.to_dict())
+
+    def to_dict(self):
+        """将设备信息转换为字典，与 DeviceInfo.to_dict() 的结果相同"""
+        return {name: getattr(self, name) for name in DEVICE_FIELDS}
+
+    def to_json(self):
+        """将设备信息转换为JSON字符串"""
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+
+class DeviceRow:
+    """
+    DeviceBatch中一行的只读视图
+
+    只保存批次和行号，访问字段时才从对应的列中解码，
+    可以像DeviceInfo一样读取属性、调用 to_dict() 和 to_json()。
+    """
+    __slots__ = ("batch", "index")
+
+    def __init__(self, batch: "DeviceBatch", index: int):
+        self.batch = batch
+        self.index = index
+
+    def __getattr__(self, name: str) -> Any:
+        # 只有常规属性查找失败时才会调用；槽位未赋值时不能再访问 self.batch，否则会无限递归
+        if name in DeviceRow.__slots__:
+            raise AttributeError(name)
+        if name in SENSOR_FIELDS:
+            prefix = SENSOR_FIELDS[name]
+            return {axis: float(self.batch.columns[f"{prefix}_{axis}"][self.index]) for axis in SENSOR_AXES}
+        columns = self.batch.columns
+        if name not in columns:
+            raise AttributeError(name)
+        value = columns[name][self.index]
+        if name in self.batch.categories:
+            return self.batch.categories[name][value]
+        if isinstance(value, bytes):
+            return value.decode("ascii")
+        return value.item()
+
+    def __repr__(self) -> str:
+        return f"DeviceRow({self.index}, imei={self.imei!r})"
+
+    def to_dict(self):
+        """将该行转换为字典，与 DeviceInfo.to_dict() 的结果相同"""
+        return {name: getattr(self, name) for name in DEVICE_FIELDS}
+
+    def to_json(self):
+        """将该行转换为JSON字符串"""
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+    def to_device_info(self) -> DeviceInfo:
+        """将该行转换为DeviceInfo"""
+        return DeviceInfo(**self.to_dict())
+
+
+@dataclass
+class DeviceBatch:
+    """
+    列式设备信息批次
+
+    每个字段以一列NumPy数组存储：标识类字段为定长字节串数组（S类型），
+    型号、区域、运营商等低基数字段为整数编码并在categories中保存类别表，
+    坐标与传感器数据为浮点数组（传感器按轴拆分为 accelerometer_x 等列）。
+    只有在需要时才将行转换为DeviceInfo对象。
+    """
+    columns: Dict[str, np.ndarray]
+    categories: Dict[str, List[str]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        first = next(iter(self.columns.values()), None)
+        return 0 if first is None else len(first)
+
+    def column_values(self, name: str) -> list:
+        """
+        将指定列解码为Python值列表
+
+        Args:
+            name: 列名
+
+        Returns:
+            list: 解码后的列值
+        """
+        values = self.columns[name]
+        if name in self.categories:
+            lookup = np.array(self.categories[name], dtype=object)
+            return lookup[values].tolist()
+        if values.dtype.kind == "S":
+            return values.astype("U").tolist()
+        return values.tolist()
+
+    def __getitem__(self, index: int) -> DeviceRow:
+        """返回指定行的只读视图，不复制数据"""
+        return DeviceRow(self, range(len(self))[index])
+
+    def device_info(self, index: int) -> DeviceInfo:
+        """将指定行转换为DeviceInfo对象"""
+        index = range(len(self))[index]
+        return self.slice(index, index + 1).to_device_info_list()[0]
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "DeviceBatch":
+        """返回[start, stop)范围内的子批次（共享底层数组）"""
+        return DeviceBatch(
+            {name: values[start:stop] for name, values in self.columns.items()},
+            self.categories,
+        )
+
+    def take(self, rows: np.ndarray) -> "DeviceBatch":
+        """返回指定行组成的新批次"""
+        return DeviceBatch({name: values[rows] for name, values in self.columns.items()}, self.categories)
+
+    def replace_rows(self, rows: np.ndarray, other: "DeviceBatch"):
+        """
+        用另一个批次的行按顺序替换指定行
+
+        Args:
+            rows: 要替换的行号数组
+            other: 提供替换数据的批次，行数与rows相同
+        """
+        other = DeviceBatch.concat([self.take(rows[:0]), other])
+        for name, values in self.columns.items():
+            replacement = other.columns[name]
+            if name in self.categories and other.categories[name] != self.categories[name]:
+                self.categories = dict(self.categories, **{name: other.categories[name]})
+            if replacement.dtype != values.dtype:
+                # 字节串宽度可能不同，先把整列提升为能容纳两者的类型
+                values = self.columns[name] = values.astype(np.result_type(values, replacement))
+            values[rows] = replacement
+
+    @classmethod
+    def concat(cls, batches: List["DeviceBatch"]) -> "DeviceBatch":
+        """
+        按顺序合并多个批次
+
+        各批次的类别表不一致时，会将编码重新映射到合并后的类别表。
+
+        Args:
+            batches: 批次列表
+
+        Returns:
+            DeviceBatch: 合并后的批次
+        """
+        if not batches:
+            return cls({})
+        if len(batches) == 1:
+            return batches[0]
+
+        categories = {}
+        for name in batches[0].categories:
+            categories[name] = list(dict.fromkeys(
+                value for batch in batches for value in batch.categories[name]
+            ))
+
+        columns = {}
+        for name in batches[0].columns:
+            parts = []
+            for batch in batches:
+                values = batch.columns[name]
+                if name in categories and batch.categories[name] != categories[name]:
+                    index = {value: i for i, value in enumerate(categories[name])}
+                    remap = np.array([index[value] for value in batch.categories[name]], dtype=values.dtype)
+                    values = remap[values]
+                parts.append(values)
+            columns[name] = np.concatenate(parts)
+        return cls(columns, categories)
+
+    def __iter__(self) -> Iterator[DeviceRow]:
+        return (DeviceRow(self, index) for index in range(len(self)))
+
+    def _field_values(self) -> List[list]:
+        """按 DEVICE_FIELDS 的顺序解码所有字段，传感器字段组合为字典"""
+        values = []
+        for name in DEVICE_FIELDS:
+            if name in SENSOR_FIELDS:
+                prefix = SENSOR_FIELDS[name]
+                axes = zip(*(self.column_values(f"{prefix}_{axis}") for axis in SENSOR_AXES))
+                values.append([dict(zip(SENSOR_AXES, row)) for row in axes])
+            else:
+                values.append(self.column_values(name))
+        return values
+
+    def iter_dicts(self, chunk_size: int = 4096) -> Iterator[dict]:
+        """
+        逐行生成与 DeviceInfo.to_dict() 相同的字典
+
+        直接从列中按块解码，不创建DeviceInfo对象，供批量导出使用。
+
+        Args:
+            chunk_size: 每次解码的行数
+
+        Yields:
+            dict: 设备信息字典
+        """
+        for start in range(0, len(self), chunk_size):
+            for row in zip(*self.slice(start, start + chunk_size)._field_values()):
+                yield dict(zip(DEVICE_FIELDS, row))
+
+    def to_device_info_list(self) -> List[DeviceInfo]:
+        """
+        将整个批次转换为DeviceInfo对象列表
+
+        Returns:
+            List[DeviceInfo]: 设备信息列表
+        """
+        return [DeviceInfo(*row) for row in zip(*self._field_values())]
+
+    def to_compact_list(self) -> List[CompactDeviceInfo]:
+        """
+        将整个批次转换为CompactDeviceInfo对象列表
+
+        Returns:
+            List[CompactDeviceInfo]: 紧凑设备信息列表
+        """
+        values = [
+            list(zip(*(self.column_values(f"{SENSOR_FIELDS[name]}_{axis}") for axis in SENSOR_AXES)))
+            if name in SENSOR_FIELDS else self.column_values(name)
+            for name in DEVICE_FIELDS
+        ]
+        return [CompactDeviceInfo(*row) for row in zip(*values)]
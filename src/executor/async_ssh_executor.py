@@ -0,0 +1,212 @@
+"""基于asyncio的SSH执行器"""
+
+import asyncio
+import select
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.executor.ssh_executor import SSHExecutor
+
+
+# 同时执行的命令数上限（同时也是执行阻塞调用的线程数）。每条命令占用连接上的一个会话通道，
+# OpenSSH服务端默认每个连接最多10个会话（sshd_config 的 MaxSessions），超出的通道会被拒绝
+DEFAULT_MAX_CONCURRENCY = 10
+
+# 单条命令的默认超时时间（秒）
+DEFAULT_COMMAND_TIMEOUT = 30.0
+
+# 读取输出时没有数据的轮询间隔（秒）；标准输出到达时立即唤醒，只有标准错误需要轮询
+READ_POLL_INTERVAL = 0.01
+
+
+class CommandResult(NamedTuple):
+    """单条命令的执行结果"""
+    index: int  # 命令在列表中的位置
+    command: str
+    success: bool
+    stdout: str
+    stderr: str
+
+
+def _exec_blocking(client, command: str, timeout: float, channels: list,
+                   cancelled: threading.Event, started: Callable[[], None]) -> Tuple[bool, str, str]:
+    """
+    在线程中执行单条命令
+
+    线程开始执行时调用 started，调用方从此刻开始计算超时。
+    通道放入 channels，超时或取消时由调用方先设置 cancelled 再关闭其中的通道以结束阻塞的读取；
+    调用方设置 cancelled 时通道还未放入 channels 的，由本函数在打开通道后自行关闭，不再执行命令。
+    标准输出和标准错误交替读取，任一方输出较多时都不会因通道窗口占满而阻塞。
+    """
+    started()
+    if cancelled.is_set():
+        raise asyncio.CancelledError()
+    channel = client.get_transport().open_session(timeout=timeout)
+    channels.append(channel)
+    if cancelled.is_set():
+        channel.close()
+        raise asyncio.CancelledError()
+    channel.settimeout(timeout)
+    channel.exec_command(command)
+    stdout = bytearray()
+    stderr = bytearray()
+    while not channel.closed:
+        while channel.recv_ready():
+            stdout += channel.recv(65536)
+        while channel.recv_stderr_ready():
+            stderr += channel.recv_stderr(65536)
+        if channel.eof_received and not channel.recv_ready() and not channel.recv_stderr_ready():
+            break
+        select.select([channel], [], [], READ_POLL_INTERVAL)
+    if cancelled.is_set():
+        raise asyncio.CancelledError()
+    return channel.recv_exit_status() == 0, stdout.decode('utf-8', errors='replace'), stderr.decode('utf-8', errors='replace')
+
+
+class AsyncSSHExecutor:
+    """
+    基于asyncio的SSH执行器
+
+    paramiko的阻塞调用在有界线程池中执行，同时执行的命令数由信号量限制；
+    每条命令都有超时（从线程开始执行该命令时计算，等待空闲线程的时间不计入），超时或任务被取消时立即关闭对应的通道。
+    单个事件循环中可以同时运行大量设备任务，与其他I/O并发。
+
+    Args:
+        max_concurrency: 同时执行的命令数上限
+        command_timeout: 单条命令的默认超时时间（秒）
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 command_timeout: float = DEFAULT_COMMAND_TIMEOUT):
+        self.client = None
+        self.command_timeout = command_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._threads = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="async-ssh")
+
+    async def _run_blocking(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._threads, func, *args)
+
+    async def connect(self, host: str, port: int, username: str, password: str) -> bool:
+        """
+        连接到SSH服务器
+
+        Args:
+            host: 主机地址
+            port: 端口号
+            username: 用户名
+            password: 密码
+
+        Returns:
+            bool: 连接是否成功
+        """
+        executor = SSHExecutor()
+        connected = await self._run_blocking(executor.connect, host, port, username, password)
+        self.client = executor.client if connected else None
+        return connected
+
+    async def execute(self, command: str, timeout: Optional[float] = None) -> Tuple[bool, str, str]:
+        """
+        执行单个命令
+
+        Args:
+            command: 要执行的命令
+            timeout: 超时时间（秒），默认为 command_timeout
+
+        Returns:
+            Tuple[bool, str, str]: (是否成功（退出码为0）, 标准输出, 错误输出)
+        """
+        if not self.client:
+            return False, "", "SSH客户端未连接"
+        timeout = self.command_timeout if timeout is None else timeout
+        channels = []
+        cancelled = threading.Event()
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            started = asyncio.Event()
+            work = loop.run_in_executor(self._threads, _exec_blocking, self.client, command, timeout, channels,
+                                        cancelled, lambda: loop.call_soon_threadsafe(started.set))
+            try:
+                # 超时已关闭的通道所在的线程可能还未退出，新命令需要排队等待空闲线程，
+                # 超时从线程开始执行时才计算
+                await started.wait()
+                return await asyncio.wait_for(work, timeout)
+            except asyncio.TimeoutError:
+                return False, "", f"命令执行超时（{timeout} 秒）"
+            except Exception as e:
+                return False, "", str(e)
+            finally:
+                # 正常结束时通道已读到EOF；超时或取消时关闭通道使线程中的读取立即返回。
+                # 先设置标志再关闭：线程此后才放入的通道会在它检查标志时自行关闭
+                cancelled.set()
+                work.cancel()
+                for channel in channels:
+                    channel.close()
+
+    async def stream(self, commands: Iterable[str], timeout: Optional[float] = None) -> AsyncIterator[CommandResult]:
+        """
+        按顺序执行多个命令，每条命令完成后立即返回其结果
+
+        用法: async for result in executor.stream(commands): ...
+
+        Args:
+            commands: 要执行的命令
+            timeout: 单条命令的超时时间（秒）
+
+        Yields:
+            CommandResult: 每个命令的执行结果
+        """
+        for index, command in enumerate(commands):
+            yield CommandResult(index, command, *await self.execute(command, timeout))
+
+    async def execute_many(self, commands: Iterable[str], timeout: Optional[float] = None) -> List[Tuple[bool, str, str]]:
+        """
+        按顺序执行一个设备的多个命令（DG命令之间有先后依赖）
+
+        Args:
+            commands: 要执行的命令
+            timeout: 单条命令的超时时间（秒）
+
+        Returns:
+            List[Tuple[bool, str, str]]: 每个命令的执行结果列表
+        """
+        return [(result.success, result.stdout, result.stderr) async for result in self.stream(commands, timeout)]
+
+    async def execute_devices(self, commands_list: Iterable[List[str]],
+                              timeout: Optional[float] = None) -> AsyncIterator[Tuple[int, List[Tuple[bool, str, str]]]]:
+        """
+        同时执行多个设备的命令，按完成顺序返回每个设备的结果
+
+        每个设备的命令按顺序执行，设备之间并发，同时执行的命令数受 max_concurrency 限制。
+        迭代提前结束或被取消时，未完成的设备任务一并取消。
+
+        Args:
+            commands_list: 每个设备的命令列表
+            timeout: 单条命令的超时时间（秒）
+
+        Yields:
+            Tuple[int, List[Tuple[bool, str, str]]]: (设备序号（从1开始）, 每个命令的执行结果列表)
+        """
+        async def run_device(device_number: int, commands: List[str]):
+            return device_number, await self.execute_many(commands, timeout)
+
+        tasks = [asyncio.ensure_future(run_device(i + 1, commands)) for i, commands in enumerate(commands_list)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def disconnect(self):
+        """断开SSH连接并释放线程池"""
+        if self.client:
+            client, self.client = self.client, None
+            await self._run_blocking(client.close)
+        self._threads.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.disconnect()
@@ -0,0 +1,188 @@
+"""可恢复的部署日志
+
+每次部署运行对应一个只追加的日志文件 <目录>/<运行ID>.journal，每行一条记录，字段以制表符分隔：
+
+    H  <运行参数JSON>                      文件头，只在创建时写入一次
+    C  <设备序号>  <命令序号>  <1|0>        单条命令的执行结果
+    D  <设备序号>  <1|0>                    设备的执行结果（所有命令成功时为1）
+
+同一设备可能有多条D记录（恢复时重新执行），以最后一条为准。写入经过缓冲，
+每累积一定数量的记录或间隔一定时间才 fsync 一次，对执行速度几乎没有影响；
+进程中断时最多丢失最近一批记录，对应的设备在恢复时会被重新执行。
+"""
+
+import json
+import os
+import secrets
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+# 默认的部署日志目录
+DEFAULT_JOURNAL_DIR = "deploy_journal"
+
+JOURNAL_SUFFIX = ".journal"
+
+# 累积多少条记录后 fsync 一次
+FSYNC_EVERY_RECORDS = 4096
+
+# 距上次 fsync 超过多少秒后，下一次写入时 fsync
+FSYNC_INTERVAL = 1.0
+
+
+def new_run_id() -> str:
+    """生成运行ID：启动时间加随机后缀"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+
+
+def journal_path(directory: str, run_id: str) -> str:
+    """运行ID对应的日志文件路径"""
+    return os.path.join(directory, run_id + JOURNAL_SUFFIX)
+
+
+def read_journal(filename: str) -> Tuple[dict, Dict[int, bool]]:
+    """
+    读取日志文件
+
+    末尾因中断而不完整的行会被忽略。
+
+    Args:
+        filename: 日志文件名
+
+    Returns:
+        Tuple[dict, Dict[int, bool]]: (运行参数, 设备序号 -> 最后一次执行是否成功)
+    """
+    params = None
+    devices: Dict[int, bool] = {}
+    with open(filename, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            fields = line.rstrip("\n").split("\t")
+            if fields[0] == "H" and params is None:
+                params = json.loads(fields[1])
+            elif fields[0] == "D" and len(fields) == 3:
+                devices[int(fields[1])] = fields[2] == "1"
+    if params is None:
+        raise ValueError(f"部署日志 {filename} 缺少文件头")
+    return params, devices
+
+
+class DeploymentJournal:
+    """
+    部署日志
+
+    用 create 开始新的运行，或用 resume 继续已有的运行；resume 时已成功的设备记录在 completed 中，
+    pending 可从任务中过滤掉这些设备。
+
+    Args:
+        filename: 日志文件名
+        run_id: 运行ID
+        params: 运行参数
+        completed: 已成功执行的设备序号
+        fsync_every: 累积多少条记录后 fsync 一次
+        fsync_interval: 距上次 fsync 超过多少秒后，下一次写入时 fsync
+    """
+
+    def __init__(self, filename: str, run_id: str, params: dict, completed: Optional[Set[int]] = None,
+                 fsync_every: int = FSYNC_EVERY_RECORDS, fsync_interval: float = FSYNC_INTERVAL):
+        self.filename = filename
+        self.run_id = run_id
+        self.params = params
+        self.completed: Set[int] = completed if completed is not None else set()
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._file = open(filename, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def create(cls, directory: str, params: dict, **kwargs) -> "DeploymentJournal":
+        """
+        开始新的运行
+
+        Args:
+            directory: 日志目录
+            params: 运行参数（恢复时据此重建设备信息，不应包含密码等敏感信息）
+
+        Returns:
+            DeploymentJournal: 部署日志
+        """
+        os.makedirs(directory, exist_ok=True)
+        run_id = new_run_id()
+        journal = cls(journal_path(directory, run_id), run_id, params, **kwargs)
+        with journal._lock:
+            journal._file.write(f"H\t{json.dumps(params, ensure_ascii=False)}\n")
+            journal._sync()
+        return journal
+
+    @classmethod
+    def resume(cls, directory: str, run_id: str, **kwargs) -> "DeploymentJournal":
+        """
+        继续已有的运行
+
+        Args:
+            directory: 日志目录
+            run_id: 运行ID
+
+        Returns:
+            DeploymentJournal: 部署日志，completed 为已成功执行的设备序号
+        """
+        filename = journal_path(directory, run_id)
+        if not os.path.exists(filename):
+            raise FileNotFoundError(f"找不到运行 {run_id} 的部署日志: {filename}")
+        params, devices = read_journal(filename)
+        completed = {device_number for device_number, success in devices.items() if success}
+        journal = cls(filename, run_id, params, completed, **kwargs)
+        with open(filename, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b"\n"
+        if torn:
+            # 中断时写了一半的行补上换行，之后追加的记录另起一行
+            journal._file.write("\n")
+        return journal
+
+    def pending(self, jobs: Iterable[Tuple]) -> Iterator[Tuple]:
+        """过滤掉已成功执行的设备，jobs 中每项的第一个元素为设备序号"""
+        for job in jobs:
+            if job[0] not in self.completed:
+                yield job
+
+    def record_device(self, device_number: int, results: List[Tuple[bool, str, str]], error: Optional[str] = None):
+        """
+        记录一个设备的执行结果
+
+        Args:
+            device_number: 设备序号，从1开始
+            results: 每个命令的执行结果列表
+            error: 设备整体未执行的原因（如连接失败）
+        """
+        success = error is None and all(result[0] for result in results)
+        lines = "".join(f"C\t{device_number}\t{i}\t{int(result[0])}\n" for i, result in enumerate(results))
+        with self._lock:
+            self._file.write(f"{lines}D\t{device_number}\t{int(success)}\n")
+            self._unsynced += len(results) + 1
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+        if success:
+            self.completed.add(device_number)
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,356 @@
+"""基于预编译模板的DG命令渲染器"""
+
+import random
+from operator import attrgetter, itemgetter
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from src.config.brand_index import infer_manufacturer
+from src.config.carrier_info import get_mcc_by_region, get_mnc_by_carrier
+from src.config.config_version import get_config_version
+from src.core.models import DeviceInfo
+from src.executor.prop_bundle import CONFIG_PREFIX, PropBundle, split_config_command
+from src.utils.counter_rng import counter_words, word_to_integer, word_to_unit
+
+
+# 网络类型 -> DG支持的格式
+NET_TYPE_MAP = {
+    "2G": "gsm",
+    "3G": "cdma",
+    "4G": "lte",
+    "5G": "nr",
+    "WiFi": "wifi",
+}
+
+# 国家/地区 -> SIM国家代码
+COUNTRY_CODE_MAP = {
+    "China": "CN",
+    "Hong Kong": "HK",
+    "Macao": "MO",
+    "Taiwan": "TW",
+    "USA": "US",
+    "Unknown": "US",  # 默认值
+}
+
+
+def operator_names(carrier: str) -> Tuple[str, str, str]:
+    """
+    运营商的SPN、长名称和短名称
+
+    Returns:
+        Tuple[str, str, str]: (spn, operatorLongName, operatorShortName)
+    """
+    spn = operator_long = operator_short = carrier
+    # 特殊处理一些知名运营商的名称
+    if carrier == "Verizon":
+        operator_long = "Verizon Wireless"
+        operator_short = "Verizon"
+    elif "AT&T" in carrier:
+        spn = "AT&T Mobility"
+        operator_long = "AT&T Mobility"
+        operator_short = "AT&T"
+    elif "China" in carrier:
+        if "Mobile" in carrier:
+            operator_long = "China Mobile"
+            operator_short = "CMCC"
+        elif "Unicom" in carrier:
+            operator_long = "China Unicom"
+            operator_short = "CU"
+        elif "Telecom" in carrier:
+            operator_long = "China Telecom"
+            operator_short = "CT"
+    return spn, operator_long, operator_short
+
+
+# 每个设备的可变值按此顺序取出，再由模板挑选并排列为 % 格式化的参数。
+# 前3个为随机值：序列号（64位，格式化为16位十六进制）、ICCID随机部分（10位数字）、电池电量（20-90%）
+VALUE_SLOTS = (
+    "serial", "iccid", "battery",
+    "imei", "imsi", "msisdn", "mac", "android_id", "ssid", "ip", "longitude", "latitude",
+    "acc_x", "acc_y", "acc_z", "gyro_x", "gyro_y", "gyro_z",
+)
+_SLOT_INDEX = {slot: i for i, slot in enumerate(VALUE_SLOTS)}
+_SLOT_FORMATS = {"serial": "%016X", "iccid": "%010d"}
+
+_DEVICE_VALUES = attrgetter(
+    "imei", "imsi", "phone_number", "mac_address", "android_id", "ssid", "ip_address", "longitude", "latitude"
+)
+_AXIS_VALUES = itemgetter("x", "y", "z")
+_NO_AXES = (None, None, None)
+
+# 与主种子异或后作为命令随机值的计数器流种子，使其与设备信息的抽样序列互不相关
+COMMAND_STREAM_TAG = 0x64674D434D445331
+
+# 是否为空会改变命令组成的字段，与型号、区域等一起作为模板缓存的键
+PRESENCE_FIELDS = (
+    "imei", "imsi", "phone_number", "mac_address", "android_id", "ssid", "ip_address",
+    "accelerometer_data", "gyroscope_data",
+)
+
+
+class CommandTemplate(NamedTuple):
+    """编译好的DG命令模板"""
+    # 所有命令以换行连接后的 % 格式串
+    format: str
+    # 从按 VALUE_SLOTS 排列的可变值中挑选出格式串所需的参数
+    pick: Callable[[tuple], tuple]
+
+
+class BundleTemplate(NamedTuple):
+    """编译好的prop打包模板"""
+    # prop文件内容，由所有 dg config 命令拆分而来
+    prop: CommandTemplate
+    # 没有prop形式的其余命令
+    commands: CommandTemplate
+
+
+def _template(lines: List[Tuple[str, List[int]]], separator: str, terminator: str = "") -> CommandTemplate:
+    # 每个模板至少包含两个可变部分（序列号和电池电量，或经度和纬度），itemgetter总是返回元组
+    slots = [slot for _, line_slots in lines for slot in line_slots]
+    return CommandTemplate(separator.join(line for line, _ in lines) + terminator, itemgetter(*slots))
+
+
+class _TemplateBuilder:
+    """逐条追加命令，静态文本直接拼接，可变部分记录为格式串中的占位符"""
+
+    def __init__(self):
+        # 每条命令的格式串及其中占位符对应的 VALUE_SLOTS 下标
+        self.commands: List[Tuple[str, List[int]]] = []
+
+    def command(self, *fragments):
+        """追加一条命令；fragments中的 (槽位名,) 元组表示可变部分，其余为静态文本"""
+        parts = []
+        slots = []
+        for fragment in fragments:
+            if isinstance(fragment, tuple):
+                slot = fragment[0]
+                parts.append(_SLOT_FORMATS.get(slot, "%s"))
+                slots.append(_SLOT_INDEX[slot])
+            else:
+                parts.append(fragment.replace("%", "%%"))
+        self.commands.append(("".join(parts), slots))
+
+    def build(self) -> CommandTemplate:
+        return _template(self.commands, "\n")
+
+    def build_bundle(self) -> BundleTemplate:
+        """将 dg config 命令拆分为prop文件的行，其余命令保持原样"""
+        prop_lines = []
+        commands = []
+        for line, slots in self.commands:
+            if line.startswith(CONFIG_PREFIX):
+                # 拆分后占位符的先后顺序不变，槽位列表无需调整
+                prop_lines.append(("\n".join(split_config_command(line)), slots))
+            else:
+                commands.append((line, slots))
+        return BundleTemplate(_template(prop_lines, "\n", "\n"), _template(commands, "\n"))
+
+
+def compile_template(model: str, region: str, carrier: str, country: str, network_type: str,
+                     present: Tuple[bool, ...]) -> CommandTemplate:
+    """
+    编译DG命令模板
+
+    命令的顺序和内容与逐条生成时完全相同，品牌推断、MCC/MNC查询、运营商名称和各映射表只在编译时计算一次。
+
+    Args:
+        model: 设备型号
+        region: 区域
+        carrier: 运营商
+        country: 国家/地区
+        network_type: 网络类型
+        present: PRESENCE_FIELDS 中各字段是否非空
+
+    Returns:
+        CommandTemplate: 命令模板
+    """
+    return _build_commands(model, region, carrier, country, network_type, present).build()
+
+
+def compile_bundle_template(model: str, region: str, carrier: str, country: str, network_type: str,
+                            present: Tuple[bool, ...]) -> BundleTemplate:
+    """
+    编译prop打包模板，参数与 compile_template 相同
+
+    配置项与 compile_template 生成的 dg config 命令一一对应，dg geo / dg sensor 命令保留为单独的命令。
+
+    Returns:
+        BundleTemplate: prop打包模板
+    """
+    return _build_commands(model, region, carrier, country, network_type, present).build_bundle()
+
+
+def _build_commands(model: str, region: str, carrier: str, country: str, network_type: str,
+                    present: Tuple[bool, ...]) -> _TemplateBuilder:
+    """
+    按设备的静态属性组装所有命令
+
+    Args:
+        model: 设备型号
+        region: 区域
+        carrier: 运营商
+        country: 国家/地区
+        network_type: 网络类型
+        present: PRESENCE_FIELDS 中各字段是否非空
+
+    Returns:
+        _TemplateBuilder: 已追加全部命令的模板构建器
+    """
+    has = dict(zip(PRESENCE_FIELDS, present))
+    builder = _TemplateBuilder()
+
+    # 设备制造商、品牌和型号
+    if model:
+        brand = infer_manufacturer(model)
+        builder.command(f"dg config -a prop.ro.product.manufacturer={brand}")
+        builder.command(f"dg config -a prop.ro.product.brand={brand}")
+        builder.command(f"dg config -a prop.ro.product.model={model}")
+        builder.command(f"dg config -a prop.ro.product.device={model}")
+
+    # 随机序列号（16位十六进制字符串）
+    builder.command("dg config -a prop.ro.serialno=", ("serial",))
+
+    if has["imei"]:
+        builder.command("dg config -a sim.imei=", ("imei",))
+
+    # SIM卡配置及运营商信息
+    if has["imsi"] and region and carrier:
+        mcc = get_mcc_by_region(region)
+        mnc_list = get_mnc_by_carrier(region, carrier)
+        if mcc and mnc_list:
+            mnc = mnc_list[0]  # 使用第一个MNC
+            builder.command(f"dg config -a sim.state=1 -a sim.numeric={mcc + mnc} -a sim.imsi=", ("imsi",))
+            spn, operator_long, operator_short = operator_names(carrier)
+            builder.command(f"dg config -a sim.spn=\"{spn}\" -a sim.operatorLongName=\"{operator_long}\" "
+                            f"-a sim.operatorShortName=\"{operator_short}\"")
+            builder.command(f"dg config -a sim.iccid=89{mcc}{mnc}", ("iccid",))
+            if has["phone_number"]:
+                builder.command("dg config -a sim.msisdn=", ("msisdn",))
+            if network_type:
+                builder.command(f"dg config -a sim.netType={NET_TYPE_MAP.get(network_type, 'wifi')}")
+
+    if country:
+        builder.command(f"dg config -a sim.country={COUNTRY_CODE_MAP.get(country, 'US')}")
+    if has["mac_address"]:
+        builder.command("dg config -a net.if.mac=", ("mac",))
+    if has["android_id"]:
+        builder.command("dg config -a prop.android.id=", ("android_id",))
+    if has["ssid"]:
+        builder.command("dg config -a net.wifi.ssid=", ("ssid",))
+    if has["ip_address"]:
+        builder.command("dg config -a net.wifi.ipaddress=", ("ip",))
+
+    # 地理位置与传感器数据
+    builder.command("dg geo fix ", ("longitude",), " ", ("latitude",))
+    if has["accelerometer_data"]:
+        builder.command("dg sensor set acceleration ", ("acc_x",), " ", ("acc_y",), " ", ("acc_z",))
+    if has["gyroscope_data"]:
+        builder.command("dg sensor set gyroscope ", ("gyro_x",), " ", ("gyro_y",), " ", ("gyro_z",))
+
+    # 电池电量（随机20-90%）与传感器模拟开关
+    builder.command("dg config -a battery.batteryLevel=", ("battery",))
+    builder.command("dg config -a sensor.mock=true")
+
+    return builder
+
+
+class DGCommandRenderer:
+    """
+    DG命令渲染器
+
+    按 (型号, 区域, 运营商, 国家/地区, 网络类型, 字段是否为空) 缓存编译好的模板，
+    每个设备只需取出可变字段做一次 % 格式化。配置变更（mark_config_changed）后模板自动重新编译。
+
+    指定主种子并在渲染时传入设备序号时，序列号、ICCID和电量由 (主种子, 设备序号) 的计数器流决定，
+    相同主种子的重复运行（包括 --resume）得到完全相同的命令；否则使用全局随机数。
+
+    Args:
+        seed: 主种子
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+        self._stream_seed = None if seed is None else seed ^ COMMAND_STREAM_TAG
+        self._templates: Dict[tuple, CommandTemplate] = {}
+        self._bundle_templates: Dict[tuple, BundleTemplate] = {}
+        self._config_version: Optional[int] = None
+
+    def _key(self, device_info: DeviceInfo) -> tuple:
+        """模板缓存的键；配置版本变化时清空已编译的模板"""
+        version = get_config_version()
+        if version != self._config_version:
+            self._templates.clear()
+            self._bundle_templates.clear()
+            self._config_version = version
+        d = device_info
+        return (
+            d.model, d.region, d.carrier, d.country, d.network_type,
+            bool(d.imei), bool(d.imsi), bool(d.phone_number), bool(d.mac_address), bool(d.android_id),
+            bool(d.ssid), bool(d.ip_address), bool(d.accelerometer_data), bool(d.gyroscope_data),
+        )
+
+    def template_for(self, device_info: DeviceInfo) -> CommandTemplate:
+        """取得设备对应的模板，首次遇到的组合即时编译"""
+        key = self._key(device_info)
+        template = self._templates.get(key)
+        if template is None:
+            template = self._templates[key] = compile_template(*key[:5], key[5:])
+        return template
+
+    def bundle_template_for(self, device_info: DeviceInfo) -> BundleTemplate:
+        """取得设备对应的prop打包模板，首次遇到的组合即时编译"""
+        key = self._key(device_info)
+        template = self._bundle_templates.get(key)
+        if template is None:
+            template = self._bundle_templates[key] = compile_bundle_template(*key[:5], key[5:])
+        return template
+
+    def _random_values(self, index: Optional[int]) -> tuple:
+        """序列号、ICCID随机部分和电量"""
+        if self._stream_seed is None or index is None:
+            return random.getrandbits(64), int(random.random() * 1e10), 20 + int(random.random() * 71)
+        serial, iccid, battery = counter_words(self._stream_seed, index, 3)
+        return serial, int(word_to_unit(iccid) * 1e10), word_to_integer(battery, 20, 91)
+
+    def _values(self, device_info: DeviceInfo, index: Optional[int]) -> tuple:
+        """按 VALUE_SLOTS 的顺序取出设备的可变值"""
+        acc = device_info.accelerometer_data
+        gyro = device_info.gyroscope_data
+        return (
+            *self._random_values(index),
+            *_DEVICE_VALUES(device_info),
+            *(_AXIS_VALUES(acc) if acc else _NO_AXES),
+            *(_AXIS_VALUES(gyro) if gyro else _NO_AXES),
+        )
+
+    def render(self, device_info: DeviceInfo, index: Optional[int] = None) -> str:
+        """
+        渲染单个设备的DG命令
+
+        Args:
+            device_info: 设备信息
+            index: 设备序号（从0开始），与主种子一起决定序列号、ICCID和电量
+
+        Returns:
+            str: 以换行分隔的命令文本（末尾不含换行）
+        """
+        template = self.template_for(device_info)
+        return template.format % template.pick(self._values(device_info, index))
+
+    def render_commands(self, device_info: DeviceInfo, index: Optional[int] = None) -> List[str]:
+        """渲染单个设备的DG命令列表"""
+        return self.render(device_info, index).split("\n")
+
+    def render_bundle(self, device_info: DeviceInfo, index: Optional[int] = None) -> PropBundle:
+        """
+        将单个设备的配置渲染为prop文件
+
+        Args:
+            device_info: 设备信息
+            index: 设备序号（从0开始），与主种子一起决定序列号、ICCID和电量
+
+        Returns:
+            PropBundle: prop文件内容及需单独执行的 dg geo / dg sensor 命令
+        """
+        prop, commands = self.bundle_template_for(device_info)
+        values = self._values(device_info, index)
+        return PropBundle(prop.format % prop.pick(values), (commands.format % commands.pick(values)).split("\n"))
@@ -0,0 +1,279 @@
+"""多主机并行SSH执行器"""
+
+import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from src.executor.prop_bundle import PropBundle, remote_prop_path
+from src.executor.ssh_executor import SSHExecutor
+
+
+# 每台主机默认的并发连接数：同一台设备上的DG配置会互相覆盖，默认逐个设备执行
+DEFAULT_HOST_CONNECTIONS = 1
+
+# 每台主机平均允许提交但未完成的任务数，限制流式提交时驻留内存的任务数量
+PENDING_JOBS_PER_HOST = 4
+
+# 批量模式下每次上传并应用的设备数（每台主机）
+BULK_BATCH_SIZE = 256
+
+# 一个设备的任务：命令列表，或prop打包模式下的prop文件及其余命令
+DeviceTask = Union[List[str], PropBundle]
+
+
+@dataclass(frozen=True)
+class FleetHost:
+    """主机清单中的一台主机"""
+    host: str
+    username: str
+    password: str
+    port: int = 22
+    max_connections: int = DEFAULT_HOST_CONNECTIONS
+
+    @property
+    def name(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+@dataclass
+class DeviceResult:
+    """单个设备的执行结果"""
+    device_number: int  # 设备序号，从1开始
+    host: str
+    results: List[Tuple[bool, str, str]] = field(default_factory=list)  # 每个命令的执行结果
+    error: Optional[str] = None  # 连接失败等导致整个设备未执行时的原因
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and all(success for success, _, _ in self.results)
+
+
+def run_device_task(executor: SSHExecutor, device_number: int, task: DeviceTask) -> List[Tuple[bool, str, str]]:
+    """
+    在已连接的执行器上执行一个设备的任务
+
+    Args:
+        executor: 已连接的SSH执行器
+        device_number: 设备序号，从1开始（决定prop文件在目标设备上的路径）
+        task: 命令列表或PropBundle
+
+    Returns:
+        List[Tuple[bool, str, str]]: 每个命令的执行结果列表
+    """
+    if isinstance(task, PropBundle):
+        return executor.apply_prop_bundle(task, remote_prop_path(device_number))
+    return executor.execute_commands(task)
+
+
+def load_inventory(filename: str, username: Optional[str] = None, password: Optional[str] = None,
+                   port: int = 22) -> List[FleetHost]:
+    """
+    读取主机清单
+
+    清单为JSON数组，每项为主机地址字符串，或包含 host、port、username、password、max_connections 的对象；
+    未指定的字段使用参数中的默认值。
+
+    Args:
+        filename: 清单文件名
+        username: 默认用户名
+        password: 默认密码
+        port: 默认端口
+
+    Returns:
+        List[FleetHost]: 主机列表
+    """
+    with open(filename, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    hosts = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"host": entry}
+        host = FleetHost(
+            host=entry["host"],
+            username=entry.get("username", username),
+            password=entry.get("password", password),
+            port=int(entry.get("port", port)),
+            max_connections=int(entry.get("max_connections", DEFAULT_HOST_CONNECTIONS)),
+        )
+        if not host.username or host.password is None:
+            raise ValueError(f"主机 {host.name} 缺少用户名或密码")
+        if host.max_connections < 1:
+            raise ValueError(f"主机 {host.name} 的 max_connections 必须大于0")
+        hosts.append(host)
+    if not hosts:
+        raise ValueError(f"主机清单 {filename} 为空")
+    return hosts
+
+
+class HostConnectionPool:
+    """
+    单台主机的SSH连接池
+
+    最多同时使用 max_connections 个连接，连接在首次需要时建立，用完后放回池中复用；
+    执行中出现异常或传输层已断开的连接直接断开，不再复用。
+
+    Args:
+        host: 主机
+        pipelined: 连接是否使用流水线模式执行命令
+    """
+
+    def __init__(self, host: FleetHost, pipelined: bool = False):
+        self.host = host
+        self.pipelined = pipelined
+        self._idle: List[SSHExecutor] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(host.max_connections)
+
+    @contextmanager
+    def connection(self) -> Iterator[SSHExecutor]:
+        with self._slots:
+            executor = None
+            while executor is None:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    executor = self._idle.pop()
+                if not executor.is_connected():
+                    executor.disconnect()
+                    executor = None
+            if executor is None:
+                executor = SSHExecutor(self.pipelined)
+                if not executor.connect(self.host.host, self.host.port, self.host.username, self.host.password):
+                    raise ConnectionError(f"无法连接到 {self.host.name}")
+            try:
+                yield executor
+            except BaseException:
+                executor.disconnect()
+                raise
+            # SSHExecutor 内部捕获了执行中的异常，连接断开后不会抛出，归还前检查传输层
+            if not executor.is_connected():
+                executor.disconnect()
+                return
+            with self._lock:
+                self._idle.append(executor)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for executor in idle:
+            executor.disconnect()
+
+
+class FleetExecutor:
+    """
+    多主机并行执行器
+
+    设备按序号轮流分配给清单中的主机；任务在线程池中并发执行，每台主机的并发数受其连接池限制，
+    结果按完成顺序返回。总耗时取决于每台主机分到的设备数，而不是设备总数。
+
+    Args:
+        hosts: 主机列表
+        max_workers: 线程数，默认为所有主机的连接数之和
+        pipelined: 是否在每个连接的持久shell通道中流水线执行命令
+    """
+
+    def __init__(self, hosts: List[FleetHost], max_workers: Optional[int] = None, pipelined: bool = False):
+        if not hosts:
+            raise ValueError("主机列表不能为空")
+        self.hosts = hosts
+        self.pools: Dict[str, HostConnectionPool] = {host.name: HostConnectionPool(host, pipelined) for host in hosts}
+        self.max_workers = max_workers or sum(host.max_connections for host in hosts)
+
+    def host_for(self, device_number: int) -> FleetHost:
+        """设备（序号从1开始）分配到的主机"""
+        return self.hosts[(device_number - 1) % len(self.hosts)]
+
+    def _run_job(self, device_number: int, task: DeviceTask) -> DeviceResult:
+        host = self.host_for(device_number)
+        result = DeviceResult(device_number, host.name)
+        try:
+            with self.pools[host.name].connection() as executor:
+                result.results = run_device_task(executor, device_number, task)
+        except Exception as e:
+            result.error = str(e)
+        return result
+
+    def run(self, jobs: Iterable[Tuple[int, DeviceTask]]) -> Iterator[DeviceResult]:
+        """
+        并发执行设备任务，按完成顺序逐个返回结果
+
+        任务按需从 jobs 中读取，未完成的任务数有上限，可直接传入流式生成的任务。
+
+        Args:
+            jobs: (设备序号, 命令列表或PropBundle) 的迭代器，设备序号从1开始
+
+        Yields:
+            DeviceResult: 每个设备的执行结果
+        """
+        max_pending = max(self.max_workers, PENDING_JOBS_PER_HOST * len(self.hosts))
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fleet") as pool:
+            pending = set()
+            for device_number, task in jobs:
+                pending.add(pool.submit(self._run_job, device_number, task))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def _run_bulk_batch(self, host: FleetHost, batch: List[Tuple[int, PropBundle]]) -> List[DeviceResult]:
+        try:
+            with self.pools[host.name].connection() as executor:
+                return [DeviceResult(device_number, host.name, results)
+                        for device_number, results in executor.apply_prop_bundles(batch)]
+        except Exception as e:
+            return [DeviceResult(device_number, host.name, error=str(e)) for device_number, _ in batch]
+
+    def run_bulk(self, jobs: Iterable[Tuple[int, PropBundle]],
+                 batch_size: int = BULK_BATCH_SIZE) -> Iterator[DeviceResult]:
+        """
+        批量模式：按主机分组上传并应用prop文件
+
+        分配到同一台主机的设备每满 batch_size 个为一批，整批prop文件打包为一个tar流在一个通道中上传，
+        再在一个shell通道中依次应用，每个设备的耗时主要取决于带宽而不是往返次数。
+
+        Args:
+            jobs: (设备序号, PropBundle) 的迭代器，设备序号从1开始
+            batch_size: 每批的设备数
+
+        Yields:
+            DeviceResult: 每个设备的执行结果，结果列表的第一项为上传结果
+        """
+        max_pending = max(self.max_workers, 2 * len(self.hosts))
+        buffers: Dict[str, List[Tuple[int, PropBundle]]] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fleet") as pool:
+            pending = set()
+            for device_number, bundle in jobs:
+                host = self.host_for(device_number)
+                batch = buffers.setdefault(host.name, [])
+                batch.append((device_number, bundle))
+                if len(batch) >= batch_size:
+                    pending.add(pool.submit(self._run_bulk_batch, host, buffers.pop(host.name)))
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield from future.result()
+            for batch in buffers.values():
+                pending.add(pool.submit(self._run_bulk_batch, self.host_for(batch[0][0]), batch))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+    def close(self):
+        """断开所有连接"""
+        for pool in self.pools.values():
+            pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,68 @@
+"""DG配置文件（.prop）打包"""
+
+import posixpath
+import shlex
+from typing import List, NamedTuple
+
+
+# DG命令中设置配置项的前缀，一条命令可以包含多个 -a key=value
+CONFIG_PREFIX = "dg config -a "
+CONFIG_SEPARATOR = " -a "
+
+# 目标设备上存放prop文件的默认目录
+DEFAULT_REMOTE_PROP_DIR = "/data/local/tmp"
+
+
+class PropBundle(NamedTuple):
+    """单个设备的prop文件及无法写入prop文件的命令"""
+    # prop文件内容，每行一个 key=value
+    prop: str
+    # 没有prop形式的命令（dg geo / dg sensor），需在应用prop文件后单独执行
+    commands: List[str]
+
+
+def split_config_command(command: str) -> List[str]:
+    """
+    将一条 dg config 命令拆分为prop文件中的 key=value 行
+
+    命令中为shell加的双引号（如 sim.spn="China Mobile"）在prop文件中去掉。
+
+    Args:
+        command: 以 CONFIG_PREFIX 开头的命令
+
+    Returns:
+        List[str]: key=value 行
+    """
+    lines = []
+    for assignment in command[len(CONFIG_PREFIX):].split(CONFIG_SEPARATOR):
+        key, _, value = assignment.partition("=")
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        lines.append(f"{key}={value}")
+    return lines
+
+
+def prop_file_name(device_number: int) -> str:
+    """第 device_number 个设备（从1开始）的prop文件名"""
+    return f"device_{device_number}.prop"
+
+
+def remote_prop_path(device_number: int, remote_dir: str = DEFAULT_REMOTE_PROP_DIR) -> str:
+    """第 device_number 个设备的prop文件在目标设备上的路径"""
+    return posixpath.join(remote_dir, prop_file_name(device_number))
+
+
+def apply_prop_commands(remote_path: str) -> List[str]:
+    """应用已上传的prop文件的命令"""
+    path = shlex.quote(remote_path)
+    return [f"chmod 644 {path}", f"dg config -a {path}"]
+
+
+def upload_and_apply_command(remote_path: str) -> str:
+    """
+    从标准输入写入prop文件并立即应用的单条shell命令
+
+    prop文件内容通过同一个通道的标准输入传入，上传和应用只需一次往返。
+    """
+    return " && ".join([f"cat > {shlex.quote(remote_path)}"] + apply_prop_commands(remote_path))
+
@@ -0,0 +1,86 @@
+"""传感器轨迹的DG命令流"""
+
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from src.executor.ssh_executor import SSHExecutor
+from src.generator.sensor_trajectory import SensorTrajectory
+
+
+# 传感器数值保留的小数位数
+SENSOR_DECIMALS = 3
+
+
+def format_sensor_commands(acceleration, gyroscope) -> List[str]:
+    """
+    生成一帧传感器数据的DG命令
+
+    Args:
+        acceleration: 加速度 (x, y, z)
+        gyroscope: 角速度 (x, y, z)
+
+    Returns:
+        List[str]: DG命令列表
+    """
+    return [
+        "dg sensor set acceleration " + " ".join(f"{value:.{SENSOR_DECIMALS}f}" for value in acceleration),
+        "dg sensor set gyroscope " + " ".join(f"{value:.{SENSOR_DECIMALS}f}" for value in gyroscope),
+    ]
+
+
+def iter_sensor_commands(trajectory: SensorTrajectory, duration: Optional[float] = None,
+                         device: Optional[int] = None) -> Iterator[Tuple[float, int, List[str]]]:
+    """
+    按时间顺序惰性生成传感器轨迹的DG命令
+
+    每次只生成一块数据，按帧、按设备依次输出。
+
+    Args:
+        trajectory: 传感器轨迹
+        duration: 模拟时长（秒），None表示无限生成
+        device: 只输出指定设备（从0开始）的命令，None表示输出全部设备
+
+    Yields:
+        Tuple[float, int, List[str]]: (时间戳, 设备序号, DG命令列表)
+    """
+    total = None if duration is None else int(round(duration * trajectory.rate))
+    devices = range(trajectory.devices) if device is None else [device]
+    emitted = 0
+    for timestamps, acceleration, gyroscope in trajectory:
+        # 整块转换为Python列表，避免逐个读取NumPy标量
+        acceleration = acceleration.tolist()
+        gyroscope = gyroscope.tolist()
+        for k, timestamp in enumerate(timestamps.tolist()):
+            if total is not None and emitted >= total:
+                return
+            for i in devices:
+                yield timestamp, i, format_sensor_commands(acceleration[i][k], gyroscope[i][k])
+            emitted += 1
+
+
+def push_sensor_commands(executor: SSHExecutor, command_stream: Iterator[Tuple[float, int, List[str]]],
+                         realtime: bool = True) -> int:
+    """
+    通过SSH周期性推送传感器命令
+
+    Args:
+        executor: 已连接的SSH执行器（建议使用流水线模式，否则每条命令都要单独建立通道）
+        command_stream: iter_sensor_commands 的返回值
+        realtime: 是否按时间戳实时推送；执行落后于时间戳时不再等待，直接追赶
+
+    Returns:
+        int: 推送失败的命令数量
+    """
+    failed = 0
+    start = time.monotonic()
+    for timestamp, _, commands in command_stream:
+        if realtime:
+            delay = start + timestamp - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        # 同一帧的命令一起执行，流水线模式下每帧只需约一次往返
+        for success, _, stderr in executor.execute_commands(commands):
+            if not success:
+                failed += 1
+                print(f"传感器命令执行失败 (t={timestamp:.3f}s): {stderr}")
+    return failed
@@ -1,15 +1,41 @@
 """SSH执行器"""
 
-import paramiko
+import io
+import re
+import select
+import shlex
+import tarfile
 import time
-from typing import List, Tuple
+import uuid
+from typing import List, Optional, Tuple
+
+from src.executor.prop_bundle import (DEFAULT_REMOTE_PROP_DIR, PropBundle, prop_file_name, remote_prop_path,
+                                      upload_and_apply_command)
+
+
+# 流水线模式下一批命令的最长等待时间（秒）
+PIPELINE_TIMEOUT = 60.0
+
+# 批量应用prop文件时每条命令额外允许的时间（秒），整批的超时为 PIPELINE_TIMEOUT 加上命令数乘以该值
+BULK_APPLY_SECONDS_PER_COMMAND = 1.0
+
+# 流水线模式下没有数据时的轮询间隔（秒）；标准输出到达时立即唤醒，只有标准错误需要轮询
+PIPELINE_POLL_INTERVAL = 0.01
 
 
 class SSHExecutor:
-    """SSH执行器主类"""
+    """
+    SSH执行器主类
     
-    def __init__(self):
+    Args:
+        pipelined: 为True时 execute_commands 使用流水线模式：所有命令写入同一个持久的shell通道，
+            每条命令后输出唯一的分隔标记，从输出流中拆分出每条命令的输出和退出码，一批命令只需约一次往返
+    """
+    
+    def __init__(self, pipelined: bool = False):
         self.client = None
+        self.pipelined = pipelined
+        self._shell = None
     
     def connect(self, host: str, port: int, username: str, password: str) -> bool:
         """
@@ -24,6 +50,9 @@ class SSHExecutor:
         Returns:
             bool: 连接是否成功
         """
+        # 延迟导入：paramiko加载较慢，不执行SSH的运行无需承担这部分启动开销
+        import paramiko
+        
         try:
             self.client = paramiko.SSHClient()
             self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
@@ -31,8 +60,15 @@ class SSHExecutor:
             return True
         except Exception as e:
             print(f"SSH连接失败: {str(e)}")
+            self.client.close()
+            self.client = None
             return False
     
+    def is_connected(self) -> bool:
+        """SSH连接是否仍然可用（传输层未断开）"""
+        transport = self.client.get_transport() if self.client else None
+        return transport is not None and transport.is_active()
+    
     def execute_command(self, command: str) -> Tuple[bool, str, str]:
         """
         执行单个命令
@@ -41,7 +77,7 @@ class SSHExecutor:
             command: 要执行的命令
             
         Returns:
-            Tuple[bool, str, str]: (是否成功, 标准输出, 错误输出)
+            Tuple[bool, str, str]: (是否成功（退出码为0）, 标准输出, 错误输出)
         """
         if not self.client:
             return False, "", "SSH客户端未连接"
@@ -50,7 +86,8 @@ class SSHExecutor:
             stdin, stdout, stderr = self.client.exec_command(command)
             stdout_str = stdout.read().decode('utf-8')
             stderr_str = stderr.read().decode('utf-8')
-            return True, stdout_str, stderr_str
+            # 按退出码判断成功与否，与流水线模式一致；部署日志据此决定恢复时是否重新执行
+            return stdout.channel.recv_exit_status() == 0, stdout_str, stderr_str
         except Exception as e:
             return False, "", str(e)
     
@@ -64,6 +101,9 @@ class SSHExecutor:
         Returns:
             List[Tuple[bool, str, str]]: 每个命令的执行结果列表
         """
+        if self.pipelined:
+            return self.execute_commands_pipelined(commands)
+        
         results = []
         for command in commands:
             result = self.execute_command(command)
@@ -72,8 +112,229 @@ class SSHExecutor:
             time.sleep(0.1)
         return results
     
+    def execute_commands_pipelined(self, commands: List[str],
+                                   timeout: float = PIPELINE_TIMEOUT) -> List[Tuple[bool, str, str]]:
+        """
+        在持久的shell通道中连续执行多个命令
+        
+        所有命令一次写入通道，每条命令后分别向标准输出和标准错误打印带唯一标记的分隔行（标准输出的分隔行含退出码），
+        读到最后一条命令的分隔行即完成；命令之间没有额外的往返和等待。
+        命令的标准输入重定向到 /dev/null，读取标准输入的命令不会吞掉脚本中其后的命令。
+        shell提前退出或超时时，未完成的命令标记为失败，通道在下次执行时重新建立。
+        
+        Args:
+            commands: 要执行的命令列表
+            timeout: 整批命令的最长等待时间（秒）
+            
+        Returns:
+            List[Tuple[bool, str, str]]: 每个命令的执行结果列表，退出码为0时成功
+        """
+        if not commands:
+            return []
+        if not self.client:
+            return [(False, "", "SSH客户端未连接")] * len(commands)
+        
+        token = f"__dg_{uuid.uuid4().hex}__"
+        # 每条命令放在 { } 中整组重定向标准输入，命令以 ; 或 && 连接时也对所有部分生效
+        script = "".join(
+            f"{{ {command}\n}} </dev/null\nprintf '\\n{token} {i} %d\\n' $?; printf '\\n{token} {i}\\n' >&2\n"
+            for i, command in enumerate(commands)
+        )
+        try:
+            channel = self._open_shell()
+            channel.sendall(script.encode('utf-8'))
+            stdout, stderr, reason = self._read_pipelined(channel, token, len(commands) - 1, timeout)
+        except Exception as e:
+            self._close_shell()
+            return [(False, "", str(e))] * len(commands)
+        if reason:
+            self._close_shell()
+        return _split_pipelined_output(stdout.decode('utf-8', errors='replace'),
+                                       stderr.decode('utf-8', errors='replace'), token, len(commands), reason)
+    
+    def _open_shell(self):
+        """取得持久的shell通道，不存在或已退出时重新建立"""
+        if self._shell is None or self._shell.closed or self._shell.exit_status_ready():
+            self._close_shell()
+            channel = self.client.get_transport().open_session()
+            channel.exec_command("sh")
+            self._shell = channel
+        return self._shell
+    
+    def _close_shell(self):
+        if self._shell is not None:
+            self._shell.close()
+            self._shell = None
+    
+    @staticmethod
+    def _read_pipelined(channel, token: str, last: int, timeout: float) -> Tuple[bytes, bytes, Optional[str]]:
+        """
+        读取标准输出和标准错误，直到两者都以最后一条命令的分隔行结尾
+        
+        Returns:
+            Tuple[bytes, bytes, Optional[str]]: (标准输出, 标准错误, 未完成的原因)，全部完成时原因为None
+        """
+        stdout_end = re.compile(rf"\n{token} {last} -?\d+\n$".encode())
+        stderr_end = f"\n{token} {last}\n".encode()
+        stdout = bytearray()
+        stderr = bytearray()
+        deadline = time.monotonic() + timeout
+        while True:
+            while channel.recv_stderr_ready():
+                stderr += channel.recv_stderr(65536)
+            while channel.recv_ready():
+                stdout += channel.recv(65536)
+            if stdout_end.search(stdout[-len(stderr_end) - 16:]) and stderr.endswith(stderr_end):
+                return bytes(stdout), bytes(stderr), None
+            if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+                return bytes(stdout), bytes(stderr), f"shell已退出（退出码 {channel.recv_exit_status()}）"
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return bytes(stdout), bytes(stderr), f"执行超时（{timeout} 秒）"
+            select.select([channel], [], [], min(remaining, PIPELINE_POLL_INTERVAL))
+    
+    def apply_prop_bundle(self, bundle: PropBundle, remote_path: str) -> List[Tuple[bool, str, str]]:
+        """
+        上传并应用设备的prop文件，再执行其余命令
+        
+        prop文件内容通过命令的标准输入写入 remote_path，写入、chmod 和 dg config 在同一个通道中完成。
+        
+        Args:
+            bundle: 设备的prop文件及其余命令
+            remote_path: prop文件在目标设备上的路径
+            
+        Returns:
+            List[Tuple[bool, str, str]]: 应用prop文件及每个其余命令的执行结果列表
+        """
+        if not self.client:
+            return [(False, "", "SSH客户端未连接")]
+        
+        try:
+            stdin, stdout, stderr = self.client.exec_command(upload_and_apply_command(remote_path))
+            stdin.write(bundle.prop)
+            stdin.channel.shutdown_write()
+            stdout_str = stdout.read().decode('utf-8')
+            stderr_str = stderr.read().decode('utf-8')
+            # 写入或应用失败时后续命令仍会执行，结果中如实反映退出状态
+            results = [(stdout.channel.recv_exit_status() == 0, stdout_str, stderr_str)]
+        except Exception as e:
+            results = [(False, "", str(e))]
+        results.extend(self.execute_commands(bundle.commands))
+        return results
+    
+    def upload_files(self, files: List[Tuple[str, str]], remote_dir: str) -> List[Tuple[bool, str]]:
+        """
+        通过一个通道上传多个文件
+        
+        所有文件打包为一个tar流（权限644）写入远端 `tar -x` 的标准输入，整批文件只需一次往返，
+        耗时取决于带宽而不是文件数。目标目录不存在时自动创建。
+        
+        Args:
+            files: (文件名, 文件内容) 列表，文件名相对于 remote_dir
+            remote_dir: 目标设备上的目录
+            
+        Returns:
+            List[Tuple[bool, str]]: 每个文件的 (是否成功, 错误信息)；整批文件在同一次解包中写入，结果相同
+        """
+        if not self.client:
+            return [(False, "SSH客户端未连接")] * len(files)
+        
+        directory = shlex.quote(remote_dir)
+        try:
+            stdin, stdout, stderr = self.client.exec_command(f"mkdir -p {directory} && tar -x -f - -C {directory}")
+            mtime = time.time()
+            with tarfile.open(fileobj=stdin, mode="w|", format=tarfile.USTAR_FORMAT) as archive:
+                for name, content in files:
+                    data = content.encode('utf-8')
+                    info = tarfile.TarInfo(name)
+                    info.size = len(data)
+                    info.mode = 0o644
+                    info.mtime = mtime
+                    archive.addfile(info, io.BytesIO(data))
+            stdin.channel.shutdown_write()
+            stdout.read()
+            stderr_str = stderr.read().decode('utf-8', errors='replace')
+            status = stdout.channel.recv_exit_status()
+        except Exception as e:
+            return [(False, str(e))] * len(files)
+        if status != 0:
+            return [(False, stderr_str.strip() or f"tar 退出码 {status}")] * len(files)
+        return [(True, "")] * len(files)
+    
+    def apply_prop_bundles(self, bundles: List[Tuple[int, PropBundle]],
+                           remote_dir: str = DEFAULT_REMOTE_PROP_DIR) -> List[Tuple[int, List[Tuple[bool, str, str]]]]:
+        """
+        批量上传并应用多个设备的prop文件
+        
+        所有prop文件打包为一个tar流在一个通道中上传，之后在一个shell通道中依次应用每个上传成功的prop文件并执行其余命令，
+        每条命令的结果按退出码判断（见 execute_commands_pipelined）。
+        
+        Args:
+            bundles: (设备序号, prop文件及其余命令) 列表，设备序号从1开始
+            remote_dir: 目标设备上存放prop文件的目录
+            
+        Returns:
+            List[Tuple[int, List[Tuple[bool, str, str]]]]: 每个设备的 (设备序号, 结果列表)，
+                结果列表的第一项为上传结果，其后为应用prop文件及每个其余命令的执行结果
+        """
+        paths = [remote_prop_path(device_number, remote_dir) for device_number, _ in bundles]
+        uploads = self.upload_files([(prop_file_name(device_number), bundle.prop) for device_number, bundle in bundles],
+                                    remote_dir)
+        
+        commands = []
+        for path, (_, bundle), (uploaded, _) in zip(paths, bundles, uploads):
+            if uploaded:
+                commands.append(f"dg config -a {shlex.quote(path)}")
+                commands.extend(bundle.commands)
+        timeout = PIPELINE_TIMEOUT + len(commands) * BULK_APPLY_SECONDS_PER_COMMAND
+        command_results = iter(self.execute_commands_pipelined(commands, timeout))
+        
+        results = []
+        for path, (device_number, bundle), (uploaded, error) in zip(paths, bundles, uploads):
+            device_results = [(uploaded, "", "" if uploaded else f"上传 {path} 失败: {error}")]
+            if uploaded:
+                device_results.extend(next(command_results) for _ in range(1 + len(bundle.commands)))
+            results.append((device_number, device_results))
+        return results
+    
     def disconnect(self):
         """断开SSH连接"""
+        self._close_shell()
         if self.client:
             self.client.close()
-            self.client = None
\ No newline at end of file
+            self.client = None
+
+
+def _split_pipelined_output(stdout: str, stderr: str, token: str, count: int,
+                            reason: Optional[str]) -> List[Tuple[bool, str, str]]:
+    """
+    按分隔行将流水线模式的输出拆分为每条命令的结果
+    
+    分隔行前为区分输出而加的换行不计入命令的输出；没有分隔行的命令视为未完成，
+    第一条未完成命令得到剩余的部分输出。
+    """
+    stdout_parts = _split_marked(stdout, re.compile(rf"\n{token} (\d+) (-?\d+)\n"))
+    stderr_parts = _split_marked(stderr, re.compile(rf"\n{token} (\d+)()\n"))
+    results = []
+    for i in range(count):
+        if i < len(stdout_parts) - 1:
+            output, exit_code = stdout_parts[i]
+            error = stderr_parts[i][0] if i < len(stderr_parts) else ""
+            results.append((exit_code == 0, output, error))
+        elif i == len(stdout_parts) - 1:
+            error = stderr_parts[i][0] if i < len(stderr_parts) else ""
+            results.append((False, stdout_parts[i][0], f"{error}命令未完成：{reason}"))
+        else:
+            results.append((False, "", f"命令未执行：{reason}"))
+    return results
+
+
+def _split_marked(text: str, marker) -> List[Tuple[str, Optional[int]]]:
+    """按分隔行拆分文本，返回每段的内容及分隔行中的退出码；最后一段为最后一个分隔行之后的剩余内容"""
+    parts = []
+    position = 0
+    for match in marker.finditer(text):
+        parts.append((text[position:match.start()], int(match[2]) if match[2] else None))
+        position = match.end()
+    parts.append((text[position:], None))
+    return parts
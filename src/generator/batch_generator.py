@@ -0,0 +1,287 @@
+"""设备信息列式批量生成引擎"""
+
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from src.core.models import DeviceBatch, SENSOR_AXES
+from src.generator.generation_plan import FALLBACK_MSISDN_LENGTH, IMSI_LENGTH, GenerationPlan, get_generation_plan
+from src.utils.checksum_utils import digit_matrix, imei_check_digits, tac_luhn_sum
+
+
+SYSTEM_VERSIONS = ["Android 10", "Android 11", "Android 12", "Android 13", "Android 14"]
+NETWORK_TYPES = ["2G", "3G", "4G", "5G", "WiFi"]
+
+_DIGIT_CHARS = np.frombuffer(b"0123456789", dtype=np.uint8)
+_HEX_CHARS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+_NUMBER_STRINGS = {}
+_TAC_PLACES = 10 ** np.arange(7, -1, -1, dtype=np.int64)
+_SNR_PLACES = 10 ** np.arange(5, -1, -1, dtype=np.int64)
+
+# 唯一性检查时重新生成重复行的最大轮数
+MAX_UNIQUENESS_ROUNDS = 16
+
+
+def _ascii_column(matrix: np.ndarray) -> np.ndarray:
+    """将 (n, width) 的ASCII码矩阵转换为定长字节串列，末尾的0字节会被视为填充"""
+    matrix = np.ascontiguousarray(matrix, dtype=np.uint8)
+    return matrix.view(f"S{matrix.shape[1]}").ravel()
+
+
+def _digits_to_ascii(digits: np.ndarray) -> np.ndarray:
+    return _DIGIT_CHARS[digits]
+
+
+def _number_strings(values: np.ndarray, high: int) -> np.ndarray:
+    """通过查表将 [0, high) 内的整数转换为十进制字节串，比 astype("S") 快一个数量级"""
+    table = _NUMBER_STRINGS.get(high)
+    if table is None:
+        table = _NUMBER_STRINGS[high] = np.array([str(i).encode("ascii") for i in range(high)], dtype="S")
+    return table[values]
+
+
+def _join_columns(*parts) -> np.ndarray:
+    """逐元素拼接多个字节串列（或字节串常量）"""
+    result = parts[0]
+    for part in parts[1:]:
+        result = np.char.add(result, part)
+    return result
+
+
+def _sample_models(rng: np.random.Generator, n: int, plan: GenerationPlan) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    生成设备型号列及每行的TAC数字
+
+    Returns:
+        Tuple: (型号编码, (n, 8) 的TAC数字矩阵, 每行TAC的Luhn加权和)
+    """
+    brand_draws = rng.random(n)
+    model_draws = rng.random(n)
+    tac_draws = rng.random(n)
+
+    if plan.model:
+        codes = np.zeros(n, dtype=np.int32)
+        if plan.fixed_tac_digits is not None:
+            return codes, np.broadcast_to(plan.fixed_tac_digits, (n, 8)), np.full(n, plan.fixed_tac_sum)
+        # 找不到精确匹配时，为每行随机选择一个TAC
+        tac_index = (tac_draws * len(plan.tac_candidate_digits)).astype(np.int64)
+        return codes, plan.tac_candidate_digits[tac_index], plan.tac_candidate_sums[tac_index]
+
+    # 先按权重选择品牌，再在品牌内按权重选择型号（别名表，每行一次查表）
+    brand_index = plan.brand_table.sample_array(brand_draws)
+    codes = plan.model_tables.offsets[brand_index] + plan.model_tables.sample_array(brand_index, model_draws)
+    return codes.astype(np.int32), plan.model_tac_digits[codes], plan.model_tac_sums[codes]
+
+
+def _sample_locations(rng: np.random.Generator, n: int, plan: GenerationPlan) -> np.ndarray:
+    """生成国家/地区编码列"""
+    return rng.integers(0, len(plan.countries), n).astype(np.int32)
+
+
+def _sample_carriers(rng: np.random.Generator, country_codes: np.ndarray, plan: GenerationPlan) -> np.ndarray:
+    """生成每行的 (国家, 运营商) 组合编码，运营商按权重抽样"""
+    draws = rng.random(len(country_codes))
+    return plan.pair_offsets[country_codes] + plan.carrier_tables.sample_array(country_codes, draws)
+
+
+def _generate_phone_numbers(rng: np.random.Generator, country_codes: np.ndarray, plan: GenerationPlan) -> np.ndarray:
+    """生成手机号码列"""
+    n = len(country_codes)
+    prefix_draws = rng.random(n)
+    digits = rng.integers(0, 10, (n, FALLBACK_MSISDN_LENGTH), dtype=np.uint8)
+
+    counts = plan.phone_head_counts[country_codes]
+    head_index = plan.phone_head_offsets[country_codes] + (prefix_draws * counts).astype(np.int64)
+    row_lengths = plan.phone_number_lengths[country_codes]
+
+    # 没有号码格式的地区前缀为空，使用纯随机数字号码
+    tail = _digits_to_ascii(digits)
+    tail[np.arange(FALLBACK_MSISDN_LENGTH) >= row_lengths[:, None]] = 0
+    return np.char.add(plan.phone_heads[head_index], _ascii_column(tail))
+
+
+def _generate_imeis(rng: np.random.Generator, tac_digits: np.ndarray, tac_sums: np.ndarray) -> np.ndarray:
+    """生成IMEI列：TAC + 6位SNR + Luhn校验位（TAC部分的加权和已在生成计划中预先计算）"""
+    n = len(tac_digits)
+    digits = np.empty((n, 15), dtype=np.uint8)
+    digits[:, :8] = tac_digits
+    digits[:, 8:14] = rng.integers(0, 10, (n, 6), dtype=np.uint8)
+    snr = digits[:, 8:14].astype(np.int64) @ _SNR_PLACES
+    digits[:, 14] = imei_check_digits(tac_sums, snr)
+    return _ascii_column(_digits_to_ascii(digits))
+
+
+def apply_snr_allocator(batch: DeviceBatch, snr_allocator) -> None:
+    """
+    使用SNR分配器为批次中的IMEI重新分配序列号（原地修改IMEI列）
+
+    同一TAC的行按行顺序依次分配，保证不重复；校验位随之重新计算。
+
+    Args:
+        batch: 设备信息批次
+        snr_allocator: SNRAllocator实例
+    """
+    digits = digit_matrix(batch.columns["imei"], 15)
+    tac_values = digits[:, :8].astype(np.int64) @ _TAC_PLACES
+    for tac_value in np.unique(tac_values):
+        rows = np.flatnonzero(tac_values == tac_value)
+        tac = f"{tac_value:08d}"
+        snr = snr_allocator.allocate(tac, len(rows))
+        digits[rows, 8:14] = (snr[:, None] // _SNR_PLACES) % 10
+        digits[rows, 14] = imei_check_digits(tac_luhn_sum(tac), snr)
+    batch.columns["imei"] = _ascii_column(_digits_to_ascii(digits))
+
+
+def enforce_uniqueness(
+    batch: DeviceBatch,
+    uniqueness_index,
+    regenerate: Callable[[int], DeviceBatch],
+    snr_allocator=None,
+) -> None:
+    """
+    通过唯一性索引登记批次中的设备标识，并重新生成存在重复标识的行（原地修改批次）
+
+    Args:
+        batch: 设备信息批次
+        uniqueness_index: UniquenessIndex实例
+        regenerate: 生成指定数量替换行的函数
+        snr_allocator: SNR分配器，提供时替换行的IMEI同样由分配器分配
+
+    Raises:
+        RuntimeError: 多次重新生成后仍有重复，标识空间可能已接近耗尽
+    """
+    pending = np.arange(len(batch))
+    for _ in range(MAX_UNIQUENESS_ROUNDS):
+        pending = pending[uniqueness_index.claim_batch(batch.take(pending))]
+        if not len(pending):
+            return
+        replacement = regenerate(len(pending))
+        if snr_allocator:
+            apply_snr_allocator(replacement, snr_allocator)
+        batch.replace_rows(pending, replacement)
+    raise RuntimeError(f"重新生成 {MAX_UNIQUENESS_ROUNDS} 次后仍有 {len(pending)} 行存在重复标识，标识空间可能已接近耗尽")
+
+
+def _generate_imsis(rng: np.random.Generator, pair_codes: np.ndarray, plan: GenerationPlan) -> np.ndarray:
+    """生成IMSI列：MCC + MNC + MSIN，总长度15位"""
+    n = len(pair_codes)
+    mnc_draws = rng.random(n)
+    imsi = _digits_to_ascii(rng.integers(0, 10, (n, IMSI_LENGTH), dtype=np.uint8))
+    imsi[:, :3] = plan.pair_mcc_chars[pair_codes]
+
+    # 没有MNC候选时，MNC与MSIN均为随机数字，保留上面生成的随机位即可
+    counts = plan.mnc_counts[pair_codes]
+    has_mnc = counts > 0
+    if has_mnc.any():
+        mnc_index = (plan.mnc_offsets[pair_codes] + (mnc_draws * counts).astype(np.int64))[has_mnc]
+        mnc_matrix = plan.mnc_table.view(np.uint8).reshape(-1, 3)[mnc_index]
+        rows = imsi[has_mnc]
+        mask = np.arange(3) < plan.mnc_lengths[mnc_index][:, None]
+        rows[:, 3:6] = np.where(mask, mnc_matrix, rows[:, 3:6])
+        imsi[has_mnc] = rows
+    return _ascii_column(imsi)
+
+
+def _generate_mac_addresses(rng: np.random.Generator, n: int) -> np.ndarray:
+    """生成MAC地址列"""
+    octets = rng.integers(0, 256, (n, 6), dtype=np.uint8)
+    mac = np.full((n, 17), ord(":"), dtype=np.uint8)
+    mac[:, 0::3] = _HEX_CHARS[octets >> 4]
+    mac[:, 1::3] = _HEX_CHARS[octets & 0x0F]
+    return _ascii_column(mac)
+
+
+def _generate_android_ids(rng: np.random.Generator, n: int) -> np.ndarray:
+    """生成Android ID列"""
+    return _ascii_column(_HEX_CHARS[rng.integers(0, 16, (n, 16), dtype=np.uint8)])
+
+
+def _generate_app_versions(rng: np.random.Generator, n: int) -> np.ndarray:
+    """生成应用版本列"""
+    major = _number_strings(rng.integers(1, 6, n), 6)
+    minor = _number_strings(rng.integers(0, 21, n), 21)
+    patch = _number_strings(rng.integers(0, 51, n), 51)
+    return _join_columns(major, b".", minor, b".", patch)
+
+
+def _generate_ssids(rng: np.random.Generator, n: int) -> np.ndarray:
+    """生成WiFi SSID列"""
+    return np.char.add(b"WiFi_", _number_strings(rng.integers(1000, 10000, n), 10000))
+
+
+def _generate_ip_addresses(rng: np.random.Generator, n: int) -> np.ndarray:
+    """生成IPv4地址列"""
+    octets = _number_strings(rng.integers(0, 256, (n, 4)), 256)
+    return _join_columns(octets[:, 0], b".", octets[:, 1], b".", octets[:, 2], b".", octets[:, 3])
+
+
+def generate_device_batch(
+    rng: np.random.Generator,
+    n: int,
+    model: Optional[str] = None,
+    region: Optional[str] = None,
+    carrier: Optional[str] = None,
+) -> DeviceBatch:
+    """
+    以列式方式批量生成设备信息
+
+    每个字段都由一次向量化的NumPy抽样生成，取值规则与
+    DeviceInfoGenerator.generate_device_info 保持一致。
+
+    Args:
+        rng: NumPy随机数生成器
+        n: 生成数量
+        model: 指定设备型号，如果为None则随机选择
+        region: 指定区域（国家/地区），如果为None则随机选择
+        carrier: 指定运营商，如果为None则随机选择
+
+    Returns:
+        DeviceBatch: 列式设备信息批次
+    """
+    plan = get_generation_plan(model, region, carrier)
+    columns = {}
+    categories = {}
+
+    columns["model"], tac_digits, tac_sums = _sample_models(rng, n, plan)
+    categories["model"] = plan.model_categories
+
+    country_codes = _sample_locations(rng, n, plan)
+    columns["country"] = country_codes
+    columns["region"] = country_codes
+    categories["country"] = categories["region"] = plan.country_categories
+
+    pair_codes = _sample_carriers(rng, country_codes, plan)
+    columns["carrier"] = plan.pair_carrier_codes[pair_codes]
+    categories["carrier"] = plan.carrier_categories
+
+    columns["phone_number"] = _generate_phone_numbers(rng, country_codes, plan)
+    columns["imei"] = _generate_imeis(rng, tac_digits, tac_sums)
+    columns["imsi"] = _generate_imsis(rng, pair_codes, plan)
+    columns["mac_address"] = _generate_mac_addresses(rng, n)
+    columns["android_id"] = _generate_android_ids(rng, n)
+    columns["app_version"] = _generate_app_versions(rng, n)
+
+    columns["system_version"] = rng.integers(0, len(SYSTEM_VERSIONS), n).astype(np.int32)
+    categories["system_version"] = SYSTEM_VERSIONS
+
+    columns["ssid"] = _generate_ssids(rng, n)
+    columns["ip_address"] = _generate_ip_addresses(rng, n)
+
+    columns["network_type"] = rng.integers(0, len(NETWORK_TYPES), n).astype(np.int32)
+    categories["network_type"] = NETWORK_TYPES
+
+    accelerometer = rng.uniform(-10.0, 10.0, (n, 3)).round(2)
+    gyroscope = rng.uniform(-500.0, 500.0, (n, 3)).round(2)
+    for i, axis in enumerate(SENSOR_AXES):
+        columns[f"accelerometer_{axis}"] = accelerometer[:, i]
+        columns[f"gyroscope_{axis}"] = gyroscope[:, i]
+
+    # 坐标落在所属区域的边界内；三角形选择使用最后一次抽样，前面各列的抽样顺序保持不变
+    coordinate_draws = rng.random(n), rng.random(n), rng.random(n)
+    latitude, longitude = plan.coordinate_sampler.sample_array(
+        country_codes, coordinate_draws[2], coordinate_draws[0], coordinate_draws[1]
+    )
+    columns["latitude"] = latitude.round(6)
+    columns["longitude"] = longitude.round(6)
+
+    return DeviceBatch(columns, categories)
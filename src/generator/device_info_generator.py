@@ -2,11 +2,15 @@
 
 import random
 import json
-from faker import Faker
+import numpy as np
 from typing import Dict, List, Optional
-from src.config.device_models import DEVICE_MODELS, get_all_models, get_models_by_brand, get_tac_by_brand_and_model, get_tac_by_full_model
-from src.config.carrier_info import CARRIER_INFO, get_mcc_by_region, get_mnc_by_carrier, get_carriers_by_region, get_phone_prefix_by_region
-from src.core.models import DeviceInfo
+from src.core.models import DeviceInfo, DeviceBatch
+from src.generator.batch_generator import MAX_UNIQUENESS_ROUNDS, apply_snr_allocator, enforce_uniqueness, generate_device_batch
+from src.generator.generation_plan import FALLBACK_MSISDN_LENGTH, GenerationPlan, CountryPlan, get_generation_plan
+from src.generator.snr_allocator import SNRAllocator
+from src.generator.uniqueness_index import UniquenessIndex
+from src.utils.checksum_utils import imei_check_digit
+from src.utils.counter_rng import CounterRNG
 
 
 # 已移除DeviceInfo类定义，使用core.models中的定义
@@ -15,9 +19,18 @@ from src.core.models import DeviceInfo
 class DeviceInfoGenerator:
     """设备信息生成器主类"""
     
-    def __init__(self):
-        self.fake = Faker()
-        self.fake.random.seed(42)  # 固定种子以确保一定程度的可重现性
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        snr_allocator: Optional[SNRAllocator] = None,
+        uniqueness_index: Optional[UniquenessIndex] = None
+    ):
+        # 指定种子时，第k个设备的随机数只由 (seed, k) 决定，可通过 generate_device_info_at 直接重建
+        self.seed = seed
+        self._next_index = 0
+        self.rng = np.random.default_rng(seed)  # 未指定种子的批量生成及重复行重新生成使用
+        self.snr_allocator = snr_allocator  # 提供时IMEI的SNR由分配器保证不重复
+        self.uniqueness_index = uniqueness_index  # 提供时生成的标识与历史运行不重复
     
     def generate_device_info(
         self, 
@@ -36,25 +49,48 @@ class DeviceInfoGenerator:
         Returns:
             DeviceInfo: 完整的设备信息对象
         """
+        for _ in range(MAX_UNIQUENESS_ROUNDS):
+            device_info = self._build_device_info(model, region, carrier)
+            # 标识与历史记录重复时重新生成
+            if not self.uniqueness_index or self.uniqueness_index.claim_device_info(device_info):
+                return device_info
+        raise RuntimeError(f"重新生成 {MAX_UNIQUENESS_ROUNDS} 次后标识仍然重复，标识空间可能已接近耗尽")
+    
+    def _build_device_info(
+        self, 
+        model: Optional[str] = None, 
+        region: Optional[str] = None,
+        carrier: Optional[str] = None
+    ) -> DeviceInfo:
+        """生成一条设备信息（不做唯一性检查）"""
+        if self.seed is not None:
+            batch = generate_device_batch(self._next_rng(1), 1, model, region, carrier)
+            if self.snr_allocator:
+                apply_snr_allocator(batch, self.snr_allocator)
+            return batch.device_info(0)
+        
+        # 配置解析结果按 (型号, 区域, 运营商) 缓存，逐条生成时不再重复查找配置
+        plan = get_generation_plan(model, region, carrier)
         device_info = DeviceInfo()
         
         # 生成设备型号
-        device_info.model = self._generate_model(model)
+        device_info.model = self._generate_model(plan)
         
         # 生成地理位置信息
-        device_info.country, device_info.region = self._generate_location(region)
+        country_plan = self._generate_location(plan)
+        device_info.country = device_info.region = country_plan.country
         
         # 生成运营商信息
-        device_info.carrier = self._generate_carrier(device_info.country, carrier)
+        device_info.carrier = self._generate_carrier(country_plan)
         
         # 生成手机号码
-        device_info.phone_number = self._generate_phone_number(device_info.country, device_info.carrier)
+        device_info.phone_number = self._generate_phone_number(country_plan)
         
         # 生成IMEI
-        device_info.imei = self._generate_imei(device_info.model)
+        device_info.imei = self._generate_imei(plan, device_info.model)
         
         # 生成IMSI
-        device_info.imsi = self._generate_imsi(device_info.country, device_info.carrier)
+        device_info.imsi = self._generate_imsi(country_plan, device_info.carrier)
         
         # 生成其他硬件标识
         device_info.mac_address = self._generate_mac_address()
@@ -74,127 +110,107 @@ class DeviceInfoGenerator:
         device_info.gyroscope_data = self._generate_gyroscope_data()
         
         # 生成经纬度
-        device_info.latitude, device_info.longitude = self._generate_coordinates()
+        device_info.latitude, device_info.longitude = self._generate_coordinates(country_plan)
         
         return device_info
     
-    def _generate_model(self, model: Optional[str] = None) -> str:
+    def generate_batch(
+        self,
+        n: int,
+        model: Optional[str] = None,
+        region: Optional[str] = None,
+        carrier: Optional[str] = None
+    ) -> DeviceBatch:
+        """
+        以列式方式批量生成设备信息
+        
+        所有字段均通过NumPy向量化生成，只有在调用 DeviceBatch.to_device_info_list()
+        或按行访问时才会构造DeviceInfo对象，适合大批量生成。
+        
+        Args:
+            n: 生成数量
+            model: 指定设备型号，如果为None则随机选择
+            region: 指定区域（国家/地区），如果为None则随机选择
+            carrier: 指定运营商，如果为None则随机选择
+            
+        Returns:
+            DeviceBatch: 列式设备信息批次
+        """
+        rng = self._next_rng(n) if self.seed is not None else self.rng
+        batch = generate_device_batch(rng, n, model, region, carrier)
+        if self.snr_allocator:
+            apply_snr_allocator(batch, self.snr_allocator)
+        if self.uniqueness_index:
+            enforce_uniqueness(
+                batch,
+                self.uniqueness_index,
+                lambda count: generate_device_batch(self.rng, count, model, region, carrier),
+                self.snr_allocator
+            )
+        return batch
+    
+    def _next_rng(self, n: int) -> CounterRNG:
+        """为接下来的n个设备序号创建基于计数器的随机数生成器"""
+        rng = CounterRNG(self.seed, np.arange(self._next_index, self._next_index + n, dtype=np.uint64))
+        self._next_index += n
+        return rng
+    
+    def _generate_model(self, plan: GenerationPlan) -> str:
         """生成设备型号"""
-        if model:
-            return model
-        # 随机选择品牌和型号
-        all_brands = list(DEVICE_MODELS.keys())
-        brand = random.choice(all_brands)
-        brand_models = DEVICE_MODELS[brand]
-        model_name = random.choice(list(brand_models.keys()))
-        return f"{brand} {model_name}"
+        if plan.model:
+            return plan.model
+        # 按权重选择品牌和型号
+        brand_index = plan.brand_table.sample(random.random())
+        brand = plan.brands[brand_index]
+        model_index = plan.model_tables.tables[brand_index].sample(random.random())
+        return f"{brand} {plan.brand_model_names[brand][model_index]}"
     
-    def _generate_location(self, region: Optional[str] = None) -> tuple:
+    def _generate_location(self, plan: GenerationPlan) -> CountryPlan:
         """生成地理位置信息"""
-        if region and region in CARRIER_INFO:
-            country = region
-        else:
-            # 随机选择一个国家/地区
-            country = random.choice(list(CARRIER_INFO.keys()))
-        
-        return country, country
+        # 指定了有效区域时计划中只有该国家/地区
+        return random.choice(plan.countries)
     
-    def _generate_carrier(self, country: str, carrier: Optional[str] = None) -> str:
+    def _generate_carrier(self, country_plan: CountryPlan) -> str:
         """生成运营商信息"""
-        if carrier and carrier in CARRIER_INFO.get(country, {}).get("MNC", {}):
-            return carrier
-        
-        # 从指定国家的运营商中随机选择
-        carriers = get_carriers_by_region(country)
-        if carriers:
-            return random.choice(carriers)
-        
-        return "Unknown"
+        # 按权重选择运营商；指定了有效运营商时计划中只有该运营商
+        return country_plan.carrier_names[country_plan.carrier_table.sample(random.random())]
     
-    def _generate_phone_number(self, country: str, carrier: str) -> str:
+    def _generate_phone_number(self, country_plan: CountryPlan) -> str:
         """生成手机号码"""
-        prefixes = get_phone_prefix_by_region(country)
-        if not prefixes:
-            return self.fake.msisdn()
+        if country_plan.dial_code is None:
+            # 没有号码格式的地区生成纯随机数字号码
+            return f"{random.randrange(10 ** FALLBACK_MSISDN_LENGTH):0{FALLBACK_MSISDN_LENGTH}d}"
         
-        prefix = random.choice(prefixes)
-        
-        if country == "China":
-            # 中国手机号码为11位
-            remaining_digits = ''.join([str(random.randint(0, 9)) for _ in range(8)])
-            return f"+86{prefix}{remaining_digits}"
-        elif country in ["Hong Kong", "Macao"]:
-            # 港澳地区手机号码
-            remaining_digits = ''.join([str(random.randint(0, 9)) for _ in range(7)])
-            return f"+852{prefix}{remaining_digits}"
-        elif country == "Taiwan":
-            # 台湾地区手机号码
-            remaining_digits = ''.join([str(random.randint(0, 9)) for _ in range(8)])
-            return f"+886{prefix}{remaining_digits}"
-        elif country == "USA":
-            # 美国手机号码
-            remaining_digits = ''.join([str(random.randint(0, 9)) for _ in range(7)])
-            return f"+1{prefix}{remaining_digits}"
-        else:
-            # 其他地区使用Faker生成
-            return self.fake.msisdn()
+        prefix = random.choice(country_plan.phone_prefixes)
+        remaining_digits = ''.join([str(random.randint(0, 9)) for _ in range(country_plan.number_length)])
+        return f"{country_plan.dial_code}{prefix}{remaining_digits}"
     
-    def _generate_imei(self, model: str) -> str:
+    def _generate_imei(self, plan: GenerationPlan, model: str) -> str:
         """生成IMEI号码"""
-        # 解析品牌和型号
-        parts = model.split(" ", 1)
-        if len(parts) == 2:
-            brand, model_name = parts
-        else:
-            brand = model
-            model_name = model
-        
-        # 查找匹配的TAC码
-        tac = get_tac_by_brand_and_model(brand, model_name)
-        
-        # 如果找不到精确匹配，随机选择一个TAC
-        if not tac:
-            all_tacs = []
-            for models in DEVICE_MODELS.values():
-                all_tacs.extend(list(models.values()))
-            tac = random.choice(all_tacs) if all_tacs else "12345678"
+        # 查找匹配的TAC码，找不到精确匹配时随机选择一个TAC
+        tac = plan.tac_for_model(model) or random.choice(plan.tac_candidates)
         
         # 生成SNR（接下来6位）
-        snr = f"{random.randint(0, 999999):06d}"
-        
-        # 生成校验位
-        imei_without_check_digit = tac + snr
-        check_digit = self._calculate_luhn_check_digit(imei_without_check_digit)
+        if self.snr_allocator:
+            snr = int(self.snr_allocator.allocate(tac)[0])
+        else:
+            snr = random.randint(0, 999999)
         
-        return imei_without_check_digit + check_digit
-    
-    def _calculate_luhn_check_digit(self, digits: str) -> str:
-        """使用Luhn算法计算校验位"""
-        total = 0
-        for i, digit in enumerate(reversed(digits)):
-            n = int(digit)
-            if i % 2 == 0:  # 从右边数，偶数位（索引为0, 2, 4...）
-                n *= 2
-                if n > 9:
-                    n -= 9
-            total += n
-        return str((10 - total % 10) % 10)
+        # 生成校验位，TAC部分的Luhn加权和按TAC缓存，只需处理6位SNR
+        return f"{tac}{snr:06d}{imei_check_digit(tac, snr)}"
     
-    def _generate_imsi(self, country: str, carrier: str) -> str:
+    def _generate_imsi(self, country_plan: CountryPlan, carrier: str) -> str:
         """生成IMSI号码"""
-        mcc = get_mcc_by_region(country)
-        if not mcc:
-            mcc = "000"
-        
-        mnc_list = get_mnc_by_carrier(country, carrier)
-        if mnc_list:
-            mnc = random.choice(mnc_list)
+        mcc = country_plan.mcc
+        carrier_plan = country_plan.carrier_plan(carrier)
+        if carrier_plan and carrier_plan.mnc_candidates:
+            i = random.randrange(len(carrier_plan.mnc_candidates))
+            mnc, msin_length = carrier_plan.mnc_candidates[i], carrier_plan.msin_lengths[i]
         else:
             # 默认生成一个2位或3位的MNC
             mnc = f"{random.randint(0, 999):03d}" if random.choice([True, False]) else f"{random.randint(0, 99):02d}"
-        
-        # 计算MSIN长度，IMSI总长度为15位
-        msin_length = 15 - len(mcc) - len(mnc)
+            # 计算MSIN长度，IMSI总长度为15位
+            msin_length = 15 - len(mcc) - len(mnc)
         msin = ''.join([str(random.randint(0, 9)) for _ in range(msin_length)])
         
         return mcc + mnc + msin
@@ -226,7 +242,7 @@ class DeviceInfoGenerator:
     
     def _generate_ip_address(self) -> str:
         """生成IP地址"""
-        return self.fake.ipv4()
+        return ".".join(str(random.randint(0, 255)) for _ in range(4))
     
     def _generate_network_type(self) -> str:
         """生成网络类型"""
@@ -249,9 +265,13 @@ class DeviceInfoGenerator:
             "z": round(random.uniform(-500.0, 500.0), 2)
         }
     
-    def _generate_coordinates(self) -> tuple:
+    def _generate_coordinates(self, country_plan: CountryPlan) -> tuple:
         """生成经纬度坐标"""
-        # 生成全球范围内的随机坐标
+        if country_plan.region_sampler:
+            # 在所属区域的边界内生成坐标
+            latitude, longitude = country_plan.region_sampler.sample(random.random(), random.random(), random.random())
+            return round(latitude, 6), round(longitude, 6)
+        # 没有边界配置的区域在全球范围内随机生成
         latitude = round(random.uniform(-90.0, 90.0), 6)
         longitude = round(random.uniform(-180.0, 180.0), 6)
         return latitude, longitude
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""设备信息流式生成"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+from src.core.models import DeviceBatch, DeviceInfo
+from src.generator.device_info_generator import DeviceInfoGenerator
+from src.generator.sharded_generator import (
+    SHARD_SIZE, assign_identifiers, generate_device_range, iter_shards, new_master_seed, retry_rng
+)
+
+
+# 流式生成时每块的设备数量，也是每次从分片批次转换为设备对象的行数
+MATERIALIZE_CHUNK_SIZE = 4096
+
+
+def iter_device_batches(
+    count: int,
+    master_seed: int,
+    workers: int = 1,
+    model: Optional[str] = None,
+    region: Optional[str] = None,
+    carrier: Optional[str] = None,
+    shard_size: int = SHARD_SIZE,
+) -> Iterator[DeviceBatch]:
+    """
+    按分片顺序逐个生成设备信息批次
+
+    多进程时最多只有 2 * workers 个分片同时在生成或等待消费，
+    内存占用与总数量无关。
+
+    Args:
+        count: 生成数量
+        master_seed: 主种子
+        workers: 工作进程数
+        model: 指定设备型号
+        region: 指定区域
+        carrier: 指定运营商
+        shard_size: 每个分片的设备数量
+
+    Yields:
+        DeviceBatch: 分片的设备信息批次
+    """
+    shards = iter_shards(count, shard_size)
+
+    if workers <= 1:
+        for start, stop in shards:
+            yield generate_device_range(master_seed, start, stop, model, region, carrier)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start, stop in shards:
+            pending.append(executor.submit(generate_device_range, master_seed, start, stop, model, region, carrier))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_device_chunks(
+    count: int,
+    model: Optional[str] = None,
+    region: Optional[str] = None,
+    carrier: Optional[str] = None,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    snr_allocator=None,
+    uniqueness_index=None,
+    chunk_size: int = MATERIALIZE_CHUNK_SIZE,
+) -> Iterator[DeviceBatch]:
+    """
+    按块生成设备信息批次
+
+    指定主种子或多个工作进程时按分片生成后切分为块，否则每块直接以列式方式生成。
+    每块最多 chunk_size 行，可直接交给写入器的 write_batch，内存占用与总数量无关。
+
+    Args:
+        count: 生成数量
+        model: 指定设备型号
+        region: 指定区域
+        carrier: 指定运营商
+        seed: 主种子
+        workers: 工作进程数
+        snr_allocator: SNR分配器，提供时在当前进程中按顺序为IMEI分配不重复的SNR
+        uniqueness_index: 唯一性索引，提供时生成的标识与历史运行不重复
+        chunk_size: 每块的设备数量
+
+    Yields:
+        DeviceBatch: 设备信息批次
+    """
+    if seed is not None or workers > 1:
+        if seed is None:
+            seed = new_master_seed()
+        rng = retry_rng(seed)
+        for batch in iter_device_batches(count, seed, workers, model, region, carrier):
+            assign_identifiers(batch, rng, model, region, carrier, snr_allocator, uniqueness_index)
+            for start in range(0, len(batch), chunk_size):
+                yield batch.slice(start, start + chunk_size)
+        return
+
+    generator = DeviceInfoGenerator(snr_allocator=snr_allocator, uniqueness_index=uniqueness_index)
+    for start in range(0, count, chunk_size):
+        yield generator.generate_batch(min(chunk_size, count - start), model, region, carrier)
+
+
+def iter_device_info(
+    count: int,
+    model: Optional[str] = None,
+    region: Optional[str] = None,
+    carrier: Optional[str] = None,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    snr_allocator=None,
+    uniqueness_index=None,
+) -> Iterator[DeviceInfo]:
+    """
+    逐条生成设备信息
+
+    参数与 iter_device_chunks 相同，每块转换为DeviceInfo后逐条返回，避免整个分片的对象同时驻留内存。
+
+    Yields:
+        DeviceInfo: 设备信息对象
+    """
+    for chunk in iter_device_chunks(count, model, region, carrier, seed, workers, snr_allocator, uniqueness_index):
+        yield from chunk.to_device_info_list()
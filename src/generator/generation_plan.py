@@ -0,0 +1,242 @@
+"""按 (型号, 区域, 运营商) 预编译的生成计划"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config.device_models import DEVICE_MODELS, get_all_tacs, get_brand_weight, get_model_weight, get_tac_by_full_model
+from src.config.carrier_info import CARRIER_INFO, get_carrier_weight
+from src.config.config_version import get_config_version
+from src.config.region_boundaries import get_region_boundary
+from src.generator.region_sampler import RegionSampler, RegionSamplerGroup
+from src.utils.alias_table import AliasTable, AliasTableGroup
+from src.utils.checksum_utils import tac_luhn_sums
+
+
+# 各国家/地区手机号码格式: 国家/地区 -> (国际区号, 前缀之后的随机位数)
+PHONE_NUMBER_FORMATS = {
+    "China": ("+86", 8),
+    "Hong Kong": ("+852", 7),
+    "Macao": ("+852", 7),
+    "Taiwan": ("+886", 8),
+    "USA": ("+1", 7),
+}
+
+# 没有号码前缀配置时生成的纯随机号码位数
+FALLBACK_MSISDN_LENGTH = 13
+
+IMSI_LENGTH = 15
+
+# 找不到任何TAC时使用的默认值
+DEFAULT_TAC = "12345678"
+
+PLAN_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class CarrierPlan:
+    """单个运营商的IMSI生成参数"""
+    name: str
+    mnc_candidates: Tuple[str, ...]
+    msin_lengths: Tuple[int, ...]  # 与mnc_candidates一一对应，IMSI总长度为15位
+
+
+@dataclass(frozen=True)
+class CountryPlan:
+    """单个国家/地区的生成参数"""
+    country: str
+    mcc: str
+    carriers: Tuple[CarrierPlan, ...]  # 候选运营商；指定了有效运营商时只有一个
+    phone_prefixes: Tuple[str, ...]
+    dial_code: Optional[str]  # 为None时没有号码格式，手机号使用纯随机数字
+    number_length: int  # 前缀之后的随机位数
+    carrier_table: AliasTable = field(compare=False)  # 按运营商权重抽样
+    region_sampler: Optional[RegionSampler] = field(compare=False)  # 为None时没有边界配置，坐标在全球范围内生成
+
+    @property
+    def carrier_names(self) -> Tuple[str, ...]:
+        return tuple(carrier.name for carrier in self.carriers)
+
+    def carrier_plan(self, name: str) -> Optional[CarrierPlan]:
+        for carrier in self.carriers:
+            if carrier.name == name:
+                return carrier
+        return None
+
+
+def _digit_matrix(values: List[str], width: int) -> np.ndarray:
+    return np.frombuffer("".join(values).encode("ascii"), dtype=np.uint8).reshape(-1, width) - ord("0")
+
+
+class GenerationPlan:
+    """
+    生成计划
+
+    在创建时一次性解析配置：TAC（及其Luhn加权和）、候选国家/地区、运营商、MCC/MNC候选、号码前缀、
+    国际区号、MSIN长度和号码长度，构建品牌、型号和运营商的加权别名表及区域坐标抽样索引，
+    同时准备列式生成使用的NumPy查找表。
+    逐条生成和列式批量生成共用同一份计划。
+    """
+
+    def __init__(self, model: Optional[str], region: Optional[str], carrier: Optional[str]):
+        self.model = model
+        self.region = region
+        self.carrier = carrier
+        self._resolve_models()
+        self._resolve_countries()
+        self._build_tables()
+
+    def _resolve_models(self):
+        # 随机选择型号时：先随机选择品牌，再在品牌内随机选择型号
+        self.brand_model_names: Dict[str, Tuple[str, ...]] = {
+            brand: tuple(models) for brand, models in DEVICE_MODELS.items() if models
+        }
+        self.brands = tuple(self.brand_model_names)
+        # 品牌与品牌内型号均按配置的权重抽样，逐条生成与列式批量生成共用同一组别名表
+        self.brand_table = AliasTable([get_brand_weight(brand) for brand in self.brands]) if self.brands else None
+        self.model_tables = AliasTableGroup([
+            AliasTable([get_model_weight(brand, model_name) for model_name in model_names])
+            for brand, model_names in self.brand_model_names.items()
+        ]) if self.brands else None
+        self.model_tacs: Dict[str, str] = {
+            f"{brand} {model_name}": tac
+            for brand, models in DEVICE_MODELS.items()
+            for model_name, tac in models.items()
+        }
+        self.fixed_tac = get_tac_by_full_model(self.model) if self.model else None
+        # 指定型号找不到精确匹配时，从全部TAC中随机选择
+        self.tac_candidates = tuple(get_all_tacs()) or (DEFAULT_TAC,)
+
+    def _resolve_countries(self):
+        if self.region and self.region in CARRIER_INFO:
+            country_names = [self.region]
+        else:
+            country_names = list(CARRIER_INFO)
+        self.countries = tuple(self._country_plan(country) for country in country_names)
+        self.country_index = {plan.country: i for i, plan in enumerate(self.countries)}
+
+    def _country_plan(self, country: str) -> CountryPlan:
+        info = CARRIER_INFO[country]
+        mcc = info.get("MCC") or "000"
+        mnc_info = info.get("MNC", {})
+        if self.carrier and self.carrier in mnc_info:
+            names = [self.carrier]
+        else:
+            names = list(mnc_info) or ["Unknown"]
+        carriers = tuple(
+            CarrierPlan(
+                name,
+                tuple(mnc_info.get(name, [])),
+                tuple(IMSI_LENGTH - len(mcc) - len(mnc) for mnc in mnc_info.get(name, [])),
+            )
+            for name in names
+        )
+
+        prefixes = tuple(info.get("PhonePrefix", []))
+        if prefixes and country in PHONE_NUMBER_FORMATS:
+            dial_code, number_length = PHONE_NUMBER_FORMATS[country]
+        else:
+            dial_code, number_length = None, FALLBACK_MSISDN_LENGTH
+        carrier_table = AliasTable([get_carrier_weight(country, name) for name in names])
+        boundary = get_region_boundary(country)
+        region_sampler = RegionSampler(boundary) if boundary else None
+        return CountryPlan(country, mcc, carriers, prefixes, dial_code, number_length, carrier_table, region_sampler)
+
+    def _build_tables(self):
+        """准备列式生成使用的查找表"""
+        # 型号
+        if self.model:
+            self.model_categories = [self.model]
+            self.fixed_tac_digits = _digit_matrix([self.fixed_tac], 8) if self.fixed_tac else None
+            self.tac_candidate_digits = _digit_matrix(list(self.tac_candidates), 8)
+            self.fixed_tac_sum = int(tac_luhn_sums(self.fixed_tac_digits)[0]) if self.fixed_tac else None
+            self.tac_candidate_sums = tac_luhn_sums(self.tac_candidate_digits)
+        else:
+            self.model_categories, tacs = [], []
+            for brand, model_names in self.brand_model_names.items():
+                for model_name in model_names:
+                    self.model_categories.append(f"{brand} {model_name}")
+                    tacs.append(DEVICE_MODELS[brand][model_name])
+            self.model_tac_digits = _digit_matrix(tacs, 8)
+            self.model_tac_sums = tac_luhn_sums(self.model_tac_digits)
+
+        # 国家/地区与 (国家, 运营商) 组合
+        self.country_categories = [plan.country for plan in self.countries]
+        self.carrier_categories = list(dict.fromkeys(
+            name for plan in self.countries for name in plan.carrier_names
+        ))
+        pair_offsets, pair_carriers, pair_mccs = [], [], []
+        mnc_offsets, mnc_counts, mncs = [], [], []
+        head_offsets, head_counts, heads, number_lengths = [], [], [], []
+        for plan in self.countries:
+            pair_offsets.append(len(pair_carriers))
+            for carrier in plan.carriers:
+                pair_carriers.append(self.carrier_categories.index(carrier.name))
+                pair_mccs.append(plan.mcc)
+                mnc_offsets.append(len(mncs))
+                mnc_counts.append(len(carrier.mnc_candidates))
+                mncs.extend(carrier.mnc_candidates)
+
+            head_offsets.append(len(heads))
+            if plan.dial_code is not None:
+                heads.extend(f"{plan.dial_code}{prefix}".encode("ascii") for prefix in plan.phone_prefixes)
+                head_counts.append(len(plan.phone_prefixes))
+            else:
+                heads.append(b"")
+                head_counts.append(1)
+            number_lengths.append(plan.number_length)
+
+        self.pair_offsets = np.array(pair_offsets, dtype=np.int64)
+        self.carrier_tables = AliasTableGroup([plan.carrier_table for plan in self.countries])
+        self.coordinate_sampler = RegionSamplerGroup([plan.region_sampler for plan in self.countries])
+        self.pair_carrier_codes = np.array(pair_carriers, dtype=np.int32)
+        self.pair_mcc_chars = np.frombuffer("".join(pair_mccs).encode("ascii"), dtype=np.uint8).reshape(-1, 3)
+        self.mnc_offsets = np.array(mnc_offsets, dtype=np.int64)
+        self.mnc_counts = np.array(mnc_counts, dtype=np.int64)
+        self.mnc_table = np.array(mncs or [b""], dtype="S3")
+        self.mnc_lengths = np.char.str_len(self.mnc_table)
+
+        self.phone_head_offsets = np.array(head_offsets, dtype=np.int64)
+        self.phone_head_counts = np.array(head_counts, dtype=np.int64)
+        self.phone_heads = np.array(heads, dtype="S")
+        self.phone_number_lengths = np.array(number_lengths, dtype=np.int64)
+
+    def tac_for_model(self, model: str) -> Optional[str]:
+        """返回型号对应的TAC，找不到时返回None"""
+        if model == self.model:
+            return self.fixed_tac
+        return self.model_tacs.get(model)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _build_generation_plan(model: Optional[str], region: Optional[str], carrier: Optional[str],
+                           config_version: int) -> GenerationPlan:
+    return GenerationPlan(model, region, carrier)
+
+
+def get_generation_plan(
+    model: Optional[str] = None,
+    region: Optional[str] = None,
+    carrier: Optional[str] = None,
+) -> GenerationPlan:
+    """
+    获取生成计划（LRU缓存）
+
+    缓存键包含配置版本号，配置通过 mark_config_changed() 标记修改后会重新编译。
+
+    Args:
+        model: 指定设备型号，None表示随机
+        region: 指定区域，None表示随机
+        carrier: 指定运营商，None表示随机
+
+    Returns:
+        GenerationPlan: 生成计划
+    """
+    return _build_generation_plan(model or None, region or None, carrier or None, get_config_version())
+
+
+def clear_generation_plan_cache():
+    """清空生成计划缓存"""
+    _build_generation_plan.cache_clear()
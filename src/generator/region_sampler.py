@@ -0,0 +1,145 @@
+"""区域内坐标抽样索引"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.alias_table import AliasTable, AliasTableGroup
+
+
+Point = Tuple[float, float]
+
+
+def _cross(a: Point, b: Point, c: Point) -> float:
+    """向量 ab 与 ac 的叉积，逆时针为正"""
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _in_triangle(p: Point, a: Point, b: Point, c: Point) -> bool:
+    return _cross(a, b, p) >= 0 and _cross(b, c, p) >= 0 and _cross(c, a, p) >= 0
+
+
+def triangulate(polygon: Sequence[Point]) -> List[Tuple[Point, Point, Point]]:
+    """
+    对简单多边形做耳切法三角剖分
+
+    Args:
+        polygon: (经度, 纬度) 顶点列表，顺时针或逆时针均可
+
+    Returns:
+        List: 三角形列表，每个三角形为3个顶点
+
+    Raises:
+        ValueError: 顶点不足或多边形自相交
+    """
+    points = [(float(x), float(y)) for x, y in polygon]
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    if len(points) < 3:
+        raise ValueError("多边形至少需要3个顶点")
+    # 统一为逆时针方向
+    doubled_area = sum(_cross((0.0, 0.0), points[i - 1], points[i]) for i in range(len(points)))
+    if doubled_area < 0:
+        points.reverse()
+
+    indices = list(range(len(points)))
+    triangles = []
+    while len(indices) > 3:
+        for k in range(len(indices)):
+            i, j, l = indices[k - 1], indices[k], indices[(k + 1) % len(indices)]
+            a, b, c = points[i], points[j], points[l]
+            cross = _cross(a, b, c)
+            if cross == 0:
+                # 共线顶点不构成三角形，直接移除
+                indices.pop(k)
+                break
+            if cross < 0:
+                continue
+            if any(_in_triangle(points[m], a, b, c) for m in indices if m not in (i, j, l)):
+                continue
+            triangles.append((a, b, c))
+            indices.pop(k)
+            break
+        else:
+            raise ValueError("多边形自相交，无法三角剖分")
+    if len(indices) == 3:
+        triangles.append(tuple(points[m] for m in indices))
+    return triangles
+
+
+class RegionSampler:
+    """
+    单个区域的坐标抽样索引
+
+    将区域的边界多边形三角剖分，按面积构建三角形的别名表。每个坐标需要3个均匀随机数：
+    一个通过别名表选择三角形，两个用于在三角形内均匀取点（和大于1时沿对角线翻折）。
+    面积按三角形中心纬度的余弦修正，使不同纬度的三角形按实际地表面积被选中。
+    """
+
+    def __init__(self, polygons: Sequence[Sequence[Point]]):
+        triangles = [triangle for polygon in polygons for triangle in triangulate(polygon)]
+        if not triangles:
+            raise ValueError("区域边界为空")
+        vertices = np.array(triangles, dtype=np.float64)  # (k, 3, 2)，最后一维为 (经度, 纬度)
+        self.origins = vertices[:, 0]
+        self.edges1 = vertices[:, 1] - vertices[:, 0]
+        self.edges2 = vertices[:, 2] - vertices[:, 0]
+        areas = np.abs(self.edges1[:, 0] * self.edges2[:, 1] - self.edges1[:, 1] * self.edges2[:, 0]) / 2
+        areas *= np.cos(np.radians(vertices[:, :, 1].mean(axis=1)))
+        self.table = AliasTable(areas)
+        # 逐条抽样使用的Python元组：(原点经度, 原点纬度, 边1经度, 边1纬度, 边2经度, 边2纬度)
+        self._triangles = [tuple(row) for row in np.hstack([self.origins, self.edges1, self.edges2]).tolist()]
+
+    def sample(self, u: float, r1: float, r2: float) -> Tuple[float, float]:
+        """
+        根据3个 [0, 1) 均匀随机数生成区域内的一个坐标
+
+        Returns:
+            Tuple[float, float]: (纬度, 经度)
+        """
+        ox, oy, e1x, e1y, e2x, e2y = self._triangles[self.table.sample(u)]
+        if r1 + r2 > 1.0:
+            r1, r2 = 1.0 - r1, 1.0 - r2
+        return oy + r1 * e1y + r2 * e2y, ox + r1 * e1x + r2 * e2x
+
+
+class RegionSamplerGroup:
+    """
+    多个区域的坐标抽样索引
+
+    所有区域的三角形拼接为一维数组，按每行的区域编号一次向量化抽样；
+    没有边界配置的区域在全球范围内均匀生成坐标。
+    """
+
+    def __init__(self, samplers: Sequence[Optional[RegionSampler]]):
+        # 没有边界的区域用一个占位三角形填充，结果会被全球均匀坐标替换
+        placeholder = np.zeros((1, 2))
+        self.has_boundary = np.array([sampler is not None for sampler in samplers], dtype=bool)
+        self.tables = AliasTableGroup([sampler.table if sampler else AliasTable([1.0]) for sampler in samplers])
+        self.origins = np.concatenate([sampler.origins if sampler else placeholder for sampler in samplers])
+        self.edges1 = np.concatenate([sampler.edges1 if sampler else placeholder for sampler in samplers])
+        self.edges2 = np.concatenate([sampler.edges2 if sampler else placeholder for sampler in samplers])
+
+    def sample_array(self, groups: np.ndarray, u: np.ndarray, r1: np.ndarray,
+                     r2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        批量生成坐标
+
+        Args:
+            groups: 每行的区域编号
+            u: 选择三角形的均匀随机数
+            r1, r2: 三角形内取点的均匀随机数；没有边界的区域分别用于纬度和经度
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (纬度数组, 经度数组)
+        """
+        triangles = self.tables.offsets[groups] + self.tables.sample_array(groups, u)
+        fold = r1 + r2 > 1.0
+        s1 = np.where(fold, 1.0 - r1, r1)[:, None]
+        s2 = np.where(fold, 1.0 - r2, r2)[:, None]
+        points = self.origins[triangles] + s1 * self.edges1[triangles] + s2 * self.edges2[triangles]
+
+        bounded = self.has_boundary[groups]
+        latitude = np.where(bounded, points[:, 1], -90.0 + 180.0 * r1)
+        longitude = np.where(bounded, points[:, 0], -180.0 + 360.0 * r2)
+        return latitude, longitude
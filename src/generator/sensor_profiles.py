@@ -0,0 +1,14 @@
+"""传感器轨迹的运动模式
+
+不依赖NumPy，命令行解析参数时即可使用；轨迹生成见 sensor_trajectory。
+"""
+
+# 运动模式 -> 说明
+SENSOR_PROFILES = {
+    "idle": "静置：设备平放，只有重力和传感器噪声",
+    "walk": "步行：随步频周期振动，行进方向缓慢变化",
+    "drive": "驾车：车速随加减速变化，转弯时产生向心加速度",
+}
+
+# 默认采样频率（Hz）
+DEFAULT_SENSOR_RATE = 10.0
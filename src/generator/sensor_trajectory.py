@@ -0,0 +1,224 @@
+"""传感器轨迹流式生成"""
+
+import math
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.generator.sensor_profiles import DEFAULT_SENSOR_RATE, SENSOR_PROFILES
+
+
+GRAVITY = 9.80665
+
+# 每块生成的帧数
+DEFAULT_CHUNK_FRAMES = 64
+
+# 车速上限（m/s）
+MAX_DRIVE_SPEED = 33.0
+
+
+def _ar1(state: np.ndarray, noise: np.ndarray, decay: float) -> np.ndarray:
+    """
+    按块计算一阶自回归过程 x[k] = decay * x[k-1] + noise[k]
+
+    用闭式解向量化计算整块：x[k] = decay^k * x0 + sum(decay^(k-j) * noise[j])。
+    为避免 decay^-k 过大损失精度，按 decay^-k 不超过 e^20 的长度分段计算。
+
+    Args:
+        state: 每个设备的上一帧取值，形状为 (设备数,)
+        noise: 每帧的新息，形状为 (设备数, 帧数)
+        decay: 衰减系数，0 < decay < 1
+
+    Returns:
+        np.ndarray: 每帧的取值，形状与noise相同
+    """
+    frames = noise.shape[1]
+    block = max(1, int(20.0 / -math.log(decay)))
+    values = np.empty_like(noise)
+    for start in range(0, frames, block):
+        end = min(start + block, frames)
+        powers = decay ** np.arange(1, end - start + 1)
+        values[:, start:end] = powers * (state[:, None] + np.cumsum(noise[:, start:end] / powers, axis=1))
+        state = values[:, end - 1]
+    return values
+
+
+class _OrnsteinUhlenbeck:
+    """
+    跨块保持状态的Ornstein-Uhlenbeck过程（均值回复的随机游走）
+
+    Args:
+        mean: 长期均值
+        sigma: 平稳分布的标准差
+        tau: 相关时间（秒）
+        dt: 采样间隔（秒）
+        initial: 初始取值
+    """
+
+    def __init__(self, mean: float, sigma: float, tau: float, dt: float, initial: np.ndarray):
+        self.mean = mean
+        self.decay = math.exp(-dt / tau)
+        self.scale = sigma * math.sqrt(1.0 - self.decay ** 2)
+        self.state = np.asarray(initial, dtype=np.float64) - mean
+
+    def next(self, rng: np.random.Generator, frames: int) -> np.ndarray:
+        noise = rng.standard_normal((len(self.state), frames)) * self.scale
+        values = _ar1(self.state, noise, self.decay)
+        self.state = values[:, -1].copy()
+        return values + self.mean
+
+
+class SensorTrajectory:
+    """
+    一组设备的传感器轨迹
+
+    按块惰性生成加速度（m/s²）和角速度（rad/s）时间序列，同一块内对所有设备和所有帧向量化计算，
+    跨块只保留每个设备的少量状态（相位、车速、随机过程的当前值），内存占用与模拟时长无关。
+    坐标系为Android设备坐标系：x向右，y沿屏幕向上（行进方向），z垂直屏幕向外。
+
+    Args:
+        profile: 运动模式，见 SENSOR_PROFILES
+        devices: 设备数量
+        rate: 采样频率（Hz）
+        seed: 随机种子，相同种子生成相同轨迹
+        chunk_frames: 每块生成的帧数
+    """
+
+    def __init__(self, profile: str = "idle", devices: int = 1, rate: float = DEFAULT_SENSOR_RATE,
+                 seed: Optional[int] = None, chunk_frames: int = DEFAULT_CHUNK_FRAMES):
+        if profile not in SENSOR_PROFILES:
+            raise ValueError(f"不支持的运动模式: {profile}")
+        if devices < 1 or rate <= 0 or chunk_frames < 1:
+            raise ValueError("设备数量、采样频率和每块帧数必须大于0")
+        self.profile = profile
+        self.devices = devices
+        self.rate = rate
+        self.dt = 1.0 / rate
+        self.chunk_frames = chunk_frames
+        self.frame = 0
+        self._rng = np.random.default_rng(np.random.SeedSequence(seed))
+        getattr(self, f"_init_{profile}")()
+
+    def _init_idle(self):
+        # 设备不完全水平，每台设备有固定的小倾角
+        tilt = self._rng.normal(0.0, math.radians(2.0), (self.devices, 2))
+        self._gravity = self._gravity_vector(tilt)
+        self._gyro_bias = self._rng.normal(0.0, 0.002, (self.devices, 3))
+
+    def _init_walk(self):
+        tilt = self._rng.normal(0.0, math.radians(8.0), (self.devices, 2))
+        self._gravity = self._gravity_vector(tilt)
+        # 步频在 1.6~2.1 Hz 之间，随时间缓慢漂移
+        self._step_frequency = _OrnsteinUhlenbeck(1.85, 0.08, 20.0, self.dt, self._rng.uniform(1.6, 2.1, self.devices))
+        self._phase = self._rng.uniform(0.0, 2 * math.pi, self.devices)
+        self._yaw_rate = _OrnsteinUhlenbeck(0.0, 0.15, 4.0, self.dt, np.zeros(self.devices))
+
+    def _init_drive(self):
+        tilt = self._rng.normal(0.0, math.radians(3.0), (self.devices, 2))
+        self._gravity = self._gravity_vector(tilt)
+        self._speed = self._rng.uniform(0.0, 20.0, self.devices)
+        self._acceleration = _OrnsteinUhlenbeck(0.0, 1.0, 6.0, self.dt, np.zeros(self.devices))
+        self._yaw_rate = _OrnsteinUhlenbeck(0.0, 0.08, 4.0, self.dt, np.zeros(self.devices))
+
+    @staticmethod
+    def _gravity_vector(tilt: np.ndarray) -> np.ndarray:
+        """由绕x轴、y轴的倾角计算设备坐标系下的重力加速度，形状为 (设备数, 3)"""
+        pitch, roll = tilt[:, 0], tilt[:, 1]
+        return GRAVITY * np.stack([
+            np.sin(roll) * np.cos(pitch),
+            np.sin(pitch),
+            np.cos(roll) * np.cos(pitch),
+        ], axis=1)
+
+    def next_chunk(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        生成下一块数据
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (时间戳数组 (帧数,)，
+            加速度 (设备数, 帧数, 3)，角速度 (设备数, 帧数, 3))
+        """
+        frames = self.chunk_frames
+        timestamps = (self.frame + np.arange(frames)) * self.dt
+        self.frame += frames
+        acceleration, gyroscope = getattr(self, f"_next_{self.profile}")(frames)
+        return timestamps, acceleration, gyroscope
+
+    def _noise(self, sigma: float, frames: int) -> np.ndarray:
+        return self._rng.normal(0.0, sigma, (self.devices, frames, 3))
+
+    def _next_idle(self, frames: int) -> Tuple[np.ndarray, np.ndarray]:
+        acceleration = self._gravity[:, None, :] + self._noise(0.02, frames)
+        gyroscope = self._gyro_bias[:, None, :] + self._noise(0.001, frames)
+        return acceleration, gyroscope
+
+    def _next_walk(self, frames: int) -> Tuple[np.ndarray, np.ndarray]:
+        frequency = self._step_frequency.next(self._rng, frames)
+        phase = self._phase[:, None] + np.cumsum(2 * math.pi * frequency * self.dt, axis=1)
+        self._phase = np.mod(phase[:, -1], 2 * math.pi)
+        # 每步一次竖直振动和前后振动，左右摇摆的周期为两步
+        stride = np.sin(phase)
+        sway = np.sin(phase / 2)
+        acceleration = self._gravity[:, None, :] + self._noise(0.15, frames)
+        acceleration[:, :, 0] += 0.8 * sway
+        acceleration[:, :, 1] += 1.2 * np.cos(phase)
+        acceleration[:, :, 2] += 2.5 * stride
+        gyroscope = self._noise(0.02, frames)
+        gyroscope[:, :, 0] += 0.3 * stride
+        gyroscope[:, :, 1] += 0.4 * sway
+        gyroscope[:, :, 2] += self._yaw_rate.next(self._rng, frames)
+        return acceleration, gyroscope
+
+    def _next_drive(self, frames: int) -> Tuple[np.ndarray, np.ndarray]:
+        commanded = self._acceleration.next(self._rng, frames)
+        # 车速受 [0, MAX_DRIVE_SPEED] 限制，需要逐帧累加；每帧对所有设备向量化
+        speed = np.empty_like(commanded)
+        current = self._speed
+        for k in range(frames):
+            current = np.clip(current + commanded[:, k] * self.dt, 0.0, MAX_DRIVE_SPEED)
+            speed[:, k] = current
+        previous = np.concatenate([self._speed[:, None], speed[:, :-1]], axis=1)
+        self._speed = current
+        longitudinal = (speed - previous) / self.dt
+        # 停车时不转弯，低速时转向角速度按车速线性减小
+        yaw_rate = self._yaw_rate.next(self._rng, frames) * np.minimum(speed / 5.0, 1.0)
+        # 路面颠簸随车速增大
+        bumps = np.minimum(speed / MAX_DRIVE_SPEED, 1.0)[:, :, None]
+
+        acceleration = self._gravity[:, None, :] + self._noise(0.05, frames) + bumps * self._noise(0.3, frames)
+        acceleration[:, :, 0] -= speed * yaw_rate
+        acceleration[:, :, 1] += longitudinal
+        gyroscope = self._noise(0.005, frames) + bumps * self._noise(0.02, frames)
+        gyroscope[:, :, 2] += yaw_rate
+        return acceleration, gyroscope
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """无限地逐块生成数据，调用方按需停止"""
+        while True:
+            yield self.next_chunk()
+
+
+def iter_sensor_frames(profile: str = "idle", rate: float = DEFAULT_SENSOR_RATE, seed: Optional[int] = None,
+                       duration: Optional[float] = None) -> Iterator[Tuple[float, Tuple[float, float, float],
+                                                                           Tuple[float, float, float]]]:
+    """
+    逐帧惰性生成单个设备的传感器数据
+
+    Args:
+        profile: 运动模式，见 SENSOR_PROFILES
+        rate: 采样频率（Hz）
+        seed: 随机种子
+        duration: 模拟时长（秒），None表示无限生成
+
+    Yields:
+        Tuple: (时间戳, (加速度x, y, z), (角速度x, y, z))
+    """
+    trajectory = SensorTrajectory(profile, 1, rate, seed)
+    total = None if duration is None else int(round(duration * rate))
+    emitted = 0
+    for timestamps, acceleration, gyroscope in trajectory:
+        for k in range(len(timestamps)):
+            if total is not None and emitted >= total:
+                return
+            yield float(timestamps[k]), tuple(acceleration[0, k].tolist()), tuple(gyroscope[0, k].tolist())
+            emitted += 1
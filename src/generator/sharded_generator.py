@@ -0,0 +1,159 @@
+"""多进程分片生成设备信息"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.core.models import DeviceBatch, DeviceInfo
+from src.generator.batch_generator import apply_snr_allocator, enforce_uniqueness, generate_device_batch
+from src.utils.counter_rng import CounterRNG
+
+
+# 每个分片的设备数量。每个设备的随机数只取决于 (主种子, 设备序号)，
+# 分片大小和进程数只影响并行方式，不影响生成结果
+SHARD_SIZE = 100_000
+
+
+def new_master_seed() -> int:
+    """生成一个新的随机主种子"""
+    return int(np.random.SeedSequence().entropy)
+
+
+def retry_rng(master_seed: int) -> np.random.Generator:
+    """由主种子派生重新生成重复行时使用的随机数生成器"""
+    return np.random.default_rng(np.random.SeedSequence(master_seed))
+
+
+def generate_device_range(
+    master_seed: int,
+    start: int,
+    stop: int,
+    model: Optional[str] = None,
+    region: Optional[str] = None,
+    carrier: Optional[str] = None,
+) -> DeviceBatch:
+    """
+    生成指定主种子下序号为 [start, stop) 的设备
+
+    使用基于计数器的随机数生成器，开销只与范围大小有关，与start无关。
+
+    Args:
+        master_seed: 主种子
+        start: 起始设备序号（从0开始）
+        stop: 结束设备序号（不包含）
+        model: 指定设备型号
+        region: 指定区域
+        carrier: 指定运营商
+
+    Returns:
+        DeviceBatch: 设备信息批次
+    """
+    rng = CounterRNG(master_seed, np.arange(start, stop, dtype=np.uint64))
+    return generate_device_batch(rng, stop - start, model, region, carrier)
+
+
+def generate_device_info_at(
+    master_seed: int,
+    index: int,
+    model: Optional[str] = None,
+    region: Optional[str] = None,
+    carrier: Optional[str] = None,
+) -> DeviceInfo:
+    """
+    直接生成指定主种子下第index个设备，结果与完整运行中的对应设备相同
+
+    SNR分配器和唯一性索引是有状态的，使用它们的运行中被改写的标识无法通过此函数重建。
+
+    Args:
+        master_seed: 主种子
+        index: 设备序号（从0开始）
+        model: 指定设备型号
+        region: 指定区域
+        carrier: 指定运营商
+
+    Returns:
+        DeviceInfo: 设备信息对象
+    """
+    return generate_device_range(master_seed, index, index + 1, model, region, carrier).device_info(0)
+
+
+def assign_identifiers(
+    batch: DeviceBatch,
+    rng: np.random.Generator,
+    model: Optional[str] = None,
+    region: Optional[str] = None,
+    carrier: Optional[str] = None,
+    snr_allocator=None,
+    uniqueness_index=None,
+) -> None:
+    """
+    在当前进程中为分片批次分配SNR并进行唯一性检查（原地修改批次）
+
+    分配器和唯一性索引是有状态的，必须在合并分片的进程中按分片顺序调用。
+
+    Args:
+        batch: 分片的设备信息批次
+        rng: 重新生成重复行使用的随机数生成器
+        model: 指定设备型号
+        region: 指定区域
+        carrier: 指定运营商
+        snr_allocator: SNR分配器
+        uniqueness_index: 唯一性索引
+    """
+    if snr_allocator:
+        apply_snr_allocator(batch, snr_allocator)
+    if uniqueness_index:
+        enforce_uniqueness(
+            batch,
+            uniqueness_index,
+            lambda count: generate_device_batch(rng, count, model, region, carrier),
+            snr_allocator,
+        )
+
+
+def iter_shards(count: int, shard_size: int = SHARD_SIZE) -> Iterator[Tuple[int, int]]:
+    """按顺序返回每个分片的 (起始设备序号, 结束设备序号)"""
+    for start in range(0, count, shard_size):
+        yield start, min(start + shard_size, count)
+
+
+def _generate_shard_task(args) -> DeviceBatch:
+    return generate_device_range(*args)
+
+
+def generate_sharded_batch(
+    count: int,
+    master_seed: int,
+    workers: int = 1,
+    model: Optional[str] = None,
+    region: Optional[str] = None,
+    carrier: Optional[str] = None,
+    shard_size: int = SHARD_SIZE,
+) -> DeviceBatch:
+    """
+    按分片生成设备信息，可使用多进程并行
+
+    Args:
+        count: 生成数量
+        master_seed: 主种子
+        workers: 工作进程数，1表示在当前进程中串行生成
+        model: 指定设备型号
+        region: 指定区域
+        carrier: 指定运营商
+        shard_size: 每个分片的设备数量
+
+    Returns:
+        DeviceBatch: 按分片顺序合并后的设备信息批次
+    """
+    tasks = [
+        (master_seed, start, stop, model, region, carrier)
+        for start, stop in iter_shards(count, shard_size)
+    ]
+
+    if workers <= 1 or len(tasks) <= 1:
+        return DeviceBatch.concat([_generate_shard_task(task) for task in tasks])
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map按提交顺序返回结果，保证合并顺序与串行一致
+        return DeviceBatch.concat(list(executor.map(_generate_shard_task, tasks)))
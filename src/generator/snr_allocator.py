@@ -0,0 +1,119 @@
+"""IMEI序列号（SNR）无碰撞分配器"""
+
+import json
+import os
+import secrets
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.utils.hash_utils import mix64
+
+
+# SNR为6位数字，共10^6个取值
+SNR_SPACE = 1_000_000
+# Feistel网络左右两半的取值范围，_HALF * _HALF == SNR_SPACE
+_HALF = 1_000
+FEISTEL_ROUNDS = 8
+
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+
+class FeistelPermutation:
+    """
+    [0, 10^6) 上的带密钥伪随机置换
+
+    使用平衡Feistel网络，左右两半各取值于 [0, 1000)，每一轮都是可逆变换，
+    因此整体是定义域上的一一映射，无需额外的循环遍历（cycle walking）。
+    """
+
+    def __init__(self, key: int, rounds: int = FEISTEL_ROUNDS):
+        with np.errstate(over="ignore"):
+            seeds = np.uint64(key) + np.arange(1, rounds + 1, dtype=np.uint64) * _GOLDEN_GAMMA
+        self.round_keys = mix64(seeds)
+
+    def permute(self, values) -> np.ndarray:
+        """
+        计算置换后的值
+
+        Args:
+            values: [0, 10^6) 内的整数或整数数组
+
+        Returns:
+            np.ndarray: 置换后的值
+        """
+        left, right = np.divmod(np.asarray(values, dtype=np.int64), _HALF)
+        for round_key in self.round_keys:
+            f = (mix64(right.astype(np.uint64) ^ round_key) % np.uint64(_HALF)).astype(np.int64)
+            left, right = right, (left + f) % _HALF
+        return left * _HALF + right
+
+
+class SNRAllocator:
+    """
+    按TAC分配不重复的SNR
+
+    每个TAC按计数器顺序遍历一个带密钥的伪随机置换，第i次分配得到 permute(i)。
+    只需为每个TAC保存一个计数器即可保证不重复，且可以跨运行续接。
+    """
+
+    def __init__(self, key: Optional[int] = None, counters: Optional[Dict[str, int]] = None):
+        self.key = secrets.randbits(64) if key is None else key % (1 << 64)
+        self.counters = dict(counters or {})
+        self._permutations = {}
+
+    def _permutation(self, tac: str) -> FeistelPermutation:
+        permutation = self._permutations.get(tac)
+        if permutation is None:
+            tac_key = int(mix64(np.uint64(self.key) ^ np.uint64(int(tac)))[()])
+            permutation = self._permutations[tac] = FeistelPermutation(tac_key)
+        return permutation
+
+    def remaining(self, tac: str) -> int:
+        """返回指定TAC剩余可分配的SNR数量"""
+        return SNR_SPACE - self.counters.get(tac, 0)
+
+    def allocate(self, tac: str, count: int = 1) -> np.ndarray:
+        """
+        为指定TAC分配一组不重复的SNR
+
+        Args:
+            tac: 8位TAC码
+            count: 分配数量
+
+        Returns:
+            np.ndarray: SNR整数数组
+
+        Raises:
+            ValueError: 该TAC的SNR空间不足
+        """
+        start = self.counters.get(tac, 0)
+        if start + count > SNR_SPACE:
+            raise ValueError(f"TAC {tac} 的SNR空间不足：剩余 {SNR_SPACE - start} 个，需要 {count} 个")
+        self.counters[tac] = start + count
+        return self._permutation(tac).permute(np.arange(start, start + count))
+
+    @classmethod
+    def load(cls, filename: str, key: Optional[int] = None) -> "SNRAllocator":
+        """
+        从状态文件加载分配器，文件不存在时创建新的分配器
+
+        Args:
+            filename: 状态文件名
+            key: 新建分配器时使用的密钥，为None则随机生成
+
+        Returns:
+            SNRAllocator: SNR分配器
+        """
+        if not os.path.exists(filename):
+            return cls(key)
+        with open(filename, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return cls(state["key"], state.get("counters"))
+
+    def save(self, filename: str):
+        """将密钥和计数器保存到状态文件（先写临时文件再替换，避免写入中断损坏状态）"""
+        temp_filename = f"{filename}.tmp"
+        with open(temp_filename, "w", encoding="utf-8") as f:
+            json.dump({"key": self.key, "counters": self.counters}, f, indent=2, sort_keys=True)
+        os.replace(temp_filename, filename)
@@ -0,0 +1,286 @@
+"""持久化的设备标识唯一性索引"""
+
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from src.generator.snr_allocator import SNR_SPACE
+from src.utils.hash_utils import mix64
+
+
+# 使用哈希集合记录的字段
+HASHED_FIELDS = ("imsi", "phone_number", "mac_address")
+
+# 哈希表文件头：容量、已用槽位数
+_HEADER_WORDS = 2
+DEFAULT_CAPACITY = 1 << 20
+MAX_LOAD_FACTOR = 0.5
+
+# 扩容时每次从旧表读取的槽位数
+REHASH_CHUNK_SLOTS = 1 << 20
+
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def hash_column(values: np.ndarray) -> np.ndarray:
+    """
+    计算字节串列的64位哈希（FNV-1a后再做一次64位混合），结果保证非0
+
+    Args:
+        values: 字节串数组（S类型）
+
+    Returns:
+        np.ndarray: uint64哈希数组
+    """
+    values = np.ascontiguousarray(values, dtype=f"S{max(values.dtype.itemsize, 1)}")
+    matrix = values.view(np.uint8).reshape(len(values), -1)
+    hashes = np.full(len(values), _FNV_OFFSET, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for column in matrix.T:
+            hashes ^= column
+            hashes *= _FNV_PRIME
+    hashes = mix64(hashes)
+    hashes[hashes == 0] = 1  # 0表示空槽位
+    return hashes
+
+
+def _repeated(keys: np.ndarray) -> np.ndarray:
+    """标记批次内除第一次出现以外的重复值"""
+    repeated = np.ones(len(keys), dtype=bool)
+    repeated[np.unique(keys, return_index=True)[1]] = False
+    return repeated
+
+
+class _FileLock:
+    """基于文件的进程间互斥锁"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.filename, "a+b")
+        if fcntl:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if fcntl:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+        self._file = None
+
+
+class _HashedSet:
+    """
+    基于内存映射文件的开放寻址哈希集合（线性探测）
+
+    只映射文件而不读入内存，查询与插入只触及被探测到的页面。
+    """
+
+    def __init__(self, filename: str, initial_capacity: int = DEFAULT_CAPACITY):
+        self.filename = filename
+        self.initial_capacity = initial_capacity
+        self._table = None
+        self._inode = None
+
+    def _map(self):
+        """映射哈希表文件；其他进程扩容替换了文件时重新映射"""
+        if not os.path.exists(self.filename):
+            self._create(self.filename, self.initial_capacity, None)
+        inode = os.stat(self.filename).st_ino
+        if self._table is None or inode != self._inode:
+            self._table = np.memmap(self.filename, dtype=np.uint64, mode="r+")
+            self._inode = inode
+        return self._table
+
+    @staticmethod
+    def _create(filename: str, capacity: int, old_table: Optional[np.ndarray], keys: Optional[np.ndarray] = None):
+        """
+        创建容量为 capacity 的哈希表文件
+
+        提供 old_table 时，把其中的键按块重新插入新表（每次只读取 REHASH_CHUNK_SLOTS 个槽位，
+        历史数据不会整体读入内存），再插入 keys。
+        """
+        temp_filename = f"{filename}.tmp"
+        table = np.memmap(temp_filename, dtype=np.uint64, mode="w+", shape=(_HEADER_WORDS + capacity,))
+        table[0] = capacity
+        slots = table[_HEADER_WORDS:]
+        count = 0
+        if old_table is not None:
+            old_slots = old_table[_HEADER_WORDS:]
+            for start in range(0, len(old_slots), REHASH_CHUNK_SLOTS):
+                chunk = np.array(old_slots[start:start + REHASH_CHUNK_SLOTS])
+                chunk = chunk[chunk != 0]
+                _HashedSet._insert(slots, chunk)
+                count += len(chunk)
+        if keys is not None and len(keys):
+            _HashedSet._insert(slots, keys)
+            count += len(keys)
+        table[1] = count
+        table.flush()
+        del slots, table
+        os.replace(temp_filename, filename)
+
+    @staticmethod
+    def _insert(slots: np.ndarray, keys: np.ndarray):
+        """插入不在表中且互不相同的键"""
+        mask = np.uint64(len(slots) - 1)
+        positions = keys & mask
+        while len(keys):
+            empty = np.flatnonzero(slots[positions] == 0)
+            # 多个键探测到同一个空槽位时，只有第一个写入，其余继续探测
+            winners = empty[np.unique(positions[empty], return_index=True)[1]]
+            slots[positions[winners]] = keys[winners]
+            remaining = np.ones(len(keys), dtype=bool)
+            remaining[winners] = False
+            keys = keys[remaining]
+            positions = (positions[remaining] + np.uint64(1)) & mask
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        """逐个判断键是否已在集合中"""
+        slots = self._map()[_HEADER_WORDS:]
+        mask = np.uint64(len(slots) - 1)
+        found = np.zeros(len(keys), dtype=bool)
+        active = np.arange(len(keys))
+        positions = keys & mask
+        while len(active):
+            stored = slots[positions]
+            hit = stored == keys[active]
+            found[active[hit]] = True
+            pending = ~(hit | (stored == 0))
+            active = active[pending]
+            positions = (positions[pending] + np.uint64(1)) & mask
+        return found
+
+    def add(self, keys: np.ndarray):
+        """批量插入不在集合中且互不相同的键，装载因子过高时扩容"""
+        table = self._map()
+        capacity, count = int(table[0]), int(table[1])
+        if (count + len(keys)) > capacity * MAX_LOAD_FACTOR:
+            # 扩容时按块把已有键重新插入新表，容量按倍数增长，摊还开销很小
+            while (count + len(keys)) > capacity * MAX_LOAD_FACTOR:
+                capacity *= 2
+            self._create(self.filename, capacity, table, keys)
+            return
+        self._insert(table[_HEADER_WORDS:], keys)
+        table[1] = count + len(keys)
+        table.flush()
+
+
+class _SNRBitset:
+    """单个TAC的SNR位图，10^6位共125000字节"""
+
+    def __init__(self, filename: str):
+        if not os.path.exists(filename):
+            with open(filename, "wb") as f:
+                f.truncate(SNR_SPACE // 8)
+        self.bits = np.memmap(filename, dtype=np.uint8, mode="r+")
+
+    def contains(self, snr: np.ndarray) -> np.ndarray:
+        return (self.bits[snr >> 3] >> (snr & 7).astype(np.uint8)) & 1 == 1
+
+    def add(self, snr: np.ndarray):
+        np.bitwise_or.at(self.bits, snr >> 3, (np.uint8(1) << (snr & 7).astype(np.uint8)))
+        self.bits.flush()
+
+
+class UniquenessIndex:
+    """
+    跨运行的设备标识唯一性索引
+
+    IMEI按TAC分别记录在SNR位图中，IMSI、手机号和MAC地址记录在哈希集合中，
+    所有文件都通过内存映射访问，查询为O(1)且无需把历史数据读入内存。
+    每次批量登记都持有目录级文件锁，多个生成进程可以同时追加。
+    """
+
+    def __init__(self, directory: str, initial_capacity: int = DEFAULT_CAPACITY):
+        self.directory = directory
+        os.makedirs(os.path.join(directory, "snr"), exist_ok=True)
+        self._lock_filename = os.path.join(directory, "index.lock")
+        self._sets = {
+            name: _HashedSet(os.path.join(directory, f"{name}.set"), initial_capacity)
+            for name in HASHED_FIELDS
+        }
+        self._bitsets: Dict[str, _SNRBitset] = {}
+
+    def _bitset(self, tac: str) -> _SNRBitset:
+        bitset = self._bitsets.get(tac)
+        if bitset is None:
+            bitset = self._bitsets[tac] = _SNRBitset(os.path.join(self.directory, "snr", f"{tac}.bits"))
+        return bitset
+
+    def claim_columns(self, imei: np.ndarray, imsi: np.ndarray, phone_number: np.ndarray,
+                      mac_address: np.ndarray) -> np.ndarray:
+        """
+        检查并登记一批设备标识
+
+        任一标识已被历史记录或同批次中更早的行使用的行视为重复，不会被登记；
+        其余行的全部标识在同一把锁内登记。
+
+        Args:
+            imei: IMEI列（字节串数组）
+            imsi: IMSI列
+            phone_number: 手机号列
+            mac_address: MAC地址列
+
+        Returns:
+            np.ndarray: 布尔数组，True表示该行存在重复标识，需要重新生成
+        """
+        digits = np.ascontiguousarray(imei, dtype="S15").view(np.uint8).reshape(-1, 15) - ord("0")
+        tac_values = digits[:, :8].astype(np.int64) @ (10 ** np.arange(7, -1, -1, dtype=np.int64))
+        snr = digits[:, 8:14].astype(np.int64) @ (10 ** np.arange(5, -1, -1, dtype=np.int64))
+        hashed = {
+            "imsi": hash_column(imsi),
+            "phone_number": hash_column(phone_number),
+            "mac_address": hash_column(mac_address),
+        }
+
+        with _FileLock(self._lock_filename):
+            duplicates = _repeated(tac_values * SNR_SPACE + snr)
+            tac_rows = {f"{tac:08d}": tac_values == tac for tac in np.unique(tac_values)}
+            for tac, rows in tac_rows.items():
+                duplicates[rows] |= self._bitset(tac).contains(snr[rows])
+            for name, keys in hashed.items():
+                duplicates |= _repeated(keys) | self._sets[name].contains(keys)
+
+            accepted = ~duplicates
+            for tac, rows in tac_rows.items():
+                rows = rows & accepted
+                if rows.any():
+                    self._bitset(tac).add(snr[rows])
+            if accepted.any():
+                for name, keys in hashed.items():
+                    self._sets[name].add(keys[accepted])
+        return duplicates
+
+    def claim_batch(self, batch) -> np.ndarray:
+        """检查并登记DeviceBatch中的设备标识，返回重复行的布尔数组"""
+        return self.claim_columns(*(batch.columns[name] for name in ("imei",) + HASHED_FIELDS))
+
+    def claim_device_info(self, device_info) -> bool:
+        """
+        检查并登记单个设备的标识
+
+        Returns:
+            bool: 标识全部未被使用且已登记时返回True
+        """
+        columns = [
+            np.array([getattr(device_info, name).encode("utf-8")])
+            for name in ("imei",) + HASHED_FIELDS
+        ]
+        return not self.claim_columns(*columns)[0]
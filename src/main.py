@@ -1,69 +1,145 @@
 """设备信息模拟与配置执行系统主程序"""
 
-import json
+from __future__ import annotations
+
 import argparse
-from typing import List
-from .generator.device_info_generator import DeviceInfoGenerator
-from .executor.dg_command_generator import DGCommandGenerator
-from .core.models import DeviceInfo
+import time
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple
 from .executor.ssh_executor import SSHExecutor
+from .executor.prop_bundle import PropBundle, remote_prop_path
+from .executor.fleet_executor import (DeviceResult, DeviceTask, FleetExecutor, FleetHost, load_inventory,
+                                     run_device_task)
+from .executor.deployment_journal import DEFAULT_JOURNAL_DIR, DeploymentJournal
+from .generator.sensor_profiles import DEFAULT_SENSOR_RATE, SENSOR_PROFILES
+from .output.formats import DEVICE_FORMATS
+
+# 生成、渲染和写入模块都依赖NumPy（导入约150 ms），在用到时才导入，
+# 与paramiko一样，--help 和参数错误等不生成设备的调用无需承担这部分启动开销
+if TYPE_CHECKING:
+    from .core.models import DeviceBatch, DeviceInfo
+    from .executor.dg_command_generator import DGCommandGenerator
+    from .generator.snr_allocator import SNRAllocator
+    from .generator.uniqueness_index import UniquenessIndex
+
+
+# 记录在部署日志中、恢复时原样沿用的参数：决定设备信息、输出文件和执行方式
+JOURNAL_PARAMS = ("count", "model", "region", "carrier", "seed", "format", "output", "commands_file", "prop_dir",
+                  "bulk", "pipeline", "stream")
 
+# 记录在部署日志中的连接参数（不含密码），恢复时未指定SSH主机和主机清单才沿用
+JOURNAL_CONNECTION_PARAMS = ("inventory", "ssh_host", "ssh_port", "ssh_username")
 
-def generate_device_info_batch(count: int, model: str = None, region: str = None, carrier: str = None) -> List[DeviceInfo]:
+
+def generate_device_info_batch(count: int, model: str = None, region: str = None, carrier: str = None,
+                               seed: int = None, workers: int = 1,
+                               snr_allocator: Optional[SNRAllocator] = None,
+                               uniqueness_index: Optional[UniquenessIndex] = None) -> DeviceBatch:
     """
-    批量生成设备信息
+    以列式方式批量生成设备信息
+    
+    指定主种子或多个工作进程时按分片生成，相同主种子下，无论工作进程数是多少，结果都完全相同。
     
     Args:
         count: 生成数量
         model: 指定设备型号
         region: 指定区域
         carrier: 指定运营商
+        seed: 主种子
+        workers: 工作进程数
+        snr_allocator: SNR分配器，提供时IMEI的SNR保证不重复
+        uniqueness_index: 唯一性索引，提供时生成的标识与历史运行不重复
         
     Returns:
-        List[DeviceInfo]: 设备信息列表
+        DeviceBatch: 设备信息批次
     """
-    generator = DeviceInfoGenerator()
-    device_info_list = []
+    from .generator.device_info_generator import DeviceInfoGenerator
+    from .generator.sharded_generator import assign_identifiers, generate_sharded_batch, new_master_seed, retry_rng
     
-    for _ in range(count):
-        device_info = generator.generate_device_info(model, region, carrier)
-        device_info_list.append(device_info)
+    if seed is not None or workers > 1:
+        if seed is None:
+            seed = new_master_seed()
+        batch = generate_sharded_batch(count, seed, workers, model, region, carrier)
+        assign_identifiers(batch, retry_rng(seed), model, region, carrier, snr_allocator, uniqueness_index)
+        return batch
     
-    return device_info_list
+    generator = DeviceInfoGenerator(snr_allocator=snr_allocator, uniqueness_index=uniqueness_index)
+    return generator.generate_batch(count, model, region, carrier)
 
 
-def save_device_info_to_json(device_info_list: List[DeviceInfo], filename: str):
+def save_device_info_to_json(batch: DeviceBatch, filename: str, output_format: str = "json"):
     """
     将设备信息保存为JSON文件
     
+    直接从列式批次按块编码写入，不创建DeviceInfo对象。
+    
     Args:
-        device_info_list: 设备信息列表
+        batch: 设备信息批次
         filename: 保存的文件名
+        output_format: 输出格式，json（JSON数组）、json-compact（紧凑JSON数组）、jsonl（JSON Lines）、bin 或 parquet
     """
-    data = [device_info.to_dict() for device_info in device_info_list]
+    from .output.stream_writers import open_device_writer
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open_device_writer(filename, output_format) as writer:
+        writer.write_batch(batch)
     
     print(f"设备信息已保存到 {filename}")
 
 
-def generate_dg_commands(device_info_list: List[DeviceInfo]) -> List[List[str]]:
+def generate_dg_commands(device_info_list: List[DeviceInfo], seed: Optional[int] = None) -> List[List[str]]:
     """
     生成DG命令
     
     Args:
         device_info_list: 设备信息列表
+        seed: 主种子，指定后序列号、ICCID和电量可复现
         
     Returns:
         List[List[str]]: DG命令列表的列表
     """
-    command_generator = DGCommandGenerator()
+    from .executor.dg_command_generator import DGCommandGenerator
+    
+    command_generator = DGCommandGenerator(seed)
     commands_list = command_generator.generate_commands_batch(device_info_list)
     
     return commands_list
 
 
+def generate_prop_bundles(device_info_list: List[DeviceInfo], seed: Optional[int] = None) -> List[PropBundle]:
+    """
+    生成每个设备的prop文件
+    
+    Args:
+        device_info_list: 设备信息列表
+        seed: 主种子，指定后序列号、ICCID和电量可复现
+        
+    Returns:
+        List[PropBundle]: 每个设备的prop文件及其余命令
+    """
+    from .executor.dg_command_generator import DGCommandGenerator
+    
+    command_generator = DGCommandGenerator(seed)
+    return [command_generator.generate_prop_bundle(device_info, i) for i, device_info in enumerate(device_info_list)]
+
+
+def save_prop_bundles(bundles: List[PropBundle], filename: str, prop_dir: str):
+    """
+    将prop文件保存到目录，应用命令保存到命令文件
+    
+    Args:
+        bundles: 每个设备的prop文件及其余命令
+        filename: 命令文件名
+        prop_dir: prop文件目录
+    """
+    from .output.stream_writers import PropBundleWriter
+    
+    with PropBundleWriter(filename, prop_dir) as writer:
+        for bundle in bundles:
+            writer.write_bundle(bundle)
+    
+    print(f"prop文件已保存到 {prop_dir}")
+    print(f"DG命令已保存到 {filename}")
+
+
 def save_commands_to_file(commands_list: List[List[str]], filename: str):
     """
     将DG命令保存到文件
@@ -72,17 +148,17 @@ def save_commands_to_file(commands_list: List[List[str]], filename: str):
         commands_list: DG命令列表
         filename: 保存的文件名
     """
-    with open(filename, 'w', encoding='utf-8') as f:
-        for i, commands in enumerate(commands_list):
-            f.write(f"# 设备 {i+1} 的DG命令\n")
-            for command in commands:
-                f.write(f"{command}\n")
-            f.write("\n")
+    from .output.stream_writers import CommandsFileWriter
+    
+    with CommandsFileWriter(filename) as writer:
+        for commands in commands_list:
+            writer.write(commands)
     
     print(f"DG命令已保存到 {filename}")
 
 
-def execute_commands_via_ssh(host: str, port: int, username: str, password: str, commands_list: List[List[str]]):
+def execute_commands_via_ssh(host: str, port: int, username: str, password: str, commands_list: List[List[str]],
+                             pipelined: bool = False, journal: Optional[DeploymentJournal] = None):
     """
     通过SSH执行命令
     
@@ -92,8 +168,10 @@ def execute_commands_via_ssh(host: str, port: int, username: str, password: str,
         username: 用户名
         password: 密码
         commands_list: 要执行的命令列表
+        pipelined: 是否在持久的shell通道中流水线执行每个设备的命令
+        journal: 部署日志，提供时跳过已成功的设备并记录每个设备的执行结果
     """
-    executor = SSHExecutor()
+    executor = SSHExecutor(pipelined)
     
     if not executor.connect(host, port, username, password):
         print("SSH连接失败")
@@ -101,22 +179,218 @@ def execute_commands_via_ssh(host: str, port: int, username: str, password: str,
     
     print(f"已连接到 {host}:{port}")
     
-    for i, commands in enumerate(commands_list):
-        print(f"\n执行设备 {i+1} 的命令:")
+    jobs = enumerate(commands_list, 1)
+    for device_number, commands in (journal.pending(jobs) if journal else jobs):
+        print(f"\n执行设备 {device_number} 的命令:")
         results = executor.execute_commands(commands)
-        
-        for j, (success, stdout, stderr) in enumerate(results):
-            if success:
-                print(f"  命令 {j+1}: 成功")
-                if stdout.strip():
-                    print(f"    输出: {stdout.strip()}")
-            else:
-                print(f"  命令 {j+1}: 失败 - {stderr}")
+        print_command_results(results)
+        if journal:
+            journal.record_device(device_number, results)
     
     executor.disconnect()
     print("SSH连接已断开")
 
 
+def execute_prop_bundles_via_ssh(host: str, port: int, username: str, password: str, bundles: List[PropBundle],
+                                 pipelined: bool = False, journal: Optional[DeploymentJournal] = None):
+    """
+    通过SSH上传并应用每个设备的prop文件
+    
+    每个设备只需一次上传并应用prop文件的调用，再加上少量 dg geo / dg sensor 命令。
+    
+    Args:
+        host: SSH主机地址
+        port: SSH端口
+        username: 用户名
+        password: 密码
+        bundles: 每个设备的prop文件及其余命令
+        pipelined: 是否在持久的shell通道中流水线执行其余命令
+        journal: 部署日志，提供时跳过已成功的设备并记录每个设备的执行结果
+    """
+    executor = SSHExecutor(pipelined)
+    
+    if not executor.connect(host, port, username, password):
+        print("SSH连接失败")
+        return
+    
+    print(f"已连接到 {host}:{port}")
+    
+    jobs = enumerate(bundles, 1)
+    for device_number, bundle in (journal.pending(jobs) if journal else jobs):
+        print(f"\n应用设备 {device_number} 的prop文件:")
+        results = executor.apply_prop_bundle(bundle, remote_prop_path(device_number))
+        print_command_results(results)
+        if journal:
+            journal.record_device(device_number, results)
+    
+    executor.disconnect()
+    print("SSH连接已断开")
+
+
+def fleet_hosts(args) -> Optional[List[FleetHost]]:
+    """
+    命令行参数对应的主机列表
+    
+    指定了主机清单时读取清单；批量模式下单台SSH主机也作为只有一台主机的清单处理；否则返回None。
+    """
+    if args.inventory:
+        return load_inventory(args.inventory, args.ssh_username, args.ssh_password, args.ssh_port)
+    if args.bulk and args.ssh_host and args.ssh_username and args.ssh_password:
+        return [FleetHost(args.ssh_host, args.ssh_username, args.ssh_password, args.ssh_port)]
+    return None
+
+
+def has_ssh_target(args) -> bool:
+    """命令行参数中是否提供了主机清单或完整的SSH信息（即是否需要执行命令）"""
+    return bool(args.inventory or (args.ssh_host and args.ssh_username and args.ssh_password))
+
+
+def restore_journal_params(args, params: dict):
+    """
+    用部署日志中记录的运行参数覆盖命令行参数
+    
+    生成和输出参数总是沿用日志中的值，保证重建的设备信息与中断的运行相同；
+    连接参数只在命令行未指定SSH主机和主机清单时沿用。
+    """
+    for name in JOURNAL_PARAMS:
+        setattr(args, name, params[name])
+    if not args.ssh_host and not args.inventory:
+        for name in JOURNAL_CONNECTION_PARAMS:
+            setattr(args, name, params.get(name))
+
+
+def execute_via_fleet(fleet: FleetExecutor, jobs: Iterable[Tuple[int, DeviceTask]], bulk: bool = False,
+                      journal: Optional[DeploymentJournal] = None):
+    """
+    按主机清单并行执行设备任务，按完成顺序打印每个设备的结果
+    
+    Args:
+        fleet: 多主机并行执行器
+        jobs: (设备序号, 命令列表或PropBundle) 的迭代器
+        bulk: 是否使用批量模式（每台主机按批上传并应用prop文件，任务必须为PropBundle）
+        journal: 部署日志，提供时跳过已成功的设备并记录每个设备的执行结果
+    """
+    print(f"正在通过 {len(fleet.hosts)} 台主机并行执行（{fleet.max_workers} 个并发连接）...")
+    start = time.perf_counter()
+    succeeded = failed = 0
+    if journal:
+        jobs = journal.pending(jobs)
+    for result in (fleet.run_bulk(jobs) if bulk else fleet.run(jobs)):
+        print_device_result(result)
+        if journal:
+            journal.record_device(result.device_number, result.results, result.error)
+        if result.success:
+            succeeded += 1
+        else:
+            failed += 1
+    print(f"\n执行完成：成功 {succeeded} 个设备，失败 {failed} 个设备，耗时 {time.perf_counter() - start:.1f} 秒")
+
+
+def print_device_result(result: DeviceResult):
+    """打印多主机并行执行时单个设备的结果"""
+    print(f"\n设备 {result.device_number}（{result.host}）:")
+    if result.error:
+        print(f"  未执行 - {result.error}")
+    else:
+        print_command_results(result.results)
+
+
+def print_command_results(results: List[Tuple[bool, str, str]]):
+    """
+    打印单个设备的命令执行结果
+    
+    Args:
+        results: 每个命令的执行结果列表
+    """
+    for j, (success, stdout, stderr) in enumerate(results):
+        if success:
+            print(f"  命令 {j+1}: 成功")
+            if stdout.strip():
+                print(f"    输出: {stdout.strip()}")
+        else:
+            print(f"  命令 {j+1}: 失败 - {stderr}")
+
+
+def _iter_device_jobs(device_stream: Iterable[DeviceBatch], device_writer, commands_writer,
+                      command_generator: DGCommandGenerator, prop_dir: Optional[str],
+                      with_tasks: bool) -> Iterator[Tuple[int, Optional[DeviceTask]]]:
+    """按块写入设备信息，再逐个写入DG命令（或prop文件），并返回 (设备序号, 需执行的任务)"""
+    for chunk in device_stream:
+        device_writer.write_batch(chunk)
+        for device_info in chunk.to_compact_list():
+            index = commands_writer.count
+            yield index + 1, _write_device_task(device_info, index, commands_writer, command_generator, prop_dir,
+                                                with_tasks)
+
+
+def _write_device_task(device_info, index: int, commands_writer, command_generator: DGCommandGenerator,
+                       prop_dir: Optional[str], with_tasks: bool) -> Optional[DeviceTask]:
+    """写入一个设备的DG命令（或prop文件），返回需执行的任务"""
+    if prop_dir:
+        task = command_generator.generate_prop_bundle(device_info, index)
+        commands_writer.write_bundle(task)
+    elif with_tasks:
+        task = command_generator.generate_commands(device_info, index)
+        commands_writer.write(task)
+    else:
+        # 不需要执行时直接写入渲染好的命令文本
+        commands_writer.write_text(command_generator.generate_commands_text(device_info, index))
+        task = None
+    return task
+
+
+def stream_device_info_to_files(device_stream: Iterable[DeviceBatch], output: str, commands_file: str,
+                                output_format: str = "json", executor: Optional[SSHExecutor] = None,
+                                prop_dir: Optional[str] = None, fleet: Optional[FleetExecutor] = None,
+                                bulk: bool = False, journal: Optional[DeploymentJournal] = None,
+                                seed: Optional[int] = None) -> int:
+    """
+    流式处理设备信息：设备信息按块写入，DG命令逐条生成并增量写入文件
+    
+    整个过程中只保留当前块的数据，内存占用与生成数量无关。
+    
+    Args:
+        device_stream: 设备信息批次迭代器（如 iter_device_chunks 的结果）
+        output: 设备信息输出文件名
+        commands_file: DG命令输出文件名
+        output_format: 设备信息输出格式，json、json-compact 或 jsonl
+        executor: 已连接的SSH执行器，提供时逐设备执行命令
+        prop_dir: prop文件目录，提供时每个设备的配置写入一个prop文件（prop打包模式）
+        fleet: 多主机并行执行器，提供时设备边生成边提交到各主机并行执行
+        bulk: 是否使用批量模式执行（需同时提供 prop_dir 和 fleet）
+        journal: 部署日志，提供时跳过已成功的设备并记录每个设备的执行结果（已成功的设备仍会写入文件）
+        seed: 主种子，指定后序列号、ICCID和电量可复现
+        
+    Returns:
+        int: 处理的设备数量
+    """
+    from .executor.dg_command_generator import DGCommandGenerator
+    from .output.stream_writers import CommandsFileWriter, PropBundleWriter, open_device_writer
+    
+    command_generator = DGCommandGenerator(seed)
+    commands_writer = PropBundleWriter(commands_file, prop_dir) if prop_dir else CommandsFileWriter(commands_file)
+    
+    with open_device_writer(output, output_format) as device_writer, commands_writer:
+        jobs = _iter_device_jobs(device_stream, device_writer, commands_writer, command_generator, prop_dir,
+                                 with_tasks=executor is not None or fleet is not None)
+        if fleet:
+            execute_via_fleet(fleet, jobs, bulk, journal)
+        else:
+            for device_number, task in jobs:
+                if executor and (journal is None or device_number not in journal.completed):
+                    print(f"\n{'应用设备' if prop_dir else '执行设备'} {device_number} 的{'prop文件' if prop_dir else '命令'}:")
+                    results = run_device_task(executor, device_number, task)
+                    print_command_results(results)
+                    if journal:
+                        journal.record_device(device_number, results)
+    
+    print(f"设备信息已保存到 {output}")
+    if prop_dir:
+        print(f"prop文件已保存到 {prop_dir}")
+    print(f"DG命令已保存到 {commands_file}")
+    return device_writer.count
+
+
 def main():
     parser = argparse.ArgumentParser(description="设备信息模拟与配置执行系统")
     parser.add_argument("-n", "--count", type=int, default=10, help="生成设备信息的数量")
@@ -128,34 +402,127 @@ def main():
     parser.add_argument("--ssh-port", type=int, default=22, help="SSH端口")
     parser.add_argument("--ssh-username", type=str, help="SSH用户名")
     parser.add_argument("--ssh-password", type=str, help="SSH密码")
+    parser.add_argument("--inventory", type=str, help="主机清单文件（JSON），指定后按清单在多台主机上并行执行")
+    parser.add_argument("--pipeline", action="store_true", help="在每个连接的持久shell通道中流水线执行命令，不再逐条建立通道和等待")
+    parser.add_argument("--bulk", action="store_true", help="批量模式：每台主机的prop文件打包为一个tar流在一个通道中上传，再在一个shell通道中依次应用（需指定--prop-dir）")
     parser.add_argument("--commands-file", type=str, default="dg_commands.txt", help="DG命令输出文件名")
+    parser.add_argument("--prop-dir", type=str, help="prop文件目录，指定后每个设备的配置写入一个prop文件，只需一次 dg config 调用即可应用")
+    parser.add_argument("--seed", type=int, help="主种子，指定后生成结果可复现")
+    parser.add_argument("--workers", type=int, default=1, help="并行生成的工作进程数")
+    parser.add_argument("--format", type=str, default="json", choices=sorted(DEVICE_FORMATS), help="设备信息输出格式")
+    parser.add_argument("--stream", action="store_true", help="流式生成并增量写入文件，内存占用与数量无关（不打印设备摘要）")
+    parser.add_argument("--snr-state", type=str, help="SNR分配器状态文件，指定后IMEI序列号跨运行不重复")
+    parser.add_argument("--unique-index", type=str, help="唯一性索引目录，指定后IMEI/IMSI/手机号/MAC与历史运行不重复")
+    parser.add_argument("--sensor-profile", type=str, choices=sorted(SENSOR_PROFILES), help="传感器轨迹的运动模式，指定后生成周期性的传感器命令")
+    parser.add_argument("--sensor-rate", type=float, default=DEFAULT_SENSOR_RATE, help="传感器命令的更新频率（Hz）")
+    parser.add_argument("--sensor-duration", type=float, default=10.0, help="传感器轨迹的模拟时长（秒）")
+    parser.add_argument("--sensor-file", type=str, default="sensor_commands.txt", help="传感器命令输出文件名")
+    parser.add_argument("--journal-dir", type=str, default=DEFAULT_JOURNAL_DIR, help="部署日志目录，执行命令时记录每个设备的执行结果")
+    parser.add_argument("--resume", type=str, metavar="RUN_ID", help="继续指定运行ID的部署：按日志中的参数和主种子重建设备信息，只重新执行失败或未执行的设备")
     
     args = parser.parse_args()
+    from .generator.sharded_generator import new_master_seed
+    from .generator.snr_allocator import SNRAllocator
+    from .generator.uniqueness_index import UniquenessIndex
+    
+    journal = None
+    if args.resume:
+        if args.snr_state or args.unique_index:
+            # 分配器和索引会为重建的每个设备重新分配标识，已部署设备的标识将与输出文件不一致
+            parser.error("--resume 不能与 --snr-state / --unique-index 同时使用")
+        try:
+            journal = DeploymentJournal.resume(args.journal_dir, args.resume)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        if not journal.params.get("resumable", True):
+            parser.error(f"运行 {args.resume} 使用了 --snr-state 或 --unique-index，设备标识无法按主种子重建，不能恢复")
+        restore_journal_params(args, journal.params)
+        if not has_ssh_target(args):
+            parser.error("--resume 需要SSH信息或主机清单（部署日志中不记录密码，需重新指定 --ssh-password）")
+    elif has_ssh_target(args) and args.seed is None:
+        # 部署总是使用主种子，中断后才能按种子重建完全相同的设备信息
+        args.seed = new_master_seed()
+    if args.bulk and not args.prop_dir:
+        parser.error("--bulk 需要同时指定 --prop-dir")
+    
+    if args.workers > 1 and args.seed is None:
+        args.seed = new_master_seed()
+    if args.seed is not None:
+        print(f"主种子: {args.seed}")
     
+    if journal is None and has_ssh_target(args):
+        params = {name: getattr(args, name) for name in JOURNAL_PARAMS + JOURNAL_CONNECTION_PARAMS}
+        # SNR分配器和唯一性索引是有状态的，使用它们的运行只记录结果，不能恢复
+        params["resumable"] = not (args.snr_state or args.unique_index)
+        journal = DeploymentJournal.create(args.journal_dir, params)
+    if journal:
+        print(f"运行ID: {journal.run_id}（部署日志 {journal.filename}）")
+        if args.resume:
+            print(f"跳过已成功的 {len(journal.completed)} 个设备")
+    
+    snr_allocator = SNRAllocator.load(args.snr_state, args.seed) if args.snr_state else None
+    uniqueness_index = UniquenessIndex(args.unique_index) if args.unique_index else None
+    try:
+        if args.stream:
+            run_streaming(args, snr_allocator, uniqueness_index, journal)
+        else:
+            run_batch(args, snr_allocator, uniqueness_index, journal)
+        if args.sensor_profile:
+            run_sensor_stream(args)
+    finally:
+        # 即使运行中断也保存计数器，避免已分配的SNR在下次运行时被重复使用
+        if snr_allocator:
+            snr_allocator.save(args.snr_state)
+        if journal:
+            journal.close()
+            if len(journal.completed) < args.count:
+                print(f"\n{args.count - len(journal.completed)} 个设备未成功执行"
+                      + (f"，可使用 --resume {journal.run_id} 继续" if journal.params.get("resumable", True) else ""))
+
+
+def run_batch(args, snr_allocator: Optional[SNRAllocator] = None,
+              uniqueness_index: Optional[UniquenessIndex] = None, journal: Optional[DeploymentJournal] = None):
+    """一次性生成全部设备信息，保存后执行SSH并打印摘要"""
     # 生成设备信息
     print(f"正在生成 {args.count} 条设备信息...")
-    device_info_list = generate_device_info_batch(args.count, args.model, args.region, args.carrier)
+    batch = generate_device_info_batch(args.count, args.model, args.region, args.carrier,
+                                       args.seed, args.workers, snr_allocator, uniqueness_index)
     
     # 保存设备信息到JSON文件
-    save_device_info_to_json(device_info_list, args.output)
+    save_device_info_to_json(batch, args.output, args.format)
+    device_info_list = batch.to_compact_list()
     
     # 生成DG命令
     print("正在生成DG命令...")
-    commands_list = generate_dg_commands(device_info_list)
-    
-    # 保存DG命令到文件
-    save_commands_to_file(commands_list, args.commands_file)
+    if args.prop_dir:
+        bundles = generate_prop_bundles(device_info_list, args.seed)
+        save_prop_bundles(bundles, args.commands_file, args.prop_dir)
+    else:
+        commands_list = generate_dg_commands(device_info_list, args.seed)
+        
+        # 保存DG命令到文件
+        save_commands_to_file(commands_list, args.commands_file)
     
-    # 如果提供了SSH信息，则执行命令
-    if args.ssh_host and args.ssh_username and args.ssh_password:
+    # 如果提供了主机清单或SSH信息，则执行命令
+    hosts = fleet_hosts(args)
+    if hosts:
+        with FleetExecutor(hosts, pipelined=args.pipeline) as fleet:
+            execute_via_fleet(fleet, enumerate(bundles if args.prop_dir else commands_list, 1), args.bulk, journal)
+    elif args.ssh_host and args.ssh_username and args.ssh_password:
         print("正在通过SSH执行命令...")
-        execute_commands_via_ssh(
-            args.ssh_host, 
-            args.ssh_port, 
-            args.ssh_username, 
-            args.ssh_password, 
-            commands_list
-        )
+        if args.prop_dir:
+            execute_prop_bundles_via_ssh(args.ssh_host, args.ssh_port, args.ssh_username, args.ssh_password, bundles,
+                                         args.pipeline, journal)
+        else:
+            execute_commands_via_ssh(
+                args.ssh_host, 
+                args.ssh_port, 
+                args.ssh_username, 
+                args.ssh_password, 
+                commands_list,
+                args.pipeline,
+                journal
+            )
     else:
         print("未提供SSH信息，跳过命令执行")
     
@@ -172,5 +539,71 @@ def main():
         print()
 
 
+def run_streaming(args, snr_allocator: Optional[SNRAllocator] = None,
+                  uniqueness_index: Optional[UniquenessIndex] = None, journal: Optional[DeploymentJournal] = None):
+    """以流式方式执行生成、保存和SSH执行"""
+    executor = None
+    fleet = None
+    hosts = fleet_hosts(args)
+    if hosts:
+        fleet = FleetExecutor(hosts, pipelined=args.pipeline)
+    elif args.ssh_host and args.ssh_username and args.ssh_password:
+        executor = SSHExecutor(args.pipeline)
+        if not executor.connect(args.ssh_host, args.ssh_port, args.ssh_username, args.ssh_password):
+            print("SSH连接失败")
+            return
+        print(f"已连接到 {args.ssh_host}:{args.ssh_port}")
+    else:
+        print("未提供SSH信息，跳过命令执行")
+    
+    from .generator.device_stream import iter_device_chunks
+    
+    print(f"正在流式生成 {args.count} 条设备信息...")
+    device_stream = iter_device_chunks(args.count, args.model, args.region, args.carrier, args.seed, args.workers,
+                                       snr_allocator, uniqueness_index)
+    try:
+        count = stream_device_info_to_files(device_stream, args.output, args.commands_file, args.format, executor,
+                                            args.prop_dir, fleet, args.bulk, journal, args.seed)
+    finally:
+        if fleet:
+            fleet.close()
+        if executor:
+            executor.disconnect()
+            print("SSH连接已断开")
+    print(f"共处理 {count} 条设备信息")
+
+
+def run_sensor_stream(args):
+    """
+    为生成的设备流式输出传感器轨迹命令
+
+    所有设备的轨迹按块惰性生成并逐帧写入文件；提供SSH信息时，
+    按时间戳实时推送最后一台设备（即目标主机上最终生效的配置）的传感器命令。
+    """
+    from .executor.sensor_command_stream import iter_sensor_commands, push_sensor_commands
+    from .generator.sensor_trajectory import SensorTrajectory
+    from .output.stream_writers import SensorCommandsWriter
+    
+    print(f"正在生成 {args.count} 台设备 {args.sensor_duration} 秒的传感器轨迹（{args.sensor_profile}，{args.sensor_rate} Hz）...")
+    trajectory = SensorTrajectory(args.sensor_profile, args.count, args.sensor_rate, args.seed)
+    with SensorCommandsWriter(args.sensor_file) as writer:
+        for timestamp, device, commands in iter_sensor_commands(trajectory, args.sensor_duration):
+            writer.write(timestamp, device, commands)
+    print(f"传感器命令已保存到 {args.sensor_file}")
+    
+    if args.ssh_host and args.ssh_username and args.ssh_password:
+        executor = SSHExecutor(args.pipeline)
+        if not executor.connect(args.ssh_host, args.ssh_port, args.ssh_username, args.ssh_password):
+            print("SSH连接失败")
+            return
+        print(f"正在实时推送设备 {args.count} 的传感器命令...")
+        trajectory = SensorTrajectory(args.sensor_profile, args.count, args.sensor_rate, args.seed)
+        try:
+            failed = push_sensor_commands(executor, iter_sensor_commands(trajectory, args.sensor_duration, args.count - 1))
+        finally:
+            executor.disconnect()
+        print(f"传感器命令推送完成，失败 {failed} 条")
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+输出模块包初始化文件
+"""
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""设备信息的Arrow表与Parquet导出"""
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from src.core.models import DEVICE_FIELDS, SENSOR_AXES, SENSOR_FIELDS, DeviceBatch, DeviceInfo
+
+
+# 以字典编码存储的低基数字段
+DICTIONARY_COLUMNS = ("model", "country", "region", "carrier", "system_version", "network_type")
+
+# 浮点列：经纬度和按轴展开的传感器数据
+FLOAT_COLUMNS = ("latitude", "longitude") + tuple(
+    f"{prefix}_{axis}" for prefix in SENSOR_FIELDS.values() for axis in SENSOR_AXES
+)
+
+# 表的列顺序：与 DeviceInfo.to_dict() 相同，传感器字段按轴展开为 accelerometer_x 等列
+ARROW_COLUMNS = tuple(
+    column
+    for name in DEVICE_FIELDS
+    for column in ([f"{SENSOR_FIELDS[name]}_{axis}" for axis in SENSOR_AXES] if name in SENSOR_FIELDS else [name])
+)
+
+# 每个行组的行数
+ROW_GROUP_SIZE = 128 * 1024
+
+
+def _pyarrow():
+    # 延迟导入：pyarrow加载较慢，不导出Parquet的运行无需承担这部分启动开销
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("导出Arrow/Parquet需要安装pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def _string_array(values: np.ndarray):
+    """
+    由定长字节串数组直接构建Arrow字符串数组
+
+    定长字节串只在末尾以0填充，去掉所有0字节后按每行的长度计算偏移，
+    比逐个解码为Python字符串快得多。
+    """
+    pa = _pyarrow()
+    values = np.ascontiguousarray(values)
+    raw = values.view(np.uint8).reshape(len(values), values.dtype.itemsize)
+    present = raw != 0
+    offsets = np.zeros(len(values) + 1, dtype=np.int32)
+    np.cumsum(present.sum(axis=1), out=offsets[1:])
+    array = pa.StringArray.from_buffers(len(values), pa.py_buffer(offsets), pa.py_buffer(raw[present]))
+    array.validate(full=True)
+    return array
+
+
+def arrow_schema():
+    """
+    设备信息表的Arrow schema
+
+    Returns:
+        pyarrow.Schema: 低基数字段为字典编码的字符串，浮点列为float64，其余为字符串
+    """
+    pa = _pyarrow()
+    fields = []
+    for column in ARROW_COLUMNS:
+        if column in DICTIONARY_COLUMNS:
+            fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+        elif column in FLOAT_COLUMNS:
+            fields.append(pa.field(column, pa.float64()))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+
+def batch_to_arrow(batch: DeviceBatch):
+    """
+    直接由列式批次构建Arrow表
+
+    类别列的编码和类别表直接作为字典数组的索引和字典，浮点列零拷贝转换，
+    定长字节串列直接转换为Arrow的偏移和数据缓冲区。
+
+    Args:
+        batch: 设备信息批次
+
+    Returns:
+        pyarrow.Table: 设备信息表
+    """
+    pa = _pyarrow()
+    schema = arrow_schema()
+    arrays = []
+    for column in ARROW_COLUMNS:
+        values = batch.columns[column]
+        if column in DICTIONARY_COLUMNS:
+            dictionary = pa.array(batch.categories[column], type=pa.string())
+            arrays.append(pa.DictionaryArray.from_arrays(pa.array(values.astype(np.int32, copy=False)), dictionary))
+        elif column in FLOAT_COLUMNS:
+            arrays.append(pa.array(values.astype(np.float64, copy=False)))
+        elif values.dtype.kind == "S":
+            arrays.append(_string_array(values))
+        else:
+            arrays.append(pa.array(values.astype("U"), type=pa.string()))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def device_info_to_arrow(device_info_list: Iterable[DeviceInfo]):
+    """
+    由DeviceInfo对象构建Arrow表
+
+    缺少的传感器数据在对应的三列中为null。
+
+    Args:
+        device_info_list: 设备信息对象
+
+    Returns:
+        pyarrow.Table: 设备信息表
+    """
+    pa = _pyarrow()
+    columns: Dict[str, List] = {column: [] for column in ARROW_COLUMNS}
+    for device_info in device_info_list:
+        for name in DEVICE_FIELDS:
+            value = getattr(device_info, name)
+            if name in SENSOR_FIELDS:
+                for axis in SENSOR_AXES:
+                    columns[f"{SENSOR_FIELDS[name]}_{axis}"].append(None if value is None else value[axis])
+            else:
+                columns[name].append(value)
+
+    schema = arrow_schema()
+    arrays = []
+    for column in ARROW_COLUMNS:
+        if column in DICTIONARY_COLUMNS:
+            arrays.append(pa.array(columns[column], type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(columns[column], type=schema.field(column).type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+class ParquetWriter:
+    """
+    按行组增量写入Parquet文件
+
+    接口与其他设备信息写入器相同（write / write_batch / count / with语句），可在 DEVICE_WRITERS 中使用。
+    逐条写入的记录和流式写入的小批次都累积满一个行组后才转换并写出，内存占用只与行组大小有关。
+
+    Args:
+        filename: 输出文件名
+        row_group_size: 每个行组的行数
+    """
+
+    def __init__(self, filename: str, row_group_size: int = ROW_GROUP_SIZE):
+        _pyarrow()
+        import pyarrow.parquet as pq
+
+        self.filename = filename
+        self.count = 0
+        self.row_group_size = row_group_size
+        self._pending: List[DeviceInfo] = []
+        self._pending_batches: List[DeviceBatch] = []
+        self._pending_rows = 0
+        self._writer = pq.ParquetWriter(filename, arrow_schema())
+
+    def write(self, device_info: DeviceInfo):
+        self._flush_batches()
+        self._pending.append(device_info)
+        self.count += 1
+        if len(self._pending) >= self.row_group_size:
+            self._flush()
+
+    def write_batch(self, batch: DeviceBatch):
+        """直接从列式批次按行组写入，不创建DeviceInfo对象；不足一个行组的部分留到下次写入时合并"""
+        self._flush()
+        self.count += len(batch)
+        self._pending_batches.append(batch)
+        self._pending_rows += len(batch)
+        if self._pending_rows < self.row_group_size:
+            return
+        batch = DeviceBatch.concat(self._pending_batches)
+        full = len(batch) - len(batch) % self.row_group_size
+        for start in range(0, full, self.row_group_size):
+            self._writer.write_table(batch_to_arrow(batch.slice(start, start + self.row_group_size)))
+        self._pending_batches = [batch.slice(full)] if full < len(batch) else []
+        self._pending_rows = len(batch) - full
+
+    def _flush(self):
+        if self._pending:
+            self._writer.write_table(device_info_to_arrow(self._pending))
+            self._pending = []
+
+    def _flush_batches(self):
+        if self._pending_batches:
+            self._writer.write_table(batch_to_arrow(DeviceBatch.concat(self._pending_batches)))
+            self._pending_batches = []
+            self._pending_rows = 0
+
+    def close(self):
+        if self._writer is not None:
+            self._flush()
+            self._flush_batches()
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
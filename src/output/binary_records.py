@@ -0,0 +1,313 @@
+"""定长二进制设备信息记录格式
+
+文件布局（小端序）：
+
+    文件头（64字节）: 魔数 | 格式版本 | 记录长度 | 记录数量 | 字典块偏移 | 字典块长度 | 保留
+    记录区: 从第64字节开始，每条记录长度固定为 RECORD_DTYPE.itemsize
+    字典块: UTF-8编码的JSON，包含记录布局和型号、区域、运营商等低基数字段的字符串字典
+
+字典块写在记录之后，由文件头中的偏移定位，因此写入时无需预先知道全部字符串。
+第N条记录位于 64 + N * 记录长度，读取器通过mmap以O(1)定位任意记录。
+"""
+
+import json
+import mmap
+import struct
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from src.core.models import DEVICE_FIELDS, SENSOR_AXES, SENSOR_FIELDS, DeviceBatch, DeviceInfo
+
+
+MAGIC = b"DEVREC\x00\x00"
+SCHEMA_VERSION = 1
+
+# 魔数、格式版本、记录长度、记录数量、字典块偏移、字典块长度
+_HEADER = struct.Struct("<8sIIQQQ")
+HEADER_SIZE = 64
+
+# 以字典编码存储的字段
+DICTIONARY_FIELDS = ("model", "country", "region", "carrier", "system_version", "network_type")
+
+# 定长字节串字段及其最大长度（UTF-8字节数）
+STRING_FIELDS = {
+    "imei": 16,
+    "imsi": 15,
+    "mac_address": 17,
+    "android_id": 16,
+    "app_version": 16,
+    "ssid": 32,
+    "ip_address": 39,
+    "phone_number": 20,
+}
+
+# 标志位：传感器数据是否存在
+_FLAG_ACCELEROMETER = 1
+_FLAG_GYROSCOPE = 2
+
+RECORD_DTYPE = np.dtype(
+    [("latitude", "<f8"), ("longitude", "<f8"), ("accelerometer", "<f8", (3,)), ("gyroscope", "<f8", (3,))]
+    + [(name, "<u2") for name in DICTIONARY_FIELDS]
+    + [(name, f"S{width}") for name, width in STRING_FIELDS.items()]
+    + [("flags", "u1")]
+)
+
+# write 累积多少条记录后写入一次文件
+BUFFER_RECORDS = 4096
+
+
+class BinaryRecordWriter:
+    """
+    定长二进制记录写入器
+
+    接口与JSON写入器相同（write / write_batch / count / with语句），可在 DEVICE_WRITERS 中使用。
+    字符串超过字段长度或字典超过65536项时抛出 ValueError。
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.count = 0
+        self.dictionaries: Dict[str, List[str]] = {name: [] for name in DICTIONARY_FIELDS}
+        self._codes: Dict[str, Dict[str, int]] = {name: {} for name in DICTIONARY_FIELDS}
+        self._buffer = np.zeros(BUFFER_RECORDS, dtype=RECORD_DTYPE)
+        self._buffered = 0
+        self._file = open(filename, "wb")
+        # 字典块偏移先写为0，关闭时再回填
+        self._file.write(_HEADER.pack(MAGIC, SCHEMA_VERSION, RECORD_DTYPE.itemsize, 0, 0, 0).ljust(HEADER_SIZE, b"\x00"))
+
+    def _code(self, name: str, value: str) -> int:
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            if code > 0xFFFF:
+                raise ValueError(f"字段 {name} 的不同取值超过65536个")
+            self.dictionaries[name].append(value)
+        return code
+
+    def write(self, device_info: DeviceInfo):
+        record = self._buffer[self._buffered]
+        for name in DICTIONARY_FIELDS:
+            record[name] = self._code(name, getattr(device_info, name))
+        for name, width in STRING_FIELDS.items():
+            value = getattr(device_info, name).encode("utf-8")
+            if len(value) > width:
+                raise ValueError(f"字段 {name} 超过 {width} 字节: {getattr(device_info, name)}")
+            record[name] = value
+        record["latitude"] = device_info.latitude
+        record["longitude"] = device_info.longitude
+        flags = 0
+        for field, flag in (("accelerometer_data", _FLAG_ACCELEROMETER), ("gyroscope_data", _FLAG_GYROSCOPE)):
+            data = getattr(device_info, field)
+            if data is not None:
+                record[SENSOR_FIELDS[field]] = [data[axis] for axis in SENSOR_AXES]
+                flags |= flag
+            else:
+                record[SENSOR_FIELDS[field]] = np.nan
+        record["flags"] = flags
+        self._buffered += 1
+        self.count += 1
+        if self._buffered == BUFFER_RECORDS:
+            self._flush()
+
+    def write_batch(self, batch: DeviceBatch):
+        """直接从列式批次转换并写入，不创建DeviceInfo对象"""
+        self._flush()
+        records = np.zeros(len(batch), dtype=RECORD_DTYPE)
+        for name in DICTIONARY_FIELDS:
+            remap = np.array([self._code(name, value) for value in batch.categories[name]], dtype=np.uint16)
+            records[name] = remap[batch.columns[name]]
+        for name, width in STRING_FIELDS.items():
+            values = batch.columns[name]
+            if values.dtype.itemsize > width and (np.char.str_len(values) > width).any():
+                raise ValueError(f"字段 {name} 超过 {width} 字节")
+            records[name] = values
+        for prefix in SENSOR_FIELDS.values():
+            for i, axis in enumerate(SENSOR_AXES):
+                records[prefix][:, i] = batch.columns[f"{prefix}_{axis}"]
+        records["latitude"] = batch.columns["latitude"]
+        records["longitude"] = batch.columns["longitude"]
+        records["flags"] = _FLAG_ACCELEROMETER | _FLAG_GYROSCOPE
+        self._file.write(records.tobytes())
+        self.count += len(batch)
+
+    def _flush(self):
+        if self._buffered:
+            self._file.write(self._buffer[:self._buffered].tobytes())
+            self._buffered = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush()
+        dictionary_offset = HEADER_SIZE + self.count * RECORD_DTYPE.itemsize
+        block = json.dumps({
+            "fields": [list(item) for item in _dtype_layout()],
+            "dictionaries": self.dictionaries,
+        }, ensure_ascii=False).encode("utf-8")
+        self._file.write(block)
+        # 最后写入文件头：未正常关闭的文件字典块偏移为0，读取时会被拒绝
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, SCHEMA_VERSION, RECORD_DTYPE.itemsize, self.count,
+                                      dictionary_offset, len(block)))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _dtype_layout() -> list:
+    """记录布局：(字段名, 类型, 偏移)"""
+    return [(name, RECORD_DTYPE.fields[name][0].str, RECORD_DTYPE.fields[name][1]) for name in RECORD_DTYPE.names]
+
+
+def is_binary_record_file(filename: str) -> bool:
+    """根据魔数判断文件是否为二进制记录文件"""
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class BinaryRecordReader:
+    """
+    基于mmap的二进制记录读取器
+
+    records 是直接映射文件内容的NumPy结构化数组，按下标或字段访问都不复制数据；
+    reader[i] 以O(1)解码为DeviceInfo，iter_batches / find 按块顺序扫描整个文件。
+
+    Args:
+        filename: 二进制记录文件名
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._load()
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _load(self):
+        if len(self._mmap) < HEADER_SIZE:
+            raise ValueError(f"{self.filename} 不是二进制记录文件")
+        magic, version, record_size, count, dictionary_offset, dictionary_length = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{self.filename} 不是二进制记录文件")
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"不支持的格式版本: {version}")
+        if dictionary_offset == 0:
+            raise ValueError(f"{self.filename} 未正常关闭，记录不完整")
+        block = json.loads(self._mmap[dictionary_offset:dictionary_offset + dictionary_length].decode("utf-8"))
+        if record_size != RECORD_DTYPE.itemsize or [tuple(item) for item in block["fields"]] != _dtype_layout():
+            raise ValueError("记录布局与当前版本不一致")
+
+        self.dictionaries: Dict[str, List[str]] = block["dictionaries"]
+        self.records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=count, offset=HEADER_SIZE)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def field(self, name: str) -> np.ndarray:
+        """返回某个字段的零拷贝视图（字典字段为编码，需用 dictionaries 解码）"""
+        return self.records[name]
+
+    def __getitem__(self, index: int) -> DeviceInfo:
+        # item() 一次取出整条记录的Python值，比逐字段读取结构化标量快得多
+        values = dict(zip(RECORD_DTYPE.names, self.records[range(len(self))[index]].item()))
+        for name in DICTIONARY_FIELDS:
+            values[name] = self.dictionaries[name][values[name]]
+        for name in STRING_FIELDS:
+            values[name] = values[name].decode("utf-8")
+        flags = values["flags"]
+        for field, flag in (("accelerometer_data", _FLAG_ACCELEROMETER), ("gyroscope_data", _FLAG_GYROSCOPE)):
+            values[field] = dict(zip(SENSOR_AXES, values[SENSOR_FIELDS[field]].tolist())) if flags & flag else None
+        return DeviceInfo(**{name: values[name] for name in DEVICE_FIELDS})
+
+    def to_batch(self, start: int = 0, stop: Optional[int] = None) -> DeviceBatch:
+        """
+        将 [start, stop) 范围内的记录作为DeviceBatch返回
+
+        各列都是映射文件的视图，不复制数据；缺失的传感器数据表现为NaN。
+        """
+        records = self.records[start:stop]
+        columns = {name: records[name] for name in DICTIONARY_FIELDS + tuple(STRING_FIELDS)}
+        for prefix in SENSOR_FIELDS.values():
+            for i, axis in enumerate(SENSOR_AXES):
+                columns[f"{prefix}_{axis}"] = records[prefix][:, i]
+        columns["latitude"] = records["latitude"]
+        columns["longitude"] = records["longitude"]
+        return DeviceBatch(columns, {name: self.dictionaries[name] for name in DICTIONARY_FIELDS})
+
+    def iter_batches(self, chunk_size: int = 65536) -> Iterator[DeviceBatch]:
+        """按块顺序扫描所有记录"""
+        for start in range(0, len(self), chunk_size):
+            yield self.to_batch(start, start + chunk_size)
+
+    def iter_dicts(self, chunk_size: int = 65536) -> Iterator[dict]:
+        """
+        按块顺序解码所有记录为与 DeviceInfo.to_dict() 相同的字典
+
+        与 reader[i] 一致，标志位表示缺失的传感器数据为None（而不是 to_batch 中的NaN）。
+        """
+        for start in range(0, len(self), chunk_size):
+            flags = self.records["flags"][start:start + chunk_size].tolist()
+            for record, flag in zip(self.to_batch(start, start + chunk_size).iter_dicts(chunk_size), flags):
+                if not flag & _FLAG_ACCELEROMETER:
+                    record["accelerometer_data"] = None
+                if not flag & _FLAG_GYROSCOPE:
+                    record["gyroscope_data"] = None
+                yield record
+
+    def find(self, chunk_size: int = 1 << 20, **conditions) -> np.ndarray:
+        """
+        按字段取值相等筛选记录
+
+        字典字段先换算为编码再比较，不存在的取值直接返回空结果；其余字段按块向量化比较。
+
+        Args:
+            chunk_size: 每次扫描的记录数量
+            **conditions: 字段名 -> 取值，例如 find(region="China", carrier="China Mobile")
+
+        Returns:
+            np.ndarray: 满足全部条件的记录下标
+        """
+        targets = {}
+        for name, value in conditions.items():
+            if name in DICTIONARY_FIELDS:
+                if value not in self.dictionaries[name]:
+                    return np.zeros(0, dtype=np.int64)
+                targets[name] = self.dictionaries[name].index(value)
+            elif name in STRING_FIELDS:
+                targets[name] = str(value).encode("utf-8")
+            elif name in RECORD_DTYPE.names:
+                targets[name] = value
+            else:
+                raise ValueError(f"不支持按字段 {name} 筛选")
+
+        matches = []
+        for start in range(0, len(self), chunk_size):
+            records = self.records[start:start + chunk_size]
+            mask = np.ones(len(records), dtype=bool)
+            for name, target in targets.items():
+                mask &= records[name] == target
+            matches.append(np.flatnonzero(mask) + start)
+        return np.concatenate(matches) if matches else np.zeros(0, dtype=np.int64)
+
+    def close(self):
+        self.records = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # 调用方仍持有映射内存的视图（例如 to_batch 返回的批次），等这些数组释放后由垃圾回收关闭
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
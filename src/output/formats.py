@@ -0,0 +1,7 @@
+"""设备信息输出格式
+
+只列出格式名称，不导入各写入器（及其依赖的NumPy），命令行解析参数时即可使用。
+"""
+
+# 设备信息输出格式，与 stream_writers.DEVICE_WRITERS 的键一致
+DEVICE_FORMATS = ("json", "json-compact", "jsonl", "bin", "parquet")
@@ -0,0 +1,160 @@
+"""基于预编码模板的设备信息JSON序列化"""
+
+import json
+import math
+import re
+from itertools import chain, repeat
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.models import DEVICE_FIELDS, SENSOR_AXES, SENSOR_FIELDS, DeviceBatch
+
+
+# JSON字符串中需要转义的字符（ensure_ascii=False 时非ASCII字符原样输出）
+_NEEDS_ESCAPE = re.compile(r'["\\\x00-\x1f]')
+
+# 模板中的占位符，序列化后会被替换为 %s
+_SLOT = "\x00slot\x00"
+
+
+def encode_value(value) -> str:
+    """
+    将单个标量编码为JSON文本，结果与 json.dumps(value, ensure_ascii=False) 相同
+
+    常见类型直接拼接，其余类型交给json模块。
+    """
+    kind = type(value)
+    if kind is str:
+        return json.dumps(value, ensure_ascii=False) if _NEEDS_ESCAPE.search(value) else f'"{value}"'
+    if kind is float:
+        return float.__repr__(value) if math.isfinite(value) else json.dumps(value)
+    if kind is int:
+        return int.__repr__(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _slot_path(name: str) -> List[Tuple[str, Optional[str]]]:
+    """字段对应的占位符：传感器字段按轴展开为3个占位符"""
+    if name in SENSOR_FIELDS:
+        return [(name, axis) for axis in SENSOR_AXES]
+    return [(name, None)]
+
+
+class RecordTemplate:
+    """
+    设备信息记录的JSON模板
+
+    用json模块序列化一条以占位符为值的记录，得到键名、分隔符和缩进都已编码好的格式串，
+    之后每条记录只需编码各字段的值并填入模板，输出与 json.dumps 逐字节一致。
+
+    Args:
+        indent: 缩进，与 json.dumps 的 indent 参数相同
+        line_prefix: 每个换行后追加的前缀，用于嵌套在JSON数组中时的额外缩进
+    """
+
+    def __init__(self, indent: Optional[int] = None, line_prefix: str = ""):
+        sample = {
+            name: {axis: _SLOT for axis in SENSOR_AXES} if name in SENSOR_FIELDS else _SLOT
+            for name in DEVICE_FIELDS
+        }
+        text = json.dumps(sample, indent=indent, ensure_ascii=False).replace("\n", "\n" + line_prefix)
+        self.indent = indent
+        self.line_prefix = line_prefix
+        self.slots = [slot for name in DEVICE_FIELDS for slot in _slot_path(name)]
+        # 占位符之间的固定文本，批量编码时与各列的值交错拼接
+        self.pieces = text.split(json.dumps(_SLOT))
+        self.format = "%s".join(piece.replace("%", "%%") for piece in self.pieces)
+
+    def _fallback(self, item: dict) -> str:
+        text = json.dumps(item, indent=self.indent, ensure_ascii=False)
+        return text.replace("\n", "\n" + self.line_prefix)
+
+    def encode_dict(self, item: dict) -> str:
+        """
+        编码一条 DeviceInfo.to_dict() 形式的记录
+
+        字段或传感器数据的结构与模板不一致时（例如缺少传感器数据），退回json模块序列化。
+        不缩进时json模块使用C编码器，逐条编码比填充模板更快，直接交给json模块。
+        """
+        if self.indent is None or len(item) != len(DEVICE_FIELDS) or tuple(item) != DEVICE_FIELDS:
+            return self._fallback(item)
+        values = []
+        for name, axis in self.slots:
+            value = item[name]
+            if axis is not None:
+                if type(value) is not dict or tuple(value) != SENSOR_AXES:
+                    return self._fallback(item)
+                value = value[axis]
+            values.append(encode_value(value))
+        return self.format % tuple(values)
+
+    def encode_batch(self, batch: DeviceBatch, separator: str = "\n") -> str:
+        """
+        直接从列式批次编码所有记录
+
+        每列只做一次向量化的检查和编码：类别列只编码类别表，字节串列在不含需转义字符时整列加引号，
+        浮点列在全部为有限值时直接取repr。之后将模板的固定文本与各列的值交错，一次拼接为整块文本。
+
+        Args:
+            batch: 设备信息批次
+            separator: 记录之间的分隔符
+
+        Returns:
+            str: 以separator分隔的所有记录的JSON文本
+        """
+        if not len(batch):
+            return ""
+        parts = []
+        for piece, (name, axis) in zip(self.pieces, self.slots):
+            parts.append(repeat(piece))
+            parts.append(_encode_column(batch, name if axis is None else f"{SENSOR_FIELDS[name]}_{axis}"))
+        parts.append(repeat(self.pieces[-1] + separator))
+        text = "".join(chain.from_iterable(zip(*parts)))
+        return text[:len(text) - len(separator)]
+
+
+def _encode_column(batch: DeviceBatch, name: str) -> list:
+    """将一列编码为JSON文本列表"""
+    values = batch.columns[name]
+    if name in batch.categories:
+        lookup = np.array([encode_value(value) for value in batch.categories[name]], dtype=object)
+        return lookup[values].tolist()
+    if values.dtype.kind == "S":
+        raw = values.view(np.uint8)
+        if ((raw < 0x20) & (raw != 0)).any() or (raw == ord('"')).any() or (raw == ord("\\")).any():
+            return [encode_value(value) for value in values.astype("U").tolist()]
+        # 不含控制字符时可以用换行整列拼接后再拆分，一次完成解码和加引号
+        return ('"' + b'"\n"'.join(values.tolist()).decode("ascii") + '"').split("\n")
+    if values.dtype.kind == "f" and np.isfinite(values).all():
+        return list(map(float.__repr__, values.tolist()))
+    return [encode_value(value) for value in values.tolist()]
+
+
+def encode_records(items: Iterable, output_format: str = "json") -> str:
+    """
+    将设备信息一次性编码为完整的文件内容，结果与对应写入器的输出相同
+
+    Args:
+        items: 设备信息对象（或DeviceRow等提供 to_dict() 的对象）
+        output_format: 输出格式，json、json-compact 或 jsonl
+
+    Returns:
+        str: 文件内容
+    """
+    if output_format not in RECORD_FORMATS:
+        raise ValueError(f"不支持的输出格式: {output_format}")
+    template, head, separator, tail, empty = RECORD_FORMATS[output_format]
+    texts = [template.encode_dict(item.to_dict()) for item in items]
+    return head + separator.join(texts) + tail if texts else empty
+
+
+# 输出格式 -> (模板, 开头, 记录分隔符, 结尾, 没有记录时的内容)
+RECORD_FORMATS = {
+    # 与 json.dump(data, f, indent=2, ensure_ascii=False) 相同
+    "json": (RecordTemplate(indent=2, line_prefix="  "), "[\n  ", ",\n  ", "\n]", "[]"),
+    # 紧凑的JSON数组，每行一条记录
+    "json-compact": (RecordTemplate(), "[", ",\n", "]\n", "[]\n"),
+    # 每行一个JSON对象
+    "jsonl": (RecordTemplate(), "", "\n", "\n", ""),
+}
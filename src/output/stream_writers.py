@@ -0,0 +1,171 @@
+"""设备信息与DG命令的增量写入器"""
+
+import os
+from typing import List
+
+from src.core.models import DeviceBatch, DeviceInfo
+from src.executor.prop_bundle import DEFAULT_REMOTE_PROP_DIR, PropBundle, apply_prop_commands, prop_file_name, remote_prop_path
+from src.output.arrow_export import ParquetWriter
+from src.output.binary_records import BinaryRecordWriter
+from src.output.formats import DEVICE_FORMATS
+from src.output.record_templates import RECORD_FORMATS
+
+
+# 写入缓冲区大小，减少系统调用次数
+WRITE_BUFFER_SIZE = 1 << 20
+
+# write_batch 每次编码并写入的行数
+BATCH_WRITE_ROWS = 4096
+
+
+class _StreamWriter:
+    """增量写入器基类，支持with语句"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.count = 0
+        self._file = open(filename, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE)
+
+    def close(self):
+        if not self._file.closed:
+            self._finish()
+            self._file.close()
+
+    def _finish(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _RecordWriter(_StreamWriter):
+    """
+    设备信息写入器基类
+
+    记录按 RECORD_FORMATS 中预编码的模板序列化，输出与json模块逐字节一致；
+    批量写入时每块记录拼接后只调用一次write。
+    """
+    output_format = None
+
+    def __init__(self, filename: str):
+        super().__init__(filename)
+        self._template, self._head, self._separator, self._tail, self._empty = RECORD_FORMATS[self.output_format]
+
+    def write(self, device_info: DeviceInfo):
+        self.write_dict(device_info.to_dict())
+
+    def write_dict(self, item: dict):
+        self._write_text(self._template.encode_dict(item), 1)
+
+    def write_batch(self, batch: DeviceBatch):
+        """直接从列式批次按块编码并写入，不创建DeviceInfo对象"""
+        for start in range(0, len(batch), BATCH_WRITE_ROWS):
+            chunk = batch.slice(start, start + BATCH_WRITE_ROWS)
+            self._write_text(self._template.encode_batch(chunk, self._separator), len(chunk))
+
+    def _write_text(self, text: str, count: int):
+        if not count:
+            return
+        self._file.write((self._head if self.count == 0 else self._separator) + text)
+        self.count += count
+
+    def _finish(self):
+        self._file.write(self._tail if self.count else self._empty)
+
+
+class JSONArrayWriter(_RecordWriter):
+    """
+    以JSON数组格式逐条写入设备信息
+
+    输出与 json.dump(data, f, indent=2, ensure_ascii=False) 逐字节一致。
+    """
+    output_format = "json"
+
+
+class CompactJSONArrayWriter(_RecordWriter):
+    """以紧凑的JSON数组格式写入设备信息，每行一条记录"""
+    output_format = "json-compact"
+
+
+class JSONLinesWriter(_RecordWriter):
+    """以JSON Lines格式逐条写入设备信息，每行一个JSON对象"""
+    output_format = "jsonl"
+
+
+class CommandsFileWriter(_StreamWriter):
+    """逐设备写入DG命令文件"""
+
+    def write(self, commands: List[str]):
+        self.count += 1
+        lines = [f"# 设备 {self.count} 的DG命令"]
+        lines.extend(commands)
+        self._file.write("\n".join(lines) + "\n\n")
+
+    def write_text(self, text: str):
+        """写入一个设备以换行分隔的命令文本（DGCommandGenerator.generate_commands_text 的结果）"""
+        self.count += 1
+        self._file.write(f"# 设备 {self.count} 的DG命令\n{text}\n\n")
+
+
+class PropBundleWriter(CommandsFileWriter):
+    """
+    逐设备写入prop文件
+
+    每个设备的配置写入 prop_dir 下的 device_<序号>.prop，命令文件中只保留应用该文件的命令
+    （假定 prop_dir 已推送到目标设备的 remote_dir）和无prop形式的 dg geo / dg sensor 命令。
+
+    Args:
+        filename: 命令文件名
+        prop_dir: 本地prop文件目录
+        remote_dir: 目标设备上存放prop文件的目录
+    """
+
+    def __init__(self, filename: str, prop_dir: str, remote_dir: str = DEFAULT_REMOTE_PROP_DIR):
+        os.makedirs(prop_dir, exist_ok=True)
+        super().__init__(filename)
+        self.prop_dir = prop_dir
+        self.remote_dir = remote_dir
+
+    def write_bundle(self, bundle: PropBundle):
+        number = self.count + 1
+        with open(os.path.join(self.prop_dir, prop_file_name(number)), "w", encoding="utf-8", newline="\n") as f:
+            f.write(bundle.prop)
+        self.write(apply_prop_commands(remote_prop_path(number, self.remote_dir)) + bundle.commands)
+
+
+class SensorCommandsWriter(_StreamWriter):
+    """逐帧写入传感器DG命令，每行格式为：时间戳(秒)<TAB>设备编号<TAB>命令"""
+
+    def write(self, timestamp: float, device: int, commands: List[str]):
+        prefix = f"{timestamp:.3f}\t{device + 1}\t"
+        self._file.write("".join(f"{prefix}{command}\n" for command in commands))
+        self.count += 1
+
+
+# 设备信息输出格式 -> 写入器，键与 DEVICE_FORMATS 一致
+DEVICE_WRITERS = {
+    "json": JSONArrayWriter,
+    "json-compact": CompactJSONArrayWriter,
+    "jsonl": JSONLinesWriter,
+    "bin": BinaryRecordWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def open_device_writer(filename: str, output_format: str = "json"):
+    """
+    按输出格式创建设备信息写入器
+
+    Args:
+        filename: 输出文件名
+        output_format: 输出格式，json、json-compact、jsonl、bin 或 parquet
+
+    Returns:
+        设备信息写入器
+    """
+    if output_format not in DEVICE_FORMATS:
+        raise ValueError(f"不支持的输出格式: {output_format}")
+    return DEVICE_WRITERS[output_format](filename)
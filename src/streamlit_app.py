@@ -1,16 +1,17 @@
 """Streamlit界面应用"""
 
 import streamlit as st
-import json
 import pandas as pd
 import random
 
 from src.generator.device_info_generator import DeviceInfoGenerator
 from src.executor.dg_command_generator import DGCommandGenerator
 from src.core.models import DeviceInfo
+from src.output.record_templates import encode_records
 from src.config.device_models_config import display_device_models_config
 from src.config.carrier_info_config import display_carrier_info_config
 from src.config.device_models import get_models_by_brand, get_all_brands
+from src.config.brand_index import infer_manufacturer
 
 
 def main():
@@ -156,8 +157,7 @@ def display_device_info_and_commands_tab():
         st.dataframe(df, use_container_width=True, hide_index=True)
         
         # 提供JSON下载
-        json_data = [device_info.to_dict() for device_info in st.session_state.device_info_list]
-        json_str = json.dumps(json_data, indent=2, ensure_ascii=False)
+        json_str = encode_records(st.session_state.device_info_list, "json")
         st.download_button(
             label="📥 下载JSON文件",
             data=json_str,
@@ -205,19 +205,7 @@ def display_device_info_and_commands_tab():
 def get_command_comment_and_rule(command, device_info):
     """为DG命令添加注释和生成规则"""
     if "prop.ro.product.manufacturer" in command:
-        brand = "Unknown"
-        if "Samsung" in device_info.model or "SM-" in device_info.model:
-            brand = "samsung"
-        elif "iPhone" in device_info.model:
-            brand = "apple"
-        elif "Huawei" in device_info.model or "ELE-" in device_info.model or "VOG-" in device_info.model:
-            brand = "huawei"
-        elif "Xiaomi" in device_info.model or "POCO" in device_info.model or "Redmi" in device_info.model:
-            brand = "xiaomi"
-        elif "OPPO" in device_info.model or "CPH" in device_info.model:
-            brand = "oppo"
-        elif "Vivo" in device_info.model or "V20" in device_info.model:
-            brand = "vivo"
+        brand = infer_manufacturer(device_info.model)
         return "设置设备制造商", f"根据设备型号 '{device_info.model}' 推断品牌为 '{brand}'"
         
     elif "prop.ro.product.model" in command or "prop.ro.product.device" in command:
@@ -0,0 +1,99 @@
+"""
+Walker别名表加权抽样
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+
+class AliasTable:
+    """
+    Walker别名表（Vose构建算法）
+
+    构建为O(k)，每次抽样为O(1)：只需一个 [0, 1) 均匀随机数，整数部分选择槽位，
+    小数部分决定取该槽位本身还是其别名。所有权重相等时结果与 int(u * k) 完全一致。
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1 or not len(weights):
+            raise ValueError("权重列表不能为空")
+        if (weights < 0).any() or not np.isfinite(weights).all():
+            raise ValueError("权重必须是非负有限数")
+        total = weights.sum()
+        if total <= 0:
+            raise ValueError("权重之和必须大于0")
+
+        size = len(weights)
+        scaled = weights * (size / total)
+        prob = np.ones(size, dtype=np.float64)
+        alias = np.arange(size, dtype=np.int64)
+        small = [i for i in range(size) if scaled[i] < 1.0]
+        large = [i for i in range(size) if scaled[i] >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # 剩余槽位的概率因浮点误差可能略偏离1，直接取1
+
+        self.size = size
+        self.prob = prob
+        self.alias = alias
+        self._prob_list = prob.tolist()
+        self._alias_list = alias.tolist()
+
+    def sample(self, u: float) -> int:
+        """
+        根据一个均匀随机数抽取一个下标
+
+        Args:
+            u: [0, 1) 上的均匀随机数
+
+        Returns:
+            int: 抽中的下标
+        """
+        scaled = u * self.size
+        i = int(scaled)
+        return i if scaled - i < self._prob_list[i] else self._alias_list[i]
+
+    def sample_array(self, u: np.ndarray) -> np.ndarray:
+        """根据均匀随机数数组批量抽取下标"""
+        scaled = np.asarray(u) * self.size
+        i = scaled.astype(np.int64)
+        return np.where(scaled - i < self.prob[i], i, self.alias[i])
+
+
+class AliasTableGroup:
+    """
+    按组拼接的多个别名表
+
+    例如每个品牌一张型号表：所有表的槽位拼接为一维数组，
+    按每行的组号一次向量化抽样，返回组内下标。
+    """
+
+    def __init__(self, tables: List[AliasTable]):
+        self.tables = tables
+        self.counts = np.array([table.size for table in tables], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(self.counts)[:-1]]).astype(np.int64)
+        self.prob = np.concatenate([table.prob for table in tables])
+        self.alias = np.concatenate([table.alias for table in tables])
+
+    def sample_array(self, groups: np.ndarray, u: np.ndarray) -> np.ndarray:
+        """
+        批量抽样
+
+        Args:
+            groups: 每行的组号
+            u: 每行的 [0, 1) 均匀随机数
+
+        Returns:
+            np.ndarray: 每行抽中的组内下标
+        """
+        counts = self.counts[groups]
+        scaled = np.asarray(u) * counts
+        i = scaled.astype(np.int64)
+        slots = self.offsets[groups] + i
+        return np.where(scaled - i < self.prob[slots], i, self.alias[slots])
@@ -2,23 +2,177 @@
 校验和计算工具函数
 """
 
+from functools import lru_cache
+
+import numpy as np
+
+
+# Luhn算法中需要乘2的数字，乘2后各位数字之和
+_LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+_LUHN_DOUBLED_ARRAY = np.array(_LUHN_DOUBLED, dtype=np.uint8)
+
+# IMEI主体为14位：8位TAC + 6位SNR，从右边数偶数位（即从左边数的奇数位）需要乘2
+IMEI_BODY_LENGTH = 14
+TAC_LENGTH = 8
+
+
+def _build_snr_tables():
+    # SNR拆成前后两个3位数分别查表：前3位位于主体的第8~10位（不乘2、乘2、不乘2），
+    # 后3位位于第11~13位（乘2、不乘2、乘2）
+    values = np.arange(1000)
+    hundreds, tens, ones = values // 100, values // 10 % 10, values % 10
+    doubled = _LUHN_DOUBLED_ARRAY.astype(np.int64)
+    high = hundreds + doubled[tens] + ones
+    low = doubled[hundreds] + tens + doubled[ones]
+    return high, low
+
+
+_SNR_HIGH_SUMS, _SNR_LOW_SUMS = _build_snr_tables()
+_SNR_HIGH_SUMS_LIST = _SNR_HIGH_SUMS.tolist()
+_SNR_LOW_SUMS_LIST = _SNR_LOW_SUMS.tolist()
+
 
 def calculate_luhn_check_digit(digits: str) -> str:
     """
     使用Luhn算法计算校验位
-    
+
     Args:
         digits: 需要计算校验位的数字字符串
-        
+
     Returns:
         str: 校验位
+
+    Raises:
+        ValueError: digits 包含非数字字符
     """
     total = 0
     for i, digit in enumerate(reversed(digits)):
-        n = int(digit)
+        n = ord(digit) - 48
+        if not 0 <= n <= 9:
+            raise ValueError(f"校验位只能由数字计算，包含非数字字符: {digit!r}")
         if i % 2 == 0:  # 从右边数，偶数位（索引为0, 2, 4...）
-            n *= 2
-            if n > 9:
-                n -= 9
+            n = _LUHN_DOUBLED[n]
         total += n
-    return str((10 - total % 10) % 10)
\ No newline at end of file
+    return str((10 - total % 10) % 10)
+
+
+def digit_matrix(values, width: int) -> np.ndarray:
+    """
+    将定长数字字符串数组转换为 (n, width) 的数字矩阵
+
+    Args:
+        values: 字节串或字符串数组，每个元素应为width位数字
+        width: 数字位数
+
+    Returns:
+        np.ndarray: uint8数字矩阵；非数字字符以及长度不足时补齐的位置转换后大于9
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == "U":
+        # 直接读取UCS-4码位，比先编码为字节串快得多
+        codes = np.ascontiguousarray(values, dtype=f"U{width}").view(np.uint32).reshape(-1, width)
+        return np.where(codes - 48 <= 9, codes - 48, 255).astype(np.uint8)
+    values = np.ascontiguousarray(values, dtype=f"S{width}")
+    return values.view(np.uint8).reshape(-1, width) - np.uint8(ord("0"))
+
+
+def _luhn_weighted_sums(digits: np.ndarray) -> np.ndarray:
+    """逐行计算数字矩阵的Luhn加权和，从左边数的奇数位（索引1, 3, 5...）乘2"""
+    weighted = digits.astype(np.int32)
+    weighted[:, 1::2] = _LUHN_DOUBLED_ARRAY[digits[:, 1::2]]
+    return weighted @ np.ones(digits.shape[1], dtype=np.int32)
+
+
+@lru_cache(maxsize=None)
+def tac_luhn_sum(tac: str) -> int:
+    """
+    计算8位TAC在14位IMEI主体中的Luhn加权和
+
+    同一TAC的所有IMEI共用这部分和，只需计算一次，逐条计算校验位时只需处理6位SNR。
+
+    Args:
+        tac: 8位TAC码
+
+    Returns:
+        int: 加权和
+    """
+    return sum(int(d) if i % 2 == 0 else _LUHN_DOUBLED[int(d)] for i, d in enumerate(tac))
+
+
+def tac_luhn_sums(tac_digits: np.ndarray) -> np.ndarray:
+    """
+    逐行计算 (n, 8) 的TAC数字矩阵在IMEI主体中的Luhn加权和
+
+    Args:
+        tac_digits: TAC数字矩阵
+
+    Returns:
+        np.ndarray: int64加权和数组
+    """
+    return _luhn_weighted_sums(np.asarray(tac_digits, dtype=np.uint8)).astype(np.int64)
+
+
+def snr_luhn_sums(snr) -> np.ndarray:
+    """计算6位SNR在IMEI主体中的Luhn加权和（查表，每个SNR只需两次查表）"""
+    high, low = np.divmod(np.asarray(snr, dtype=np.int64), 1000)
+    return _SNR_HIGH_SUMS[high] + _SNR_LOW_SUMS[low]
+
+
+def imei_check_digits(tac_sums, snr) -> np.ndarray:
+    """
+    根据预先计算的TAC加权和与SNR批量计算IMEI校验位
+
+    Args:
+        tac_sums: TAC加权和（整数或与snr等长的数组），见 tac_luhn_sum / tac_luhn_sums
+        snr: SNR整数数组
+
+    Returns:
+        np.ndarray: uint8校验位数组
+    """
+    total = np.asarray(tac_sums, dtype=np.int64) + snr_luhn_sums(snr)
+    return ((10 - total % 10) % 10).astype(np.uint8)
+
+
+def imei_check_digit(tac: str, snr: int) -> str:
+    """计算单个IMEI的校验位，TAC加权和会被缓存"""
+    high, low = divmod(snr, 1000)
+    total = tac_luhn_sum(tac) + _SNR_HIGH_SUMS_LIST[high] + _SNR_LOW_SUMS_LIST[low]
+    return str((10 - total % 10) % 10)
+
+
+def calculate_luhn_check_digits(bodies) -> np.ndarray:
+    """
+    批量计算14位IMEI主体的Luhn校验位
+
+    Args:
+        bodies: (n, 14) 的数字矩阵，或14位数字字符串（字节串）数组
+
+    Returns:
+        np.ndarray: uint8校验位数组
+    """
+    bodies = np.asarray(bodies)
+    if bodies.ndim == 1:
+        bodies = digit_matrix(bodies, IMEI_BODY_LENGTH)
+    total = _luhn_weighted_sums(bodies.astype(np.uint8, copy=False))
+    return ((10 - total % 10) % 10).astype(np.uint8)
+
+
+def validate_luhn(imeis) -> np.ndarray:
+    """
+    批量校验15位IMEI
+
+    Args:
+        imeis: 15位IMEI字符串（字节串）数组
+
+    Returns:
+        np.ndarray: 布尔数组，长度为15位、全部为数字且校验位正确时为True
+    """
+    imeis = np.asarray(imeis)
+    width = IMEI_BODY_LENGTH + 1
+    itemsize = imeis.dtype.itemsize // (4 if imeis.dtype.kind == "U" else 1)
+    # 超长的元素直接判为无效，不足15位的元素补齐位置会被识别为非数字
+    valid = np.char.str_len(imeis) == width if itemsize > width else np.ones(len(imeis), dtype=bool)
+    digits = digit_matrix(imeis, width)
+    valid &= (digits <= 9).all(axis=1)
+    # 包含校验位在内，从左边数的奇数位乘2后总和应为10的倍数
+    return valid & (_luhn_weighted_sums(np.where(digits <= 9, digits, 0)) % 10 == 0)
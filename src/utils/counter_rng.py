@@ -0,0 +1,97 @@
+"""
+基于计数器的随机数生成器
+"""
+
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from src.utils.hash_utils import mix64
+
+
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_DOUBLE_UNIT = 1.0 / (1 << 53)
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64_int(z: int) -> int:
+    """mix64 的纯Python版本（单个整数）"""
+    z ^= z >> 30
+    z = (z * 0xBF58476D1CE4E5B9) & _MASK64
+    z ^= z >> 27
+    z = (z * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def counter_words(seed: int, index: int, count: int) -> List[int]:
+    """
+    单个设备前count次抽样的64位原始输出，与 CounterRNG(seed, [index]) 的结果相同
+
+    纯Python计算，逐设备调用时比构造数组快得多。
+
+    Args:
+        seed: 种子
+        index: 设备序号
+        count: 抽样次数
+
+    Returns:
+        List[int]: 每次抽样的64位无符号整数
+    """
+    key = _mix64_int((seed % (1 << 64)) ^ _mix64_int(index & _MASK64))
+    gamma = int(_GOLDEN_GAMMA)
+    return [_mix64_int((key + s * gamma) & _MASK64) for s in range(1, count + 1)]
+
+
+def word_to_unit(word: int) -> float:
+    """将64位原始输出转换为 [0, 1) 上的浮点数，与 CounterRNG.random 相同"""
+    return (word >> 11) * _DOUBLE_UNIT
+
+
+def word_to_integer(word: int, low: int, high: int) -> int:
+    """将64位原始输出转换为 [low, high) 上的整数，与 CounterRNG.integers 相同"""
+    return low + (((word >> 32) * (high - low)) >> 32)
+
+
+class CounterRNG:
+    """
+    按 (种子, 设备序号, 抽样序号) 计算随机数的生成器
+
+    每个设备对应一条独立的SplitMix64序列：设备密钥由种子和设备序号混合得到，
+    第s次抽样的输出为 mix64(设备密钥 + (s + 1) * gamma)。任意设备的随机数都可以
+    直接计算，而不需要先生成它之前的所有设备。
+
+    接口与 np.random.Generator 中列式生成引擎用到的部分一致，size的第一维
+    必须等于设备数量，每一列消耗一个抽样序号。
+    """
+
+    def __init__(self, seed: int, indices: np.ndarray):
+        self.seed = seed % (1 << 64)
+        self.indices = np.asarray(indices, dtype=np.uint64)
+        self._device_keys = mix64(np.uint64(self.seed) ^ mix64(self.indices))
+        self._counter = 0
+
+    def _bits(self, size: Union[int, Tuple[int, ...]]) -> np.ndarray:
+        shape = (size,) if isinstance(size, (int, np.integer)) else tuple(size)
+        if shape[0] != len(self.indices):
+            raise ValueError(f"size的第一维必须等于设备数量 {len(self.indices)}，实际为 {shape[0]}")
+        width = int(np.prod(shape[1:], dtype=np.int64))
+        counters = np.arange(self._counter + 1, self._counter + width + 1, dtype=np.uint64)
+        self._counter += width
+        with np.errstate(over="ignore"):
+            states = self._device_keys[:, None] + counters[None, :] * _GOLDEN_GAMMA
+        return mix64(states).reshape(shape)
+
+    def random(self, size) -> np.ndarray:
+        """返回 [0, 1) 上的均匀分布浮点数"""
+        return (self._bits(size) >> np.uint64(11)) * _DOUBLE_UNIT
+
+    def uniform(self, low: float, high: float, size) -> np.ndarray:
+        """返回 [low, high) 上的均匀分布浮点数"""
+        return low + (high - low) * self.random(size)
+
+    def integers(self, low: int, high: int, size, dtype=np.int64) -> np.ndarray:
+        """返回 [low, high) 上的均匀分布整数（high - low 不超过 2^32）"""
+        # 乘法移位法：取高32位乘以区间长度后再取高32位，避免浮点运算
+        span = np.uint64(high - low)
+        values = ((self._bits(size) >> np.uint64(32)) * span) >> np.uint64(32)
+        return (values.astype(np.int64) + low).astype(dtype, copy=False)
@@ -0,0 +1,25 @@
+"""
+哈希工具函数
+"""
+
+import numpy as np
+
+
+def mix64(values) -> np.ndarray:
+    """
+    SplitMix64的64位混合函数，对uint64数组逐元素计算
+
+    Args:
+        values: uint64整数或数组
+
+    Returns:
+        np.ndarray: 混合后的uint64数组
+    """
+    z = np.asarray(values, dtype=np.uint64).copy()
+    with np.errstate(over="ignore"):
+        z ^= z >> np.uint64(30)
+        z *= np.uint64(0xBF58476D1CE4E5B9)
+        z ^= z >> np.uint64(27)
+        z *= np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+    return z
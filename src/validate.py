@@ -0,0 +1,74 @@
+"""设备信息文件批量校验程序"""
+
+import argparse
+import json
+import os
+import sys
+from .output.stream_writers import WRITE_BUFFER_SIZE
+from .validation.device_validator import VALIDATION_RULES, ValidationSummary, validate_records
+from .validation.record_readers import DEFAULT_CHUNK_SIZE, INPUT_FORMATS, iter_record_chunks
+
+
+def validate_file(filename: str, failures_file: str, input_format: str = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> ValidationSummary:
+    """
+    分块校验设备信息文件，并将未通过的记录写入单独的文件
+
+    Args:
+        filename: 输入文件名（JSON数组、JSON Lines、CSV或二进制记录）
+        failures_file: 未通过记录的输出文件名（JSON Lines，每条记录附带 failed_rules 字段）
+        input_format: 输入格式，None表示自动推断
+        chunk_size: 每批校验的记录数量
+
+    Returns:
+        ValidationSummary: 校验结果汇总
+    """
+    summary = ValidationSummary()
+    with open(failures_file, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+        for records in iter_record_chunks(filename, input_format, chunk_size):
+            failures = validate_records(records)
+            for row in summary.add(failures).nonzero()[0]:
+                record = dict(records[row])
+                record["failed_rules"] = [name for name, mask in failures.items() if mask[row]]
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+    return summary
+
+
+def print_summary(summary: ValidationSummary):
+    """
+    打印各规则的失败数量
+
+    Args:
+        summary: 校验结果汇总
+    """
+    def percent(count: int) -> str:
+        return f"{count / summary.total:.2%}" if summary.total else "0.00%"
+
+    print(f"共校验 {summary.total} 条记录，未通过 {summary.failed} 条（{percent(summary.failed)}）")
+    for name, description in VALIDATION_RULES.items():
+        count = summary.rule_failures[name]
+        print(f"  {name:<14} {count:>10} 条（{percent(count):>7}）  {description}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="设备信息文件批量校验")
+    parser.add_argument("input", type=str, help="输入文件（device_info.json、JSON Lines、CSV或二进制记录）")
+    parser.add_argument("--format", type=str, choices=INPUT_FORMATS, help="输入格式，默认根据文件内容推断")
+    parser.add_argument("--failures", type=str, help="未通过记录的输出文件名（默认：<输入文件名>.failures.jsonl）")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="每批校验的记录数量")
+
+    args = parser.parse_args()
+    failures_file = args.failures or f"{os.path.splitext(args.input)[0]}.failures.jsonl"
+
+    print(f"正在校验 {args.input} ...")
+    summary = validate_file(args.input, failures_file, args.format, args.chunk_size)
+    print_summary(summary)
+    print(f"未通过的记录已保存到 {failures_file}")
+
+    # 存在未通过的记录时返回非0退出码，便于在脚本中判断
+    sys.exit(1 if summary.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
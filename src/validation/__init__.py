@@ -0,0 +1,3 @@
+"""
+校验模块包初始化文件
+"""
\ No newline at end of file
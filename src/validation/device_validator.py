@@ -0,0 +1,172 @@
+"""设备信息批量校验规则"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+from src.generator.generation_plan import get_generation_plan
+from src.utils.checksum_utils import TAC_LENGTH, digit_matrix, validate_luhn
+
+
+# 校验规则名称 -> 说明
+VALIDATION_RULES = {
+    "imei_luhn": "IMEI为15位数字且Luhn校验位正确",
+    "tac_known": "IMEI的TAC在DEVICE_MODELS中",
+    "imsi_mcc_mnc": "IMSI的MCC/MNC与区域和所述运营商一致",
+    "msisdn_prefix": "手机号的国际区号、前缀和长度与区域一致",
+}
+
+# 校验用到的字段
+VALIDATED_FIELDS = ("imei", "imsi", "phone_number", "country", "carrier")
+
+IMSI_LENGTH = 15
+
+
+@dataclass
+class ValidationSummary:
+    """各规则的累计失败数量"""
+    total: int = 0
+    failed: int = 0
+    rule_failures: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(VALIDATION_RULES, 0))
+
+    def add(self, failures: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        累加一个批次的校验结果
+
+        Args:
+            failures: validate_columns 的返回值
+
+        Returns:
+            np.ndarray: 布尔数组，True表示该行至少有一条规则未通过
+        """
+        any_failed = np.zeros(len(next(iter(failures.values()))), dtype=bool)
+        for name, mask in failures.items():
+            self.rule_failures[name] += int(mask.sum())
+            any_failed |= mask
+        self.total += len(any_failed)
+        self.failed += int(any_failed.sum())
+        return any_failed
+
+
+def records_to_columns(records: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    将记录列表转换为校验使用的字节串列
+
+    国家/地区字段缺失时使用region字段；缺失的字段视为空字符串。
+
+    Args:
+        records: 设备信息记录（字典）列表
+
+    Returns:
+        Dict[str, np.ndarray]: 字段名 -> 字节串数组
+    """
+    columns = {}
+    for name in VALIDATED_FIELDS:
+        if name == "country":
+            values = [record.get("country") or record.get("region") or "" for record in records]
+        else:
+            values = [record.get(name) or "" for record in records]
+        columns[name] = np.array([str(value).encode("utf-8") for value in values], dtype="S")
+    return columns
+
+
+def _is_digits(values: np.ndarray, width: int) -> np.ndarray:
+    """判断每个元素是否恰好为width位数字"""
+    return (np.char.str_len(values) == width) & (digit_matrix(values, width) <= 9).all(axis=1)
+
+
+def _matches_any(values: np.ndarray, candidates) -> np.ndarray:
+    """判断每个元素是否以候选字符串之一开头"""
+    matched = np.zeros(len(values), dtype=bool)
+    by_length = {}
+    for candidate in candidates:
+        by_length.setdefault(len(candidate), []).append(candidate.encode("ascii"))
+    for length, group in by_length.items():
+        # 转换为更短的定长字节串即截取前缀
+        matched |= np.isin(values.astype(f"S{length}"), np.array(group, dtype=f"S{length}"))
+    return matched
+
+
+def _group_rows(values: np.ndarray):
+    """按取值分组，逐组返回 (取值, 行号数组)"""
+    uniques, inverse = np.unique(values, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(inverse, minlength=len(uniques)))])
+    for i, value in enumerate(uniques):
+        yield value.decode("utf-8", "replace"), order[bounds[i]:bounds[i + 1]]
+
+
+def validate_columns(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    按规则批量校验设备信息
+
+    规则取自当前的 DEVICE_MODELS / CARRIER_INFO 配置（复用缓存的生成计划）。
+    同一区域、同一运营商的行共用一组候选前缀，按组向量化比较。
+
+    Args:
+        columns: records_to_columns 的返回值
+
+    Returns:
+        Dict[str, np.ndarray]: 规则名称 -> 布尔数组，True表示该行未通过该规则
+    """
+    plan = get_generation_plan()
+    country_plans = {country_plan.country: country_plan for country_plan in plan.countries}
+    imei, imsi, phone_number = columns["imei"], columns["imsi"], columns["phone_number"]
+    n = len(imei)
+
+    failures = {"imei_luhn": ~validate_luhn(imei)}
+
+    known_tacs = np.array(sorted(plan.tac_candidates), dtype=f"S{TAC_LENGTH}")
+    failures["tac_known"] = ~np.isin(imei.astype(f"S{TAC_LENGTH}"), known_tacs)
+
+    imsi_failed = ~_is_digits(imsi, IMSI_LENGTH)
+    msisdn_failed = np.zeros(n, dtype=bool)
+    for country, rows in _group_rows(columns["country"]):
+        country_plan = country_plans.get(country)
+        if country_plan is None:
+            imsi_failed[rows] = True
+            msisdn_failed[rows] = True
+            continue
+
+        # 没有号码格式的地区只要求号码非空
+        phones = phone_number[rows]
+        if country_plan.dial_code is None:
+            msisdn_failed[rows] = np.char.str_len(phones) == 0
+        else:
+            # 号码由 国际区号 + 前缀 + 固定位数的随机数字 组成，总长度随前缀长度变化
+            heads = [f"{country_plan.dial_code}{prefix}" for prefix in country_plan.phone_prefixes]
+            lengths = np.char.str_len(phones)
+            valid = np.zeros(len(rows), dtype=bool)
+            for head_length in sorted({len(head) for head in heads}):
+                same_length = [head for head in heads if len(head) == head_length]
+                valid |= _matches_any(phones, same_length) & (lengths == head_length + country_plan.number_length)
+            msisdn_failed[rows] = ~valid
+
+        for carrier, carrier_rows in _group_rows(columns["carrier"][rows]):
+            carrier_rows = rows[carrier_rows]
+            carrier_plan = country_plan.carrier_plan(carrier)
+            if carrier_plan is None:
+                imsi_failed[carrier_rows] = True
+            elif carrier_plan.mnc_candidates:
+                prefixes = [country_plan.mcc + mnc for mnc in carrier_plan.mnc_candidates]
+                imsi_failed[carrier_rows] |= ~_matches_any(imsi[carrier_rows], prefixes)
+            else:
+                imsi_failed[carrier_rows] |= ~_matches_any(imsi[carrier_rows], [country_plan.mcc])
+
+    failures["imsi_mcc_mnc"] = imsi_failed
+    failures["msisdn_prefix"] = msisdn_failed
+    return failures
+
+
+def validate_records(records: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    批量校验设备信息记录
+
+    Args:
+        records: 设备信息记录（字典）列表
+
+    Returns:
+        Dict[str, np.ndarray]: 规则名称 -> 布尔数组，True表示该行未通过该规则
+    """
+    return validate_columns(records_to_columns(records))
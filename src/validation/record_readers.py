@@ -0,0 +1,154 @@
+"""设备信息文件的分块读取器"""
+
+import codecs
+import csv
+import json
+import os
+from typing import Iterator, List, Optional
+
+from src.output.binary_records import BinaryRecordReader, is_binary_record_file
+
+
+# 每次读取的记录数量
+DEFAULT_CHUNK_SIZE = 8192
+# 流式解析JSON数组时每次读取的字符数
+READ_SIZE = 1 << 20
+# JSON数组中单个元素的最大字符数；未解析的部分超过该长度仍无法解析时，视为文件截断或格式错误
+MAX_RECORD_SIZE = 1 << 20
+
+INPUT_FORMATS = ("json", "jsonl", "csv", "bin")
+
+_JSON_WHITESPACE = " \t\r\n"
+
+
+def detect_input_format(filename: str) -> str:
+    """
+    推断输入文件格式
+
+    .csv 文件按CSV读取；以二进制记录魔数开头的文件为二进制记录文件；
+    其他文件根据第一个非空白字符判断，"[" 为JSON数组，否则为JSON Lines。
+
+    Args:
+        filename: 输入文件名
+
+    Returns:
+        str: json、jsonl、csv 或 bin
+    """
+    if os.path.splitext(filename)[1].lower() == ".csv":
+        return "csv"
+    if is_binary_record_file(filename):
+        return "bin"
+    with open(filename, "r", encoding="utf-8-sig") as f:
+        while True:
+            chunk = f.read(4096)
+            stripped = chunk.lstrip(_JSON_WHITESPACE)
+            if stripped or not chunk:
+                return "json" if stripped.startswith("[") else "jsonl"
+
+
+def _iter_json_lines(f) -> Iterator[dict]:
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _iter_json_array(f, offset: int = 0) -> Iterator[dict]:
+    """
+    逐个解析JSON数组中的元素，缓冲区只保留尚未解析的部分
+
+    元素不完整或格式错误时，最多读取 MAX_RECORD_SIZE 个字符后即抛出 ValueError，
+    不会把文件剩余部分全部读入缓冲区。
+
+    Args:
+        f: 以文本模式打开的文件
+        offset: 文件开头已跳过的字节数（如UTF-8 BOM），用于错误信息中的字节偏移
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof, started = "", 0, False, False
+    while True:
+        # 跳过空白和元素之间的逗号
+        while pos < len(buffer) and (buffer[pos] in _JSON_WHITESPACE or (started and buffer[pos] == ",")):
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise ValueError(f"JSON数组不完整：在字节偏移 {offset} 处缺少结尾的 ]")
+            offset += len(buffer.encode("utf-8"))
+            buffer, pos = f.read(READ_SIZE), 0
+            eof = not buffer
+            continue
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("输入文件不是JSON数组")
+            started = True
+            pos += 1
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            record, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            # 元素可能跨越了缓冲区末尾，未超过长度上限时读取更多内容后重新解析
+            chunk = "" if eof or len(buffer) - pos >= MAX_RECORD_SIZE else f.read(READ_SIZE)
+            if not chunk:
+                offset += len(buffer[:pos].encode("utf-8"))
+                if len(buffer) - pos >= MAX_RECORD_SIZE:
+                    reason = f"超过 {MAX_RECORD_SIZE} 个字符仍无法解析"
+                else:
+                    reason = "直到文件结束仍无法解析"
+                raise ValueError(f"JSON数组在字节偏移 {offset} 处的元素无效（{reason}）: {e.msg}") from e
+            offset += len(buffer[:pos].encode("utf-8"))
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield record
+
+
+def iter_records(filename: str, input_format: Optional[str] = None) -> Iterator[dict]:
+    """
+    逐条读取设备信息记录
+
+    Args:
+        filename: 输入文件名
+        input_format: 输入格式，None表示自动推断
+
+    Returns:
+        Iterator[dict]: 记录迭代器
+    """
+    input_format = input_format or detect_input_format(filename)
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"不支持的输入格式: {input_format}")
+    if input_format == "bin":
+        with BinaryRecordReader(filename) as reader:
+            yield from reader.iter_dicts(DEFAULT_CHUNK_SIZE)
+        return
+    with open(filename, "r", encoding="utf-8-sig", newline="" if input_format == "csv" else None) as f:
+        if input_format == "csv":
+            yield from csv.DictReader(f)
+        elif input_format == "json":
+            # utf-8-sig 会跳过BOM，错误信息中的字节偏移需要把它计算在内
+            bom = len(codecs.BOM_UTF8) if f.buffer.peek(len(codecs.BOM_UTF8)).startswith(codecs.BOM_UTF8) else 0
+            yield from _iter_json_array(f, bom)
+        else:
+            yield from _iter_json_lines(f)
+
+
+def iter_record_chunks(filename: str, input_format: Optional[str] = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[dict]]:
+    """
+    按块读取设备信息记录，内存占用只与块大小有关
+
+    Args:
+        filename: 输入文件名
+        input_format: 输入格式，None表示自动推断
+        chunk_size: 每块的记录数量
+
+    Returns:
+        Iterator[List[dict]]: 记录块迭代器
+    """
+    chunk = []
+    for record in iter_records(filename, input_format):
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
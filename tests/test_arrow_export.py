@@ -0,0 +1,48 @@
+"""Parquet写入器与命令行的Parquet输出"""
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from src.generator.sharded_generator import generate_sharded_batch
+from src.main import main
+from src.output.arrow_export import ParquetWriter, batch_to_arrow
+
+
+def test_write_batch_coalesces_small_batches_into_row_groups(tmp_path):
+    batch = generate_sharded_batch(2500, 3)
+    filename = str(tmp_path / "devices.parquet")
+    with ParquetWriter(filename, row_group_size=1000) as writer:
+        for start in range(0, len(batch), 300):
+            writer.write_batch(batch.slice(start, start + 300))
+
+    parquet = pq.ParquetFile(filename)
+    assert [parquet.metadata.row_group(i).num_rows for i in range(parquet.num_row_groups)] == [1000, 1000, 500]
+    assert parquet.read().equals(batch_to_arrow(batch))
+    assert writer.count == len(batch)
+
+
+def test_write_and_write_batch_keep_order(tmp_path):
+    batch = generate_sharded_batch(30, 4)
+    filename = str(tmp_path / "devices.parquet")
+    with ParquetWriter(filename, row_group_size=8) as writer:
+        writer.write_batch(batch.slice(0, 5))
+        for device_info in batch.slice(5, 12).to_device_info_list():
+            writer.write(device_info)
+        writer.write_batch(batch.slice(12))
+
+    assert pq.read_table(filename).to_pylist() == batch_to_arrow(batch).to_pylist()
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_cli_parquet_matches_batch_to_arrow(tmp_path, monkeypatch, stream):
+    monkeypatch.chdir(tmp_path)
+    argv = ["main", "-n", "5000", "--seed", "11", "--format", "parquet", "-o", "devices.parquet"]
+    monkeypatch.setattr("sys.argv", argv + (["--stream"] if stream else []))
+    main()
+
+    expected = batch_to_arrow(generate_sharded_batch(5000, 11, model="Samsung", region="China",
+                                                     carrier="China Mobile"))
+    assert pq.read_table("devices.parquet").equals(expected)
+    assert pq.ParquetFile("devices.parquet").num_row_groups == 1
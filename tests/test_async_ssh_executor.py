@@ -0,0 +1,210 @@
+"""asyncio SSH执行器（以内存中的假传输层模拟paramiko通道）"""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from src.executor.async_ssh_executor import DEFAULT_MAX_CONCURRENCY, AsyncSSHExecutor
+
+
+class FakeChannel:
+    """
+    模拟paramiko的会话通道
+
+    命令格式为 "<秒数> <退出码> <输出>"：在后台线程中等待指定秒数后输出并结束，
+    等待期间通道被关闭时不再输出。
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.command = None
+        self.closed = False
+        self.eof_received = False
+        self._stdout = b""
+        self._exit_status = None
+        self._closed_event = threading.Event()
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+
+    def settimeout(self, timeout):
+        pass
+
+    def exec_command(self, command):
+        self.command = command
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        delay, status, output = self.command.split(" ", 2)
+        if self._closed_event.wait(float(delay)):
+            return
+        self._stdout = output.encode()
+        self._exit_status = int(status)
+        self.eof_received = True
+        os.write(self._wake_write, b"x")
+
+    def fileno(self):
+        return self._wake_read
+
+    def recv_ready(self):
+        return bool(self._stdout)
+
+    def recv(self, size):
+        data, self._stdout = self._stdout[:size], self._stdout[size:]
+        return data
+
+    def recv_stderr_ready(self):
+        return False
+
+    def recv_stderr(self, size):
+        return b""
+
+    def recv_exit_status(self):
+        return self._exit_status
+
+    def close(self):
+        self.closed = True
+        self._closed_event.set()
+        os.write(self._wake_write, b"x")
+        with self.transport.lock:
+            if self in self.transport.active:
+                self.transport.active.remove(self)
+
+
+class FakeTransport:
+    """记录打开的通道和同时打开的最大通道数；open_delay 模拟打开通道时阻塞的时间"""
+
+    def __init__(self, open_delay=0.0):
+        self.open_delay = open_delay
+        self.lock = threading.Lock()
+        self.channels = []
+        self.active = []
+        self.max_active = 0
+
+    def open_session(self, timeout=None):
+        time.sleep(self.open_delay)
+        channel = FakeChannel(self)
+        with self.lock:
+            self.channels.append(channel)
+            self.active.append(channel)
+            self.max_active = max(self.max_active, len(self.active))
+        return channel
+
+
+class FakeClient:
+    def __init__(self, transport):
+        self.transport = transport
+
+    def get_transport(self):
+        return self.transport
+
+    def close(self):
+        pass
+
+
+def _executor(transport, **kwargs):
+    executor = AsyncSSHExecutor(**kwargs)
+    executor.client = FakeClient(transport)
+    return executor
+
+
+def test_default_concurrency_within_openssh_max_sessions():
+    assert DEFAULT_MAX_CONCURRENCY <= 10
+
+
+def test_execute_reports_exit_status_and_closes_channel():
+    async def run():
+        transport = FakeTransport()
+        async with _executor(transport) as executor:
+            assert await executor.execute("0 0 hello") == (True, "hello", "")
+            assert await executor.execute("0 3 oops") == (False, "oops", "")
+        assert all(channel.closed for channel in transport.channels)
+
+    asyncio.run(run())
+
+
+def test_timeout_closes_channel():
+    async def run():
+        transport = FakeTransport()
+        async with _executor(transport) as executor:
+            start = time.monotonic()
+            success, stdout, stderr = await executor.execute("10 0 late", timeout=0.2)
+            assert time.monotonic() - start < 2
+        assert (success, stdout) == (False, "")
+        assert "超时" in stderr
+        assert transport.channels[0].closed
+
+    asyncio.run(run())
+
+
+def test_cancellation_closes_channel():
+    async def run():
+        transport = FakeTransport()
+        async with _executor(transport) as executor:
+            task = asyncio.ensure_future(executor.execute("10 0 late"))
+            while not transport.channels:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        assert transport.channels[0].closed
+        assert transport.active == []
+
+    asyncio.run(run())
+
+
+def test_channel_opened_after_cancellation_is_closed_without_running():
+    async def run():
+        transport = FakeTransport(open_delay=0.3)
+        async with _executor(transport) as executor:
+            result = await executor.execute("0 0 never", timeout=0.05)
+            assert not result[0]
+            await asyncio.sleep(0.5)
+        assert len(transport.channels) == 1
+        assert transport.channels[0].closed
+        assert transport.channels[0].command is None
+
+    asyncio.run(run())
+
+
+def test_timeout_starts_when_a_thread_picks_up_the_command():
+    async def run():
+        # 唯一的线程被第一条超时命令阻塞在打开通道上约1秒；第二条命令排队等待的时间不计入超时
+        transport = FakeTransport(open_delay=1.0)
+        async with _executor(transport, max_concurrency=1) as executor:
+            first = await executor.execute("0 0 first", timeout=0.1)
+            transport.open_delay = 0.0
+            second = await executor.execute("0 0 second", timeout=0.5)
+        assert not first[0]
+        assert second == (True, "second", "")
+
+    asyncio.run(run())
+
+
+def test_execute_devices_limits_open_channels():
+    async def run():
+        transport = FakeTransport()
+        async with _executor(transport, max_concurrency=3) as executor:
+            commands_list = [["0.05 0 a", "0.05 0 b"] for _ in range(8)]
+            results = [item async for item in executor.execute_devices(commands_list)]
+        assert sorted(number for number, _ in results) == list(range(1, 9))
+        assert all(device_results == [(True, "a", ""), (True, "b", "")] for _, device_results in results)
+        assert transport.max_active <= 3
+
+    asyncio.run(run())
+
+
+def test_abandoned_execute_devices_cancels_running_commands():
+    async def run():
+        transport = FakeTransport()
+        async with _executor(transport, max_concurrency=4) as executor:
+            commands_list = [["0 0 fast"]] + [["10 0 slow"] for _ in range(3)]
+            devices = executor.execute_devices(commands_list)
+            assert await devices.__anext__() == (1, [(True, "fast", "")])
+            await devices.aclose()
+            await asyncio.sleep(0.1)
+        assert transport.active == []
+
+    asyncio.run(run())
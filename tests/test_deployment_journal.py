@@ -0,0 +1,104 @@
+"""部署日志"""
+
+import json
+import os
+
+import pytest
+
+from src.executor.deployment_journal import DeploymentJournal, journal_path, read_journal
+
+PARAMS = {"count": 5, "seed": 42, "resumable": True}
+OK = (True, "", "")
+FAILED = (False, "", "error")
+
+
+def _create(directory, **kwargs):
+    return DeploymentJournal.create(str(directory), PARAMS, **kwargs)
+
+
+def test_create_writes_header(tmp_path):
+    with _create(tmp_path) as journal:
+        pass
+    params, devices = read_journal(journal.filename)
+    assert params == PARAMS
+    assert devices == {}
+    assert journal.filename == journal_path(str(tmp_path), journal.run_id)
+
+
+def test_last_device_record_wins(tmp_path):
+    with _create(tmp_path) as journal:
+        journal.record_device(1, [OK, FAILED])
+        journal.record_device(2, [OK])
+        journal.record_device(3, [], error="连接失败")
+        journal.record_device(1, [OK, OK])
+        journal.record_device(2, [FAILED])
+
+    _, devices = read_journal(journal.filename)
+    assert devices == {1: True, 2: False, 3: False}
+    with open(journal.filename, encoding="utf-8") as f:
+        assert sum(line.startswith("C\t") for line in f) == 6
+
+
+def test_pending_skips_completed_devices(tmp_path):
+    with _create(tmp_path) as journal:
+        journal.record_device(1, [OK])
+        journal.record_device(2, [FAILED])
+        journal.record_device(4, [OK])
+
+    resumed = DeploymentJournal.resume(str(tmp_path), journal.run_id)
+    with resumed:
+        assert resumed.completed == {1, 4}
+        jobs = [(n, f"task{n}") for n in range(1, 6)]
+        assert list(resumed.pending(jobs)) == [(2, "task2"), (3, "task3"), (5, "task5")]
+        resumed.record_device(2, [OK])
+        assert [n for n, _ in resumed.pending(jobs)] == [3, 5]
+
+
+def test_read_journal_ignores_torn_tail(tmp_path):
+    with _create(tmp_path) as journal:
+        journal.record_device(1, [OK])
+        journal.record_device(2, [OK])
+    with open(journal.filename, "rb+") as f:
+        # 截断在最后一条D记录的中间
+        f.truncate(os.path.getsize(journal.filename) - 2)
+
+    _, devices = read_journal(journal.filename)
+    assert devices == {1: True}
+
+
+@pytest.mark.parametrize("cut", [1, 2, 3, 4])
+def test_resume_after_truncation_mid_line(tmp_path, cut):
+    with _create(tmp_path) as journal:
+        journal.record_device(1, [OK])
+        journal.record_device(2, [OK, OK])
+    with open(journal.filename, "rb+") as f:
+        f.truncate(os.path.getsize(journal.filename) - cut)
+
+    with DeploymentJournal.resume(str(tmp_path), journal.run_id) as resumed:
+        assert resumed.completed == {1}
+        resumed.record_device(2, [OK, OK])
+        resumed.record_device(3, [FAILED])
+
+    params, devices = read_journal(journal.filename)
+    assert params == PARAMS
+    assert devices == {1: True, 2: True, 3: False}
+    # 写了一半的行单独成行，之后的记录不会与之拼接
+    with open(journal.filename, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    assert lines[-6:] == ["C\t2\t0\t1", "C\t2\t1\t1", "D\t2\t1", "C\t3\t0\t0", "D\t3\t0", ""]
+    # 再次恢复时结果相同
+    with DeploymentJournal.resume(str(tmp_path), journal.run_id) as again:
+        assert again.completed == {1, 2}
+
+
+def test_resume_missing_run(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        DeploymentJournal.resume(str(tmp_path), "20240101-000000-abcdef")
+
+
+def test_journal_without_header_is_rejected(tmp_path):
+    filename = journal_path(str(tmp_path), "broken")
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(f"H\t{json.dumps(PARAMS)}")  # 文件头本身不完整
+    with pytest.raises(ValueError):
+        read_journal(filename)
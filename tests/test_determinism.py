@@ -0,0 +1,84 @@
+"""相同主种子下生成结果与工作进程数、分片大小和生成方式无关"""
+
+import numpy as np
+import pytest
+
+from src.generator.device_info_generator import DeviceInfoGenerator
+from src.generator.device_stream import iter_device_batches, iter_device_chunks
+from src.generator.sharded_generator import generate_device_info_at, generate_device_range, generate_sharded_batch
+from src.main import main
+from src.utils.counter_rng import CounterRNG, counter_words, word_to_integer, word_to_unit
+
+SEED = 20240601
+
+
+def _records(batches):
+    return [item for batch in batches for item in batch.iter_dicts()]
+
+
+def test_same_seed_same_batch():
+    first = DeviceInfoGenerator(seed=SEED).generate_batch(500)
+    second = DeviceInfoGenerator(seed=SEED).generate_batch(500)
+    other = DeviceInfoGenerator(seed=SEED + 1).generate_batch(500)
+    assert _records([first]) == _records([second])
+    assert _records([first]) != _records([other])
+
+
+def test_split_batches_continue_the_same_sequence():
+    generator = DeviceInfoGenerator(seed=SEED)
+    parts = [generator.generate_batch(n) for n in (1, 99, 400)]
+    assert _records(parts) == _records([DeviceInfoGenerator(seed=SEED).generate_batch(500)])
+
+
+@pytest.mark.parametrize("workers, shard_size", [(1, 1000), (1, 7), (2, 128), (3, 1)])
+def test_sharded_batch_independent_of_workers_and_shard_size(workers, shard_size):
+    expected = _records([generate_sharded_batch(1000, SEED)])
+    assert _records([generate_sharded_batch(1000, SEED, workers, shard_size=shard_size)]) == expected
+    assert _records(iter_device_batches(1000, SEED, workers, shard_size=shard_size)) == expected
+
+
+def test_streamed_chunks_match_sharded_batch():
+    expected = _records([generate_sharded_batch(1000, SEED, model="Samsung")])
+    assert _records(iter_device_chunks(1000, "Samsung", seed=SEED, chunk_size=64)) == expected
+    assert _records(iter_device_chunks(1000, "Samsung", seed=SEED, workers=2, chunk_size=300)) == expected
+
+
+@pytest.mark.parametrize("index", [0, 1, 999, 123_456_789])
+def test_random_access_matches_full_run(index):
+    device_info = generate_device_info_at(SEED, index)
+    assert device_info == generate_device_range(SEED, index - index % 10, index - index % 10 + 10).device_info(index % 10)
+
+
+def test_single_device_generation_matches_batch():
+    generator = DeviceInfoGenerator(seed=SEED)
+    single = [generator.generate_device_info() for _ in range(50)]
+    assert single == generate_sharded_batch(50, SEED).to_device_info_list()
+    assert single == [generate_device_info_at(SEED, index) for index in range(50)]
+
+
+def test_counter_rng_draws_depend_only_on_index():
+    full = CounterRNG(SEED, np.arange(100, dtype=np.uint64))
+    part = CounterRNG(SEED, np.arange(40, 60, dtype=np.uint64))
+    assert np.array_equal(full.random(100)[40:60], part.random(20))
+    assert np.array_equal(full.integers(0, 1000, 100)[40:60], part.integers(0, 1000, 20))
+
+
+def test_scalar_counter_words_match_counter_rng():
+    rng = CounterRNG(SEED, np.array([7], dtype=np.uint64))
+    first, second = counter_words(SEED, 7, 2)
+    assert rng.random(1)[0] == word_to_unit(first)
+    assert rng.integers(20, 91, 1)[0] == word_to_integer(second, 20, 91)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_cli_output_independent_of_workers(tmp_path, monkeypatch, stream):
+    monkeypatch.chdir(tmp_path)
+    outputs = []
+    for workers in (1, 3):
+        argv = ["main", "-n", "2000", "--seed", str(SEED), "--workers", str(workers),
+                "-o", f"devices{workers}.json", "--commands-file", f"commands{workers}.txt"]
+        monkeypatch.setattr("sys.argv", argv + (["--stream"] if stream else []))
+        main()
+        outputs.append([(tmp_path / f"{name}{workers}.{ext}").read_bytes()
+                        for name, ext in (("devices", "json"), ("commands", "txt"))])
+    assert outputs[0] == outputs[1]
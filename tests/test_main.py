@@ -0,0 +1,24 @@
+"""命令行主程序"""
+
+import os
+import subprocess
+import sys
+
+from src.generator.sensor_profiles import SENSOR_PROFILES
+from src.generator import sensor_trajectory
+from src.output.formats import DEVICE_FORMATS
+from src.output.stream_writers import DEVICE_WRITERS
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_does_not_load_numpy_or_paramiko():
+    code = "import sys, src.main; print(sorted({'numpy', 'paramiko'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True,
+                            capture_output=True, text=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_lightweight_option_lists_match_implementations():
+    assert set(DEVICE_FORMATS) == set(DEVICE_WRITERS)
+    assert sensor_trajectory.SENSOR_PROFILES is SENSOR_PROFILES
@@ -0,0 +1,73 @@
+"""设备信息文件的分块读取器"""
+
+import codecs
+import io
+import json
+
+import pytest
+
+from src.validation import record_readers
+from src.validation.record_readers import _iter_json_array, iter_record_chunks, iter_records
+
+RECORDS = [{"imei": f"35281219{i:07d}", "model": "测试机型", "latitude": i / 7} for i in range(200)]
+
+
+class CountingReader(io.StringIO):
+    """记录读取的字符总数"""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.chars_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.chars_read += len(data)
+        return data
+
+
+@pytest.fixture
+def small_reads(monkeypatch):
+    monkeypatch.setattr(record_readers, "READ_SIZE", 64)
+    monkeypatch.setattr(record_readers, "MAX_RECORD_SIZE", 256)
+
+
+def test_records_spanning_reads(small_reads, tmp_path):
+    filename = tmp_path / "devices.json"
+    filename.write_text(json.dumps(RECORDS, indent=2, ensure_ascii=False), encoding="utf-8")
+    assert list(iter_records(str(filename))) == RECORDS
+    assert [len(chunk) for chunk in iter_record_chunks(str(filename), chunk_size=64)] == [64, 64, 64, 8]
+
+
+def test_malformed_element_fails_fast_with_byte_offset(small_reads):
+    good = json.dumps(RECORDS[:3], ensure_ascii=False)[:-1]
+    text = good + ', {"imei": "1", oops' + ", " + json.dumps(RECORDS, ensure_ascii=False)[1:]
+    reader = CountingReader(text)
+    records = _iter_json_array(reader)
+    assert [next(records) for _ in range(3)] == RECORDS[:3]
+    with pytest.raises(ValueError) as info:
+        next(records)
+    assert f"字节偏移 {len((good + ', ').encode())} " in str(info.value)
+    # 不会把剩余的文件全部读入缓冲区
+    assert reader.chars_read <= len(good) + 256 + 2 * 64
+
+
+def test_truncated_array(small_reads, tmp_path):
+    text = json.dumps(RECORDS[:5], ensure_ascii=False)
+    filename = tmp_path / "truncated.json"
+    filename.write_bytes(codecs.BOM_UTF8 + text[:-20].encode("utf-8"))
+    with pytest.raises(ValueError) as info:
+        list(iter_records(str(filename)))
+    start = len(codecs.BOM_UTF8) + len(text[:text.rindex(', {"imei"') + 2].encode("utf-8"))
+    assert f"字节偏移 {start} " in str(info.value)
+
+
+def test_missing_closing_bracket(tmp_path):
+    filename = tmp_path / "open.json"
+    filename.write_text(json.dumps(RECORDS[:2])[:-1] + "\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="缺少结尾"):
+        list(iter_records(str(filename)))
+
+
+def test_not_an_array():
+    with pytest.raises(ValueError):
+        list(_iter_json_array(io.StringIO('{"imei": "1"}')))
@@ -0,0 +1,65 @@
+"""JSON写入器与json模块的逐字节一致性"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.generator.sharded_generator import generate_device_range
+from src.output import stream_writers
+from src.output.record_templates import encode_records
+from src.output.stream_writers import open_device_writer
+
+
+def _expected(items, output_format):
+    if output_format == "json":
+        return json.dumps(items, indent=2, ensure_ascii=False)
+    lines = [json.dumps(item, ensure_ascii=False) for item in items]
+    if output_format == "json-compact":
+        return "[" + ",\n".join(lines) + "]\n" if lines else "[]\n"
+    return "".join(line + "\n" for line in lines)
+
+
+def _tricky_batch():
+    """包含需转义字符、非ASCII类别和非有限浮点数的批次"""
+    batch = generate_device_range(7, 0, 50)
+    ssid = batch.columns["ssid"].astype("S32")
+    ssid[0] = b'quote"d'
+    ssid[1] = b"back\\slash"
+    ssid[2] = b"ctrl\x01\x1f"
+    batch.columns["ssid"] = ssid
+    batch.categories = dict(batch.categories, carrier=["中国移动"] * len(batch.categories["carrier"]))
+    batch.columns["latitude"] = batch.columns["latitude"].copy()
+    batch.columns["latitude"][3] = np.nan
+    return batch
+
+
+@pytest.mark.parametrize("output_format", ["json", "json-compact", "jsonl"])
+@pytest.mark.parametrize("rows", [0, 1, 10])
+def test_write_batch_matches_json_module(tmp_path, monkeypatch, output_format, rows):
+    # 缩小每块的行数，覆盖跨块拼接
+    monkeypatch.setattr(stream_writers, "BATCH_WRITE_ROWS", 4)
+    batch = _tricky_batch().slice(0, rows)
+    filename = tmp_path / "devices.out"
+    with open_device_writer(str(filename), output_format) as writer:
+        writer.write_batch(batch)
+
+    items = [device_info.to_dict() for device_info in batch.to_device_info_list()]
+    assert filename.read_text(encoding="utf-8") == _expected(items, output_format)
+    assert writer.count == rows
+
+
+@pytest.mark.parametrize("output_format", ["json", "json-compact", "jsonl"])
+def test_write_and_write_batch_are_identical(tmp_path, output_format):
+    batch = _tricky_batch()
+    by_row = tmp_path / "by_row.out"
+    by_batch = tmp_path / "by_batch.out"
+    with open_device_writer(str(by_row), output_format) as writer:
+        for device_info in batch.to_device_info_list():
+            writer.write(device_info)
+    with open_device_writer(str(by_batch), output_format) as writer:
+        writer.write_batch(batch.slice(0, 20))
+        writer.write_batch(batch.slice(20))
+
+    assert by_batch.read_bytes() == by_row.read_bytes()
+    assert by_batch.read_text(encoding="utf-8") == encode_records(batch.to_device_info_list(), output_format)
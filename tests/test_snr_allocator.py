@@ -0,0 +1,52 @@
+"""SNR分配器"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.generator.snr_allocator import SNR_SPACE, FeistelPermutation, SNRAllocator
+from src.main import main
+
+
+@pytest.mark.parametrize("key", [0, 1, 0x9E3779B97F4A7C15, (1 << 64) - 1])
+def test_feistel_permutation_is_bijective(key):
+    values = FeistelPermutation(key).permute(np.arange(SNR_SPACE))
+    assert values.min() >= 0 and values.max() < SNR_SPACE
+    assert np.array_equal(np.sort(values), np.arange(SNR_SPACE))
+
+
+def test_allocations_resumed_from_saved_state_do_not_repeat(tmp_path):
+    state = str(tmp_path / "snr.json")
+    allocated = []
+    for count in (1000, 250_000, 1, 48_999):
+        allocator = SNRAllocator.load(state)
+        allocated.append(allocator.allocate("35281219", count))
+        allocated.append(allocator.allocate("35332510", 10))
+        allocator.save(state)
+
+    snr = np.concatenate(allocated[::2])
+    assert len(snr) == 300_000
+    assert len(np.unique(snr)) == len(snr)
+    with open(state, encoding="utf-8") as f:
+        assert json.load(f)["counters"] == {"35281219": 300_000, "35332510": 40}
+
+
+def test_allocator_refuses_to_exceed_snr_space():
+    allocator = SNRAllocator(7, {"35281219": SNR_SPACE - 5})
+    assert len(allocator.allocate("35281219", 5)) == 5
+    with pytest.raises(ValueError):
+        allocator.allocate("35281219", 1)
+
+
+def test_cli_runs_sharing_snr_state_do_not_repeat(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    imeis = []
+    for run in range(2):
+        monkeypatch.setattr("sys.argv", ["main", "-n", "3000", "--seed", str(run), "--snr-state", "snr.json",
+                                         "--stream", "--format", "jsonl", "-o", f"devices{run}.jsonl"])
+        main()
+        with open(f"devices{run}.jsonl", encoding="utf-8") as f:
+            imeis.extend(json.loads(line)["imei"][:14] for line in f)
+    assert len(imeis) == 6000
+    assert len(set(imeis)) == len(imeis)
@@ -0,0 +1,107 @@
+"""SSH执行器的流水线模式（以本地sh进程模拟shell通道）"""
+
+import os
+import subprocess
+import threading
+
+import pytest
+
+from src.executor.ssh_executor import SSHExecutor
+
+
+class LocalShellChannel:
+    """以本地sh进程模拟paramiko的shell通道"""
+
+    def __init__(self):
+        self.closed = False
+        self._process = subprocess.Popen(["sh"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE)
+        self._stdout = bytearray()
+        self._stderr = bytearray()
+        self._lock = threading.Lock()
+        # select() 等待的文件描述符：每收到一段标准输出写入一个字节
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        self._pumps = [
+            threading.Thread(target=self._pump, args=(self._process.stdout, self._stdout), daemon=True),
+            threading.Thread(target=self._pump, args=(self._process.stderr, self._stderr), daemon=True),
+        ]
+        for pump in self._pumps:
+            pump.start()
+
+    def _pump(self, stream, buffer):
+        while data := os.read(stream.fileno(), 65536):
+            with self._lock:
+                buffer += data
+            os.write(self._wake_write, b"x")
+
+    def fileno(self):
+        return self._wake_read
+
+    def recv_ready(self):
+        return bool(self._stdout)
+
+    def recv_stderr_ready(self):
+        return bool(self._stderr)
+
+    def recv(self, size):
+        try:
+            os.read(self._wake_read, 65536)
+        except BlockingIOError:
+            pass
+        with self._lock:
+            data = bytes(self._stdout[:size])
+            del self._stdout[:size]
+        return data
+
+    def recv_stderr(self, size):
+        with self._lock:
+            data = bytes(self._stderr[:size])
+            del self._stderr[:size]
+        return data
+
+    def sendall(self, data):
+        self._process.stdin.write(data)
+        self._process.stdin.flush()
+
+    def exit_status_ready(self):
+        if self._process.poll() is None:
+            return False
+        for pump in self._pumps:
+            pump.join()
+        return True
+
+    def recv_exit_status(self):
+        return self._process.wait()
+
+    def close(self):
+        self.closed = True
+        self._process.kill()
+        self._process.wait()
+
+
+@pytest.fixture
+def executor():
+    executor = SSHExecutor(pipelined=True)
+    executor.client = object()
+    executor._shell = LocalShellChannel()
+    yield executor
+    executor._close_shell()
+
+
+def test_pipelined_results(executor):
+    results = executor.execute_commands(["echo one", "echo err >&2; false", "printf 'no newline'"])
+    assert results == [(True, "one\n", ""), (False, "", "err\n"), (True, "no newline", "")]
+
+
+@pytest.mark.parametrize("reader", ["cat", "read line", "head -c 1; echo read", "sh"])
+def test_stdin_reading_command_does_not_consume_later_commands(executor, reader):
+    results = executor.execute_commands_pipelined([reader, "echo after", "echo last"], timeout=5)
+    assert results[1:] == [(True, "after\n", ""), (True, "last\n", "")]
+
+
+def test_shell_reused_across_batches(executor):
+    shell = executor._shell
+    assert executor.execute_commands(["cat"]) == [(True, "", "")]
+    assert executor.execute_commands(["echo again"]) == [(True, "again\n", "")]
+    assert executor._shell is shell
@@ -0,0 +1,92 @@
+"""跨运行唯一性索引"""
+
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from src.generator import uniqueness_index
+from src.generator.uniqueness_index import UniquenessIndex, _FileLock, _HashedSet
+
+
+def _keys(rng, count):
+    # 键为0表示空槽位，哈希值不会为0
+    return rng.integers(1, 1 << 63, size=count, dtype=np.uint64)
+
+
+def test_hashed_set_grows_across_rehash_without_losing_members(tmp_path, monkeypatch):
+    # 缩小分块，让扩容时的分块重新插入跨越多个块
+    monkeypatch.setattr(uniqueness_index, "REHASH_CHUNK_SLOTS", 8)
+    filename = str(tmp_path / "keys.set")
+    hashed_set = _HashedSet(filename, initial_capacity=16)
+    rng = np.random.default_rng(1)
+    members = []
+    for count in (5, 1, 3, 40, 200, 1000):
+        keys = _keys(rng, count)
+        hashed_set.add(keys)
+        members.append(keys)
+        assert hashed_set.contains(np.concatenate(members)).all()
+
+    members = np.concatenate(members)
+    table = np.memmap(filename, dtype=np.uint64, mode="r")
+    capacity, count = int(table[0]), int(table[1])
+    assert count == len(members)
+    assert capacity >= 2 * count and capacity > 16
+    assert np.count_nonzero(table[2:]) == count
+    assert not hashed_set.contains(_keys(np.random.default_rng(2), 1000)).any()
+
+    # 另一个实例（如另一个进程）打开扩容后的文件也能查到全部成员
+    assert _HashedSet(filename).contains(members).all()
+
+
+def _columns(start, count):
+    numbers = np.arange(start, start + count)
+    return (
+        np.array([f"35281219{n:06d}0".encode() for n in numbers]),
+        np.array([f"46000{n:010d}".encode() for n in numbers]),
+        np.array([f"+86138{n:08d}".encode() for n in numbers]),
+        np.array([f"02:00:00:{n >> 16 & 255:02x}:{n >> 8 & 255:02x}:{n & 255:02x}".encode() for n in numbers]),
+    )
+
+
+def test_claims_persist_across_instances(tmp_path):
+    directory = str(tmp_path / "index")
+    assert not UniquenessIndex(directory, initial_capacity=16).claim_columns(*_columns(0, 100)).any()
+
+    index = UniquenessIndex(directory, initial_capacity=16)
+    duplicates = index.claim_columns(*_columns(50, 100))
+    assert duplicates.tolist() == [True] * 50 + [False] * 50
+    assert index.claim_columns(*_columns(0, 150)).all()
+
+
+_CLAIM_SCRIPT = """
+import sys
+import numpy as np
+from src.generator.uniqueness_index import UniquenessIndex
+print(UniquenessIndex(sys.argv[1]).claim_columns(
+    np.array([b"352812190000010"]), np.array([b"460000000000001"]),
+    np.array([b"+8613800000001"]), np.array([b"02:00:00:00:00:01"]),
+)[0], flush=True)
+"""
+
+
+def test_second_process_blocks_on_index_lock(tmp_path):
+    directory = str(tmp_path / "index")
+    UniquenessIndex(directory)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+
+    with _FileLock(os.path.join(directory, "index.lock")):
+        child = subprocess.Popen([sys.executable, "-c", _CLAIM_SCRIPT, directory], cwd=root, env=env,
+                                 stdout=subprocess.PIPE, text=True)
+        # 锁被持有时子进程无法登记
+        time.sleep(1.0)
+        assert child.poll() is None
+    output, _ = child.communicate(timeout=30)
+
+    assert child.returncode == 0
+    assert output.strip() == "False"
+    # 子进程在锁释放后完成了登记，再次登记同一设备视为重复
+    assert UniquenessIndex(directory).claim_columns(*_columns(1, 1)).all()